@@ -0,0 +1,25 @@
+@echo off
+REM Start Anime Vanguards Keeper - Fleet Mode (all Roblox windows)
+
+title Anime Vanguards Keeper Fleet
+
+cd /d "%~dp0"
+
+echo ========================================
+echo   ANIME VANGUARDS KEEPER - FLEET MODE
+echo ========================================
+echo.
+echo Keeps EVERY open Roblox window active from one process.
+echo Per-window calibration: config\config_v2.json ^> fleet.window_overrides
+echo.
+echo Make sure:
+echo   1. All Roblox clients are running
+echo   2. Each client is in its AFK chamber
+echo.
+pause
+
+echo.
+echo Starting Fleet (Ctrl+C to stop)...
+py src\keeper_fleet.py
+
+pause
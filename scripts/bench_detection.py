@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Detection latency benchmark - sequential vs thread-pool voting
+
+Runs the game card and play button votes on a synthetic home screen
+the way keeper_engine does: color detectors, shape detection and a
+stand-in for OCR (a sleep, like waiting on the tesseract subprocess).
+Each vote gets a fresh FrameAnalysis, so shared planes are paid for
+every time, as on a live capture.
+
+Reports wall-clock latency per vote, sequential vs DetectionExecutor.
+
+Usage:
+    python scripts/bench_detection.py [--runs 20] [--ocr-ms 400] [--width 1920] [--height 1080]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_pyramid import make_frame
+from color_classifier import ColorClassifier
+from detection_executor import DetectionExecutor
+from detection_voting import VotingEngine
+from frame_analysis import FrameAnalysis
+
+
+def game_card_detectors(ocr_ms):
+    """Same detectors (and result offsets) as keeper_engine's game card vote"""
+    def star(img):
+        star = img.blobs('star_yellow').filter_area(50, 500).first_centroid()
+        return (star[0] + 50, star[1] + 80) if star else None
+
+    def title(img):
+        title = img.blobs('title_purple').filter_area(min_area=200).largest_centroid()
+        return (title[0], title[1] + 30) if title else None
+
+    def dragon(img):
+        return img.blobs(['dragon_green_bright', 'dragon_green_dark']).filter_area(min_area=1000).largest_centroid()
+
+    def ocr(img):
+        img.gray_eq
+        time.sleep(ocr_ms / 1000.0)
+        return None
+
+    return {'star_rating': star, 'gradient_text': title, 'green_dragon': dragon, 'ocr': ocr}
+
+
+def play_button_detectors():
+    """Same detectors as keeper_engine's play button vote"""
+    def bright_blue(img):
+        return img.blobs(['button_blue_bgr1', 'button_blue_bgr2']).filter_area(500, 50000).largest_centroid()
+
+    def hsv_blue(img):
+        return img.blobs('button_blue_hsv').filter_area(500, 50000).largest_centroid()
+
+    def rectangle(img):
+        buttons = img.regions().filter_area(500, 50000).filter_fill(0.7).filter_aspect(1.5, 5)
+        if len(buttons):
+            x, y, w, h = buttons.bboxes[0]
+            return (int(x + w // 2), int(y + h // 2))
+        return None
+
+    return {'bright_blue': bright_blue, 'hsv_blue': hsv_blue, 'rectangle': rectangle}
+
+
+def measure(votes, detectors, frame, classifier, executor, runs):
+    """Median wall-clock ms of one vote, plus its result"""
+    latencies = []
+    result = None
+    for _ in range(runs + 1):
+        start = time.perf_counter()
+        result = votes.vote(FrameAnalysis(frame, classifier), detectors, executor)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies = sorted(latencies[1:])   # first run warms up
+    return latencies[len(latencies) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detection latency benchmark")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--ocr-ms', type=float, default=400)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    classifier = ColorClassifier()
+    frame = make_frame(args.width, args.height)
+    # Shipped weights, but a threshold no vote reaches: every detector runs
+    config = {'detection_voting': {
+        'game_card': {'agreement_threshold': 10.0, 'cluster_radius': 120,
+                      'weights': {'star_rating': 0.8, 'gradient_text': 0.8, 'green_dragon': 1.0, 'ocr': 1.5}},
+        'play_button': {'agreement_threshold': 10.0, 'cluster_radius': 60,
+                        'weights': {'bright_blue': 1.0, 'hsv_blue': 1.0, 'rectangle': 0.6}}
+    }}
+    executor = DetectionExecutor({'detection_executor': {'timeout_ms': 1500, 'timeouts_ms': {'ocr': 100}}})
+
+    print("=" * 80)
+    print(f"📊 DETECTION LATENCY - {args.width}x{args.height}, {args.runs} runs, OCR stand-in {args.ocr_ms:.0f} ms")
+    print("=" * 80)
+    print(f"{'vote':12s} {'sequential ms':>14s} {'parallel ms':>12s} {'speedup':>8s}  result")
+
+    for target, detectors in (('game_card', game_card_detectors(args.ocr_ms)),
+                              ('play_button', play_button_detectors())):
+        votes = VotingEngine(target, config, log_callback=lambda message, level: None)
+        seq_ms, seq_result = measure(votes, detectors, frame, classifier, None, args.runs)
+        par_ms, par_result = measure(votes, detectors, frame, classifier, executor, args.runs)
+        same = "same" if seq_result == par_result else f"{seq_result} vs {par_result}"
+        print(f"{target:12s} {seq_ms:14.2f} {par_ms:12.2f} {seq_ms / max(par_ms, 1e-6):7.1f}x  {par_result} ({same})")
+
+    executor.close()
+    print("-" * 80)
+    print("Parallel runs stop waiting for OCR after its 100 ms timeout; sequential waits it out.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Coarse-to-fine detection benchmark
+
+Renders a synthetic Roblox home screen (blue play button, green game
+card artwork, purple title) with speckle noise and runs the play
+button and game card detectors:
+- at full resolution
+- coarse-to-fine through PyramidSearch at each scale factor
+
+Reports per-search latency, speedup and localization error against
+the full-resolution result (for the coarse candidate alone and after
+the refine pass), to choose detection_pyramid.scale.
+
+Usage:
+    python scripts/bench_pyramid.py [--runs 20] [--width 1920] [--height 1080]
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from color_classifier import ColorClassifier
+from frame_analysis import FrameAnalysis
+from pyramid_search import PyramidSearch
+
+
+def make_frame(width, height, noise=0.01, seed=0):
+    """BGRA frame with a play button, green artwork and a purple title"""
+    rng = np.random.default_rng(seed)
+    frame = np.full((height, width, 4), 40, dtype=np.uint8)
+
+    sx, sy = width / 1280, height / 720
+    cv2.rectangle(frame, (int(890 * sx), int(505 * sy)), (int(1090 * sx), int(565 * sy)), (230, 140, 40, 255), -1)
+    cv2.ellipse(frame, (int(310 * sx), int(330 * sy)), (int(90 * sx), int(60 * sy)), 20, 0, 360, (40, 190, 30, 255), -1)
+    cv2.rectangle(frame, (int(210 * sx), int(200 * sy)), (int(430 * sx), int(230 * sy)), (200, 50, 150, 255), -1)
+
+    speckle = rng.random((height, width)) < noise
+    frame[speckle] = rng.integers(0, 255, (int(speckle.sum()), 4), dtype=np.uint8)
+    return frame
+
+
+def detect_play_button(img):
+    """Largest blue blob of button size (keeper_engine's HSV method)"""
+    return img.blobs('button_blue_hsv').filter_area(500, 50000).largest_centroid()
+
+
+def detect_game_card(img):
+    """Largest green artwork blob (keeper_engine's dragon method)"""
+    return img.blobs(['dragon_green_bright', 'dragon_green_dark']).filter_area(min_area=1000).largest_centroid()
+
+
+def error_px(point, exact):
+    """Distance between two detections, or 'miss'"""
+    if point and exact:
+        return f"{math.hypot(point[0] - exact[0], point[1] - exact[1]):.1f}"
+    return "miss"
+
+
+def measure(func, runs):
+    """Median latency of func() in ms (fresh frame analysis each run), plus its result"""
+    result = func()
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return latencies[len(latencies) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coarse-to-fine detection benchmark")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    classifier = ColorClassifier()
+    frame = make_frame(args.width, args.height)
+
+    def analysis(img):
+        return FrameAnalysis.of(img, classifier)
+
+    print("=" * 80)
+    print(f"📊 PYRAMID BENCHMARK - {args.width}x{args.height}, {args.runs} runs")
+    print("=" * 80)
+    print(f"{'target':12s} {'scale':>5s} {'ms':>8s} {'speedup':>8s} {'coarse px':>10s} {'error px':>9s}  point")
+
+    for name, detect in (('play_button', detect_play_button), ('game_card', detect_game_card)):
+        full_ms, exact = measure(lambda: detect(analysis(frame)), args.runs)
+        print(f"{name:12s} {'1':>5s} {full_ms:8.2f} {'1.0x':>8s} {'-':>10s} {'-':>9s}  {exact}")
+
+        for scale in (2, 4, 8):
+            pyramid = PyramidSearch({'detection_pyramid': {'enabled': True, 'scale': scale, 'min_pixels': 0}},
+                                    analysis, log_callback=lambda message, level: None)
+            ms, point = measure(lambda: pyramid.search(frame, detect), args.runs)
+            coarse = detect(analysis(frame).downscaled(pyramid.level))
+
+            print(f"{'':12s} {scale:5d} {ms:8.2f} {full_ms / max(ms, 1e-6):7.1f}x "
+                  f"{error_px(coarse, exact):>10s} {error_px(point, exact):>9s}  {point}")
+
+    print("-" * 80)
+
+
+if __name__ == "__main__":
+    main()
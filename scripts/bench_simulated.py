@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+End-to-end keeper runs against simulated Roblox clients
+
+Drives AnimeVanguardsKeeperV2, AsyncKeeperV2, KeeperFleet and
+AnimeVanguardsKeeper through SimulatedBackend (src/simulated_client.py), so the whole
+pipeline - window lookup, capture, detection, input, fault handling -
+runs and is timed on any host, no Windows or display needed.
+
+Each scenario injects a situation, runs the engine path that should
+handle it, and checks what the simulated client saw. Exit status is
+non-zero when a check fails.
+
+Usage:
+    python scripts/bench_simulated.py [--clicks 20] [--skip-v1]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from simulated_client import SimulatedBackend
+from keeper_engine_v2 import AnimeVanguardsKeeperV2
+from keeper_engine_async import AsyncKeeperV2
+from keeper_fleet import KeeperFleet
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config')
+
+
+def load_config(name, **overrides):
+    with open(os.path.join(CONFIG_DIR, name)) as f:
+        config = json.load(f)
+    config.update(overrides)
+    return config
+
+
+def quiet(message, level="INFO"):
+    pass
+
+
+def v2_keeper(backend, base_dir, **overrides):
+    config = load_config('config_v2.json', humanization_enabled=False, **overrides)
+    keeper = AnimeVanguardsKeeperV2(base_dir, '', log_callback=quiet, config=config, backend=backend)
+    keeper.save_stats = lambda: None
+    return keeper
+
+
+class Report:
+    def __init__(self):
+        self.failed = 0
+        print(f"{'scenario':34s} {'ok':>3s} {'ms':>9s}  detail")
+
+    def row(self, name, ok, ms, detail=""):
+        self.failed += not ok
+        print(f"{name:34s} {'✓' if ok else '✗':>3s} {ms:9.2f}  {detail}")
+
+
+# ========================================
+# V2 SCENARIOS
+# ========================================
+
+def v2_clicks(report, base_dir, clicks):
+    backend = SimulatedBackend()
+    client = backend.add_client(state='in_game')
+    keeper = v2_keeper(backend, base_dir)
+
+    latencies = []
+    for _ in range(clicks):
+        start = time.perf_counter()
+        ok = keeper.safe_click_roblox()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    # Presses per delivering method (the selector explores now and then)
+    presses = {}
+    for event in client.events:
+        if event.kind in ('down', 'dblclk', 'click'):
+            presses[event.source] = presses.get(event.source, 0) + 1
+    received = sum(presses.values())
+    report.row("v2 click", ok and received >= clicks, latencies[len(latencies) // 2],
+               f"{received} presses for {clicks} clicks {presses}, "
+               f"p99 {latencies[int(0.99 * (len(latencies) - 1))]:.1f} ms")
+
+
+def v2_hung(report, base_dir):
+    backend = SimulatedBackend()
+    client = backend.add_client(state='in_game')
+    keeper = v2_keeper(backend, base_dir, click_method_priority=['postmessage', 'sendmessage', 'pyautogui'],
+                       click_verification={'enabled': True, 'settle_ms': 20})
+    keeper.safe_click_roblox()
+    client.hang(5)
+
+    start = time.perf_counter()
+    ok = keeper.safe_click_roblox()
+    elapsed = (time.perf_counter() - start) * 1000
+    failures = keeper.stats['method_failures']
+    report.row("v2 hung client", not ok and keeper.dispatcher.is_degraded('sendmessage'), elapsed,
+               f"lost postmessage caught by verification ({failures['postmessage']}), "
+               f"sendmessage degraded, {client.dropped} inputs dropped")
+
+
+def async_hung(report, base_dir):
+    backend = SimulatedBackend()
+    client = backend.add_client(state='in_game')
+    config = load_config('config_v2.json', humanization_enabled=False,
+                         click_method_priority=['sendmessage', 'directinput'],
+                         click_verification={'enabled': True, 'settle_ms': 20})
+    keeper = AsyncKeeperV2(base_dir, '', log_callback=quiet, config=config, backend=backend)
+    client.hang(5)
+
+    async def run():
+        # A 5 ms ticker on the same loop: its longest gap is the loop stall
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        task = asyncio.get_running_loop().create_task(ticker())
+        await asyncio.sleep(0.02)
+        start = time.perf_counter()
+        ok = await keeper.safe_click()
+        elapsed = (time.perf_counter() - start) * 1000
+        task.cancel()
+        return ok, elapsed, max(gaps) * 1000
+
+    ok, elapsed, stall = asyncio.run(run())
+    keeper.dispatcher.close()
+    # The frozen client cannot react, so verification rejects the directinput click too
+    checks = keeper.verifier.stats['checks']
+    report.row("async hung client", not ok and checks and stall < 50 and keeper.dispatcher.is_degraded('sendmessage'),
+               elapsed, f"sendmessage degraded, {checks} verification grab(s) off the loop, "
+               f"longest loop stall {stall:.1f} ms")
+
+
+def v2_crash(report, base_dir):
+    backend = SimulatedBackend()
+    client = backend.add_client(state='in_game')
+    keeper = v2_keeper(backend, base_dir)
+    keeper.prober.probe()
+    client.crash()
+
+    start = time.perf_counter()
+    delay = keeper.keeper_tick()
+    elapsed = (time.perf_counter() - start) * 1000
+    keeper.prober.probe()
+    report.row("v2 crash", delay == 5 and not keeper.is_roblox_running(), elapsed,
+               f"tick backs off {delay}s, probe: {keeper.prober.results['postmessage']['reason']}")
+
+
+def fleet(report, base_dir, windows=3):
+    backend = SimulatedBackend()
+    clients = [backend.add_client(state='in_game') for _ in range(windows)]
+    config_path = os.path.join(base_dir, 'fleet.json')
+    with open(config_path, 'w') as f:
+        json.dump(load_config('config_v2.json', humanization_enabled=False), f)
+
+    fleet = KeeperFleet(base_dir, config_path, log_callback=quiet, backend=backend)
+    start = time.perf_counter()
+    managed = fleet.discover_windows()
+    for hwnd, keeper in fleet.keepers.items():
+        keeper.save_stats = lambda: None
+        fleet._click_window(hwnd)
+    elapsed = (time.perf_counter() - start) * 1000
+    clicked = sum(1 for client in clients if client.events)
+    report.row(f"fleet ({windows} windows)", managed == windows and clicked == windows, elapsed,
+               f"{managed} keepers, {clicked} clients clicked, one registry enumeration")
+
+
+# ========================================
+# V1 SCENARIOS
+# ========================================
+
+def v1_keeper(backend, base_dir, **overrides):
+    from keeper_engine import AnimeVanguardsKeeper
+
+    config = load_config('config.json', game_load_wait_seconds=0, **overrides)
+    config['window_resize'] = dict(config.get('window_resize', {}), enabled=False)
+    config_path = os.path.join(base_dir, 'v1.json')
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+    return AnimeVanguardsKeeper(base_dir, config_path, log_callback=lambda message: None, backend=backend)
+
+
+def v1_scenarios(report, base_dir):
+    backend = SimulatedBackend()
+    client = backend.add_client(state='in_game')
+    keeper = v1_keeper(backend, base_dir, auto_relaunch=True,
+                       error_dialog={'verify_delay_seconds': 0.2},
+                       liveness={'sample_interval_seconds': 0.05, 'stall_seconds': 0.3})
+
+    client.show_dialog(1)
+    start = time.perf_counter()
+    ok = keeper.dismiss_error_dialogs()
+    report.row("v1 error dialog", ok and client.state == 'in_game', (time.perf_counter() - start) * 1000,
+               f"detected in {keeper.dialogs.stats['last_ms']:.1f} ms, client back to {client.state}")
+
+    client.load(60)
+    start = time.perf_counter()
+    ok = keeper.safe_click_roblox()
+    report.row("v1 click during loading", not ok and keeper.stats['clicks_skipped_loading'] == 1,
+               (time.perf_counter() - start) * 1000, "skipped, no input sent")
+
+    client.set_state('in_game')
+    presses = len(client.events)
+    start = time.perf_counter()
+    ok = keeper.safe_click_roblox()
+    report.row("v1 AFK click", ok and len(client.events) == presses + 2, (time.perf_counter() - start) * 1000,
+               "double click received (includes activation waits)")
+
+    client.freeze()
+    start = time.perf_counter()
+    deadline = time.monotonic() + 2.0
+    while not keeper.liveness.is_stalled() and time.monotonic() < deadline:
+        keeper.sample_liveness()
+        time.sleep(0.05)
+    client.freeze(False)
+    report.row("v1 frozen picture", keeper.liveness.is_stalled(), (time.perf_counter() - start) * 1000,
+               f"{keeper.liveness.stats['samples']} samples")
+    keeper.liveness.reset()
+
+    client.show_dialog(2)
+    start = time.perf_counter()
+    # The first disconnected reading is only confirmed by the second
+    keeper.monitor_roblox_status()
+    confirmed_early = backend.launches > 0
+    keeper.monitor_roblox_status()
+    relaunched = [c for c in backend.clients.values() if c.alive]
+    report.row("v1 disconnect -> relaunch", not confirmed_early and backend.launches == 1 and not client.alive and
+               len(relaunched) == 1 and relaunched[0].state in ('loading', 'in_game'),
+               (time.perf_counter() - start) * 1000,
+               f"{keeper.stats['disconnects']} disconnect, new client {relaunched[0].state if relaunched else '-'}")
+
+    relaunched[0].crash() if relaunched else None
+    start = time.perf_counter()
+    ok = keeper.monitor_roblox_status()
+    report.row("v1 crash", not ok and keeper.stats['roblox_crashes'] == 1, (time.perf_counter() - start) * 1000,
+               "reported by the status check")
+    keeper.detection_executor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keeper end-to-end runs on simulated clients")
+    parser.add_argument('--clicks', type=int, default=20)
+    parser.add_argument('--skip-v1', action='store_true', help="V2/fleet only (V1 runs take a few seconds)")
+    args = parser.parse_args()
+
+    base_dir = tempfile.mkdtemp(prefix="keeper_sim_")
+
+    print("=" * 80)
+    print("🧪 SIMULATED END-TO-END RUNS")
+    print("=" * 80)
+    report = Report()
+    v2_clicks(report, base_dir, args.clicks)
+    v2_hung(report, base_dir)
+    async_hung(report, base_dir)
+    v2_crash(report, base_dir)
+    fleet(report, base_dir)
+    if not args.skip_v1:
+        v1_scenarios(report, base_dir)
+    print("-" * 80)
+    print("OK" if not report.failed else f"FAILED ({report.failed})")
+    return 0 if not report.failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Keeper pipeline on a real X server
+
+Runs AnimeVanguardsKeeperV2 on X11Backend (src/x11_backend.py) against
+a stand-in Tk window titled "Roblox": an animated canvas that logs
+every button press it receives with a CLOCK_MONOTONIC timestamp.
+Without DISPLAY an Xvfb server is started for the run.
+
+Reports:
+- window discovery (EWMH, or root children without a window manager)
+- capture: MIT-SHM grabs vs mss, same figures as bench_capture.py
+- input: InputDispatcher p50 / p99 per click method (the numbers
+  get_stats()['dispatch'] shows for the Windows methods) and the
+  end-to-end delay until the Tk window saw the press
+
+Usage:
+    python scripts/bench_x11.py [--frames 200] [--clicks 30]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from bench_capture import measure
+from capture_service import CaptureService
+
+STAND_IN = r'''
+import sys, time, tkinter as tk
+root = tk.Tk()
+root.title("Roblox")
+root.geometry("800x600+40+40")
+canvas = tk.Canvas(root, width=800, height=600, bg="#1e6e3c", highlightthickness=0)
+canvas.pack()
+sprite = canvas.create_oval(0, 280, 40, 320, fill="#f0c020")
+def on_press(event):
+    print(f"press {time.monotonic():.6f} {event.x} {event.y} {event.send_event}", flush=True)
+    canvas.create_rectangle(event.x - 10, event.y - 10, event.x + 10, event.y + 10, fill="white")
+def tick(step=[0]):
+    step[0] = (step[0] + 8) % 760
+    canvas.coords(sprite, step[0], 280, step[0] + 40, 320)
+    root.after(33, tick)
+canvas.bind("<ButtonPress-1>", on_press)
+root.after(33, tick)
+print("ready", flush=True)
+root.mainloop()
+'''
+
+
+def start_xvfb():
+    """Start Xvfb on a free display number; returns the process or None"""
+    if not shutil.which('Xvfb'):
+        return None
+    for number in range(99, 120):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            continue
+        process = subprocess.Popen(['Xvfb', f":{number}", '-screen', '0', '1280x720x24', '-nolisten', 'tcp'],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(50):
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ['DISPLAY'] = f":{number}"
+                return process
+            time.sleep(0.1)
+        process.kill()
+    return None
+
+
+class StandIn:
+    """The Tk window process and the presses it reported"""
+
+    def __init__(self):
+        self.process = subprocess.Popen([sys.executable, '-c', STAND_IN], stdout=subprocess.PIPE, text=True)
+        self.presses = []
+        self.ready = threading.Event()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            if line.startswith('ready'):
+                self.ready.set()
+            elif line.startswith('press'):
+                self.presses.append(float(line.split()[1]))
+
+    def wait_press(self, count: int, timeout: float = 1.0) -> float:
+        """Monotonic time of press number count (None on timeout)"""
+        deadline = time.monotonic() + timeout
+        while len(self.presses) < count and time.monotonic() < deadline:
+            time.sleep(0.0005)
+        return self.presses[count - 1] if len(self.presses) >= count else None
+
+    def close(self):
+        self.process.terminate()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def bench_input(keeper, stand_in, method, clicks):
+    """Clicks through one method; returns end-to-end delays in ms"""
+    click = dict(keeper.click_methods)[method]
+    rect = keeper.get_window_rect()
+    delays = []
+    for _ in range(clicks):
+        seen = len(stand_in.presses)
+        start = time.monotonic()
+        if not click(rect['width'] // 2, rect['height'] // 2):
+            continue
+        pressed = stand_in.wait_press(seen + 1)
+        if pressed is not None:
+            delays.append((pressed - start) * 1000)
+        time.sleep(0.05)
+    return delays
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keeper pipeline on a real X server")
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--clicks', type=int, default=30)
+    args = parser.parse_args()
+
+    xvfb = None
+    if not os.environ.get('DISPLAY'):
+        xvfb = start_xvfb()
+        if xvfb is None:
+            print("No DISPLAY and no Xvfb on PATH - nothing to run against")
+            return 1
+
+    from x11_backend import X11Backend
+    from keeper_engine_v2 import AnimeVanguardsKeeperV2
+
+    stand_in = StandIn()
+    backend = None
+    try:
+        if not stand_in.ready.wait(10):
+            print("Stand-in window did not start (tkinter missing?)")
+            return 1
+        backend = X11Backend()
+
+        print("=" * 80)
+        print(f"🐧 X11 BACKEND - DISPLAY {os.environ['DISPLAY']}, "
+              f"{'MIT-SHM' if backend.capture.shm else 'no MIT-SHM (mss fallback)'}, "
+              f"{'XTest' if backend.xtest else 'no XTest'}")
+        print("=" * 80)
+
+        start = time.perf_counter()
+        hwnd = None
+        while hwnd is None and time.perf_counter() - start < 5:
+            hwnd = backend.find_window("Roblox")
+        rect = backend.client_rect(hwnd) if hwnd else None
+        print(f"Discovery: window {hwnd:#x} at {rect} in {(time.perf_counter() - start) * 1000:.1f} ms"
+              if hwnd else "Discovery: stand-in window not found")
+        if not hwnd:
+            return 1
+
+        print("-" * 80)
+        region = (rect['x'], rect['y'], rect['width'], rect['height'])
+        mss_capture = CaptureService()
+        mss_ms, _ = measure("mss (XGetImage)", lambda: mss_capture.grab(*region), args.frames)
+        shm_ms, _ = measure("X11Capture (MIT-SHM)", lambda: backend.capture.grab(*region), args.frames)
+        mss_capture.close()
+        stats = backend.capture.stats
+        print(f"Capture: {1000 / max(shm_ms, 1e-6):.0f} fps MIT-SHM vs {1000 / max(mss_ms, 1e-6):.0f} fps mss "
+              f"({stats['frames']} frames, avg {stats['total_ms'] / max(stats['frames'], 1):.2f} ms)")
+
+        print("-" * 80)
+        base_dir = tempfile.mkdtemp(prefix="keeper_x11_")
+        config = {'humanization_enabled': False, 'click_method_priority': ['postmessage', 'pyautogui']}
+        keeper = AnimeVanguardsKeeperV2(base_dir, '', log_callback=lambda message, level="INFO": None,
+                                        config=config, backend=backend)
+        keeper.save_stats = lambda: None
+        methods = [name for name, _ in keeper.click_methods]
+        print(f"Click methods: {', '.join(methods)}")
+
+        delays = {method: bench_input(keeper, stand_in, method, args.clicks) for method in methods}
+        dispatch = keeper.get_stats()['dispatch']
+        for method in methods:
+            stats = dispatch.get(method, {})
+            seen = delays[method]
+            print(f"{method:12s} dispatch p50 {stats.get('p50_ms') or 0:7.2f} ms | p99 {stats.get('p99_ms') or 0:7.2f} ms | "
+                  f"delivered {len(seen)}/{args.clicks}, end-to-end p50 {percentile(seen, 0.5):6.2f} ms "
+                  f"p99 {percentile(seen, 0.99):6.2f} ms")
+        keeper.dispatcher.close()
+        return 0
+    finally:
+        stand_in.close()
+        if backend:
+            backend.close()
+        if xvfb:
+            xvfb.terminate()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,17 +9,34 @@ import pyautogui
 import subprocess
 from datetime import datetime
 import os
+import sys
 import json
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from keeper_scheduler import DeadlineScheduler
+
+try:
+    import cv2
+    from screen_state import ScreenStateClassifier
+    SCREEN_STATE_AVAILABLE = True
+except ImportError:
+    SCREEN_STATE_AVAILABLE = False
+
 # Configuration
 BASE_DIR = "/Users/giangeralcus/Desktop/RobloxKeeper"
 CLICK_INTERVAL_MINUTES = 18
 CLICK_INTERVAL_SECONDS = CLICK_INTERVAL_MINUTES * 60
 SCREENSHOT_INTERVAL_SECONDS = 3600  # 1 hour
+ERROR_CHECK_INTERVAL_SECONDS = 15
+STATUS_CHECK_INTERVAL_SECONDS = 30
+STATUS_RETRY_SECONDS = 10  # while Roblox is down: recheck, and hold clicks/screenshots
+DASHBOARD_INTERVAL_SECONDS = 300
+COUNTDOWN_REFRESH_SECONDS = 10
 LOG_FILE = f"{BASE_DIR}/logs/keeper.log"
 STATUS_FILE = f"{BASE_DIR}/logs/status.json"
 SCREENSHOT_DIR = f"{BASE_DIR}/screenshots"
 STATS_LOG = f"{BASE_DIR}/logs/stats.log"
+SCREEN_STATE_CACHE = f"{BASE_DIR}/logs/screen_state_refs.json"
 
 # Tracking
 stats = {
@@ -161,13 +178,22 @@ def dismiss_error_dialogs():
         log_message(f"Error dismissing dialogs: {e}", "WARN")
         return False
 
+screen_states = None
+
 def check_for_loading_screen(screenshot_path):
     """Check if Roblox is showing a loading screen"""
+    global screen_states
     try:
-        # Simple check: if screenshot is very small or uniform, might be loading
-        # This is a placeholder - you can enhance with actual image analysis
+        if SCREEN_STATE_AVAILABLE:
+            if screen_states is None:
+                screen_states = ScreenStateClassifier({}, BASE_DIR, SCREEN_STATE_CACHE, log_callback=log_message)
+            image = cv2.imread(screenshot_path, cv2.IMREAD_COLOR)
+            if image is not None:
+                state, confidence = screen_states.classify(image)
+                return state == 'loading' and screen_states.is_confident()
+
+        # Without OpenCV: a suspiciously small file (< 100KB) is usually a loading/blank screen
         file_size = os.path.getsize(screenshot_path)
-        # If file is suspiciously small (< 100KB), might be loading/blank screen
         if file_size < 100000:
             return True
         return False
@@ -435,63 +461,58 @@ take_screenshot()
 
 print_dashboard()
 
-try:
-    last_click_time = time.time()
-    last_screenshot_time = time.time()
-    last_status_check = time.time()
-    last_dashboard_update = time.time()
-    last_error_check = time.time()
-
-    while True:
-        current_time = time.time()
-
-        # Check for error dialogs every 15 seconds
-        if current_time - last_error_check >= 15:
-            dismiss_error_dialogs()
-            last_error_check = current_time
-
-        # Check Roblox status every 30 seconds
-        if current_time - last_status_check >= 30:
-            if not monitor_roblox_status():
-                # Roblox crashed and auto-relaunch failed or is disabled
-                print("\n⚠️  Waiting for manual restart...")
-                time.sleep(10)
-                last_status_check = current_time
-                continue
-            last_status_check = current_time
-
-        # Check if it's time for screenshot (every hour)
-        if current_time - last_screenshot_time >= SCREENSHOT_INTERVAL_SECONDS:
-            log_message("📊 Hourly screenshot time!")
-            take_screenshot()
-            last_screenshot_time = current_time
-
-        # Check if it's time to click (every 18 minutes)
-        if current_time - last_click_time >= CLICK_INTERVAL_SECONDS:
-            log_message("⏰ Time to keep active!")
-            safe_click_roblox()
-            last_click_time = current_time
-
-        # Update dashboard every 5 minutes
-        if current_time - last_dashboard_update >= 300:
-            print("\033[2J\033[H")  # Clear screen
-            print_dashboard()
-            last_dashboard_update = current_time
-
-        # Show countdown
-        next_screenshot_in = int(SCREENSHOT_INTERVAL_SECONDS - (current_time - last_screenshot_time))
-        next_click_in = int(CLICK_INTERVAL_SECONDS - (current_time - last_click_time))
-
-        hrs_shot = next_screenshot_in // 3600
-        mins_shot = (next_screenshot_in % 3600) // 60
-        secs_shot = next_screenshot_in % 60
-
-        mins_click = next_click_in // 60
-        secs_click = next_click_in % 60
-
-        print(f"\r⏳ Next screenshot: {hrs_shot}h {mins_shot}m {secs_shot}s | Next click: {mins_click}m {secs_click}s | Status: {stats['status']:10s}   ", end='', flush=True)
+roblox_down = False
+
+def scheduled_status_check():
+    """Check Roblox status"""
+    global roblox_down
+    roblox_down = not monitor_roblox_status()
+    if roblox_down:
+        # Roblox crashed and auto-relaunch failed or is disabled
+        print("\n⚠️  Waiting for manual restart...")
+        return STATUS_RETRY_SECONDS
+
+def scheduled_screenshot():
+    if roblox_down:
+        return STATUS_RETRY_SECONDS  # held until Roblox is back
+    log_message("📊 Hourly screenshot time!")
+    take_screenshot()
+
+def scheduled_click():
+    if roblox_down:
+        return STATUS_RETRY_SECONDS  # held until Roblox is back
+    log_message("⏰ Time to keep active!")
+    safe_click_roblox()
+
+def scheduled_dashboard():
+    print("\033[2J\033[H")  # Clear screen
+    print_dashboard()
 
-        time.sleep(1)
+def show_countdown():
+    """Show countdown to the next screenshot and click"""
+    next_screenshot_in = int(scheduler.time_until('screenshot') or 0)
+    next_click_in = int(scheduler.time_until('click') or 0)
+
+    hrs_shot = next_screenshot_in // 3600
+    mins_shot = (next_screenshot_in % 3600) // 60
+    secs_shot = next_screenshot_in % 60
+
+    mins_click = next_click_in // 60
+    secs_click = next_click_in % 60
+
+    print(f"\r⏳ Next screenshot: {hrs_shot}h {mins_shot}m {secs_shot}s | Next click: {mins_click}m {secs_click}s | Status: {stats['status']:10s}   ", end='', flush=True)
+
+# Sleep until the next task is due instead of waking every second
+scheduler = DeadlineScheduler(log_callback=log_message)
+scheduler.schedule('error_check', ERROR_CHECK_INTERVAL_SECONDS, dismiss_error_dialogs)
+scheduler.schedule('status_check', STATUS_CHECK_INTERVAL_SECONDS, scheduled_status_check)
+scheduler.schedule('screenshot', SCREENSHOT_INTERVAL_SECONDS, scheduled_screenshot)
+scheduler.schedule('click', CLICK_INTERVAL_SECONDS, scheduled_click)
+scheduler.schedule('dashboard', DASHBOARD_INTERVAL_SECONDS, scheduled_dashboard)
+scheduler.schedule('countdown', COUNTDOWN_REFRESH_SECONDS, show_countdown, first_delay=0)
+
+try:
+    scheduler.run()
 
 except KeyboardInterrupt:
     log_message("🛑 Keeper stopped by user")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Blob Engine - connected components with vectorized filtering
+
+Replaces the findContours -> [contourArea for c in contours] -> max()
+-> cv2.moments pattern used by every detector. On noisy frames that
+pattern makes several Python-level passes over thousands of contours.
+
+extract_blobs runs a single cv2.connectedComponentsWithStats pass and
+returns area, bounding box and centroid arrays; filtering and ranking
+are NumPy operations over those arrays. Labelling costs per pixel, so
+an empty mask returns before it and only the bounding rectangle of the
+foreground is labelled. A clean full-frame mask with blobs spread out
+is still a few ms, several times slower than findContours; the
+single pass wins as soon as the mask is noisy (hundreds of contours).
+"""
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class Blobs:
+    """Connected components of a mask as parallel arrays"""
+
+    def __init__(self, areas: np.ndarray, bboxes: np.ndarray, centroids: np.ndarray):
+        self.areas = areas          # (N,) pixel counts
+        self.bboxes = bboxes        # (N, 4) x, y, w, h
+        self.centroids = centroids  # (N, 2) x, y (float)
+
+    def __len__(self) -> int:
+        return len(self.areas)
+
+    def _subset(self, keep: np.ndarray) -> 'Blobs':
+        return Blobs(self.areas[keep], self.bboxes[keep], self.centroids[keep])
+
+    def filter_area(self, min_area: Optional[float] = None, max_area: Optional[float] = None) -> 'Blobs':
+        """Blobs with min_area < area < max_area (exclusive, like the old checks)"""
+        keep = np.ones(len(self), dtype=bool)
+        if min_area is not None:
+            keep &= self.areas > min_area
+        if max_area is not None:
+            keep &= self.areas < max_area
+        return self._subset(keep)
+
+    def filter_aspect(self, min_ratio: float, max_ratio: float) -> 'Blobs':
+        """Blobs whose bbox width/height ratio is strictly inside the range"""
+        w = self.bboxes[:, 2].astype(np.float32)
+        h = np.maximum(self.bboxes[:, 3], 1).astype(np.float32)
+        ratio = w / h
+        return self._subset((ratio > min_ratio) & (ratio < max_ratio))
+
+    def filter_fill(self, min_fill: float) -> 'Blobs':
+        """Blobs covering at least min_fill of their bounding box (rectangles ~1.0)"""
+        box_area = np.maximum(self.bboxes[:, 2] * self.bboxes[:, 3], 1)
+        return self._subset(self.areas / box_area >= min_fill)
+
+    def largest(self) -> Optional[int]:
+        """Index of the largest blob"""
+        if not len(self):
+            return None
+        return int(np.argmax(self.areas))
+
+    def centroid(self, index: int) -> Tuple[int, int]:
+        """Integer centroid of one blob"""
+        cx, cy = self.centroids[index]
+        return int(cx), int(cy)
+
+    def largest_centroid(self) -> Optional[Tuple[int, int]]:
+        """Centroid of the largest blob"""
+        index = self.largest()
+        return None if index is None else self.centroid(index)
+
+    def first_centroid(self) -> Optional[Tuple[int, int]]:
+        """Centroid of the first blob in raster order (top-most)"""
+        return self.centroid(0) if len(self) else None
+
+
+def _empty() -> Blobs:
+    return Blobs(np.zeros(0, dtype=np.int32), np.zeros((0, 4), dtype=np.int32), np.zeros((0, 2)))
+
+
+def extract_blobs(mask: np.ndarray, connectivity: int = 8, scale: float = 1.0) -> Blobs:
+    """
+    All foreground components of a 0/255 mask (background excluded)
+
+    scale is the mask's size relative to full resolution (0.25 for a
+    1/4 pyramid level); results are reported in full-resolution units
+    so area thresholds and offsets work at any level.
+    """
+    # Most masks are empty most of the time (the color isn't on screen)
+    if not cv2.countNonZero(mask):
+        return _empty()
+
+    # Labelling costs per pixel of the image, not per blob: label only the
+    # rectangle that holds the foreground (usually one UI element)
+    x, y, w, h = cv2.boundingRect(mask)
+    if w * h < mask.size // 2:
+        mask = mask[y:y + h, x:x + w]
+    else:
+        x = y = 0
+
+    # Grana's block-based labelling is several times faster than the
+    # default for 8-connectivity; OpenCV falls back to SAUF for 4
+    _, _, stats, centroids = cv2.connectedComponentsWithStatsWithAlgorithm(
+        mask, connectivity, cv2.CV_32S, cv2.CCL_GRANA
+    )
+    areas, bboxes, centroids = stats[1:, cv2.CC_STAT_AREA], stats[1:, :cv2.CC_STAT_AREA], centroids[1:]
+
+    if x or y:
+        bboxes[:, 0] += x
+        bboxes[:, 1] += y
+        centroids += (x, y)
+
+    if scale != 1.0:
+        areas = areas / (scale * scale)
+        bboxes = bboxes / scale
+        centroids = centroids / scale
+
+    return Blobs(areas, bboxes, centroids)
+
+
+def extract_regions(edges: np.ndarray, scale: float = 1.0) -> Blobs:
+    """
+    Regions enclosed by an edge map
+
+    Components of the non-edge pixels, 4-connected so one-pixel edge
+    lines separate them. A closed rectangle outline yields one region
+    that fills its bounding box.
+    """
+    return extract_blobs(cv2.bitwise_not(edges), connectivity=4, scale=scale)
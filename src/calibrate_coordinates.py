@@ -52,6 +52,21 @@ def take_screenshot():
     print(f"📸 Screenshot saved: {screenshot_path}")
     return screenshot_path, window
 
+def save_template(screenshot_path, target, x, y, width, height):
+    """Save a crop around (x, y) as a template-matching reference for target"""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    template_dir = os.path.join(base_dir, "templates", target)
+    os.makedirs(template_dir, exist_ok=True)
+
+    img = Image.open(screenshot_path)
+    left = max(0, x - width // 2)
+    top = max(0, y - height // 2)
+    box = (left, top, min(img.width, left + width), min(img.height, top + height))
+
+    template_path = os.path.join(template_dir, "calibrated.png")
+    img.crop(box).save(template_path)
+    print(f"   🧩 Template saved: {template_path}")
+
 def calibrate():
     """Interactive calibration"""
     print("=" * 70)
@@ -98,6 +113,7 @@ def calibrate():
     game_x = pos1.x - window.left
     game_y = pos1.y - window.top
     print(f"   ✓ Game card: ({game_x}, {game_y})")
+    save_template(screenshot_path, "game_card", game_x, game_y, 200, 150)
 
     # Calibrate play button
     print("\n   Now click the game card manually...")
@@ -107,6 +123,11 @@ def calibrate():
     play_y = pos2.y - window.top
     print(f"   ✓ Play button: ({play_x}, {play_y})")
 
+    # The game page is open now: capture it for the play button template
+    result = take_screenshot()
+    if result:
+        save_template(result[0], "play_button", play_x, play_y, 180, 70)
+
     # Calibrate AFK position
     print("\n   Close the game details page manually...")
     input("3. Position mouse at CENTER of screen (for AFK clicks), then press ENTER...")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Capture Service - long-lived screen grabber with zero-copy frames
+
+The old capture path opened a new mss context for every grab and then
+converted screenshot.rgb -> PIL Image -> np.array -> cv2 BGR, copying
+the full frame three or more times. This service:
+- Keeps one mss grabber alive per thread (mss/GDI handles are not
+  shareable across threads)
+- Returns frames as a BGRA np.ndarray view over mss's raw buffer,
+  so no pixel data is copied after the grab
+- Offers to_bgr/to_gray helpers that accept BGRA or BGR, so
+  detectors can take the view directly
+"""
+
+import threading
+import time
+
+import cv2
+import mss
+import numpy as np
+
+
+def to_bgr(frame: np.ndarray) -> np.ndarray:
+    """BGR image from a BGRA capture view (or a BGR image as-is)"""
+    if frame.ndim == 3 and frame.shape[2] == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+    return frame
+
+
+def to_gray(frame: np.ndarray) -> np.ndarray:
+    """Grayscale image straight from BGRA or BGR"""
+    if frame.ndim == 2:
+        return frame
+    if frame.shape[2] == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+def screenshot_to_array(screenshot) -> np.ndarray:
+    """Zero-copy BGRA view over an mss ScreenShot's raw buffer"""
+    return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+        screenshot.height, screenshot.width, 4
+    )
+
+
+class CaptureService:
+    """
+    Keeps one mss grabber alive and hands out BGRA frame views
+
+    A returned frame stays valid until it is dropped; each grab gets its
+    own buffer from mss, so callers may keep older frames around.
+    """
+
+    # Reads the screen: a covered window shows whatever covers it
+    background = False
+
+    def __init__(self):
+        self._local = threading.local()
+        self._grabbers = []
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'frames': 0,
+            'total_ms': 0.0,
+            'last_ms': 0.0
+        }
+
+    def _grabber(self):
+        """The calling thread's mss instance (created once)"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._lock:
+                self._grabbers.append(sct)
+        return sct
+
+    def grab(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        """Grab a screen region as a BGRA (height, width, 4) uint8 view"""
+        start = time.perf_counter()
+
+        monitor = {"left": left, "top": top, "width": width, "height": height}
+        frame = screenshot_to_array(self._grabber().grab(monitor))
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats['frames'] += 1
+        self.stats['total_ms'] += elapsed
+        self.stats['last_ms'] = elapsed
+        return frame
+
+    def grab_window(self, window_info: dict) -> np.ndarray:
+        """Grab a whole window given a get_window_rect() dict"""
+        return self.grab(window_info['x'], window_info['y'],
+                         window_info['width'], window_info['height'])
+
+    @staticmethod
+    def save_png(frame: np.ndarray, path: str) -> bool:
+        """Write a capture to disk (alpha dropped, mss leaves it undefined)"""
+        return cv2.imwrite(path, to_bgr(frame))
+
+    def release(self, hwnd: int):
+        """Free what is held for one window that went away (nothing: grabs read the screen)"""
+
+    def close(self):
+        """Release every grabber this service created"""
+        with self._lock:
+            for sct in self._grabbers:
+                try:
+                    sct.close()
+                except Exception:
+                    pass
+            self._grabbers = []
+        self._local = threading.local()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Click Verifier - did the game react to the click?
+
+safe_click_roblox counted a click as delivered when PostMessageW
+returned, but PostMessage is asynchronous: the stats said 100% success
+while Roblox ignored the messages. ClickVerifier grabs small ROIs just
+before and just after the input (after settle_ms, so the game has drawn
+its reaction) and scores the change:
+- click ROI: roi_size square around the click point, as grayscale
+- score = fraction of pixels whose absolute difference > pixel_delta,
+  minus the same fraction in a control ROI of the same size beside it
+  (ambient animation moves both, a reaction to the click moves one)
+- indicator_roi (optional, client coordinates): an idle-timer / AFK
+  indicator; any change there counts as a reaction by itself
+A click counts as delivered when score >= min_score or the indicator
+changed. The verdict feeds method ordering like any other outcome.
+Verification costs four small grabs and two absdiffs (~1-3 ms); the
+settle wait is latency, not CPU.
+
+Config:
+    "click_verification": {
+        "enabled": false,
+        "roi_size": 48,
+        "settle_ms": 120,
+        "pixel_delta": 12,
+        "min_score": 0.02,
+        "indicator_roi": null
+    }
+"""
+
+import time
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from capture_service import CaptureService, to_gray
+
+
+class ClickSnapshot:
+    """ROIs grabbed right before a click"""
+
+    __slots__ = ('regions', 'frames', 'grab_ms')
+
+    def __init__(self, regions: dict, frames: dict, grab_ms: float):
+        self.regions = regions      # name -> (left, top, width, height) on screen
+        self.frames = frames        # name -> grayscale ROI
+        self.grab_ms = grab_ms
+
+
+class ClickVerifier:
+    """Before/after ROI comparison around the click point"""
+
+    def __init__(self, config: dict, grab: Optional[Callable] = None):
+        """grab(left, top, width, height) returns a BGRA/BGR/gray frame; defaults to CaptureService"""
+        self._grab = grab
+        self._capture = None
+
+        self.stats = {
+            'checks': 0,
+            'reacted': 0,
+            'unchanged': 0,
+            'unknown': 0,
+            'last_score': 0.0,
+            'last_ms': 0.0,
+            'total_ms': 0.0
+        }
+
+        self.configure(config)
+
+    def configure(self, config: dict):
+        settings = config.get('click_verification', {})
+        self.enabled = settings.get('enabled', False)
+        self.roi_size = settings.get('roi_size', 48)
+        self.settle_seconds = settings.get('settle_ms', 120) / 1000.0
+        self.pixel_delta = settings.get('pixel_delta', 12)
+        self.min_score = settings.get('min_score', 0.02)
+        self.indicator_roi = settings.get('indicator_roi')
+
+    def grab(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        if self._grab is not None:
+            return self._grab(left, top, width, height)
+        if self._capture is None:
+            self._capture = CaptureService()
+        return self._capture.grab(left, top, width, height)
+
+    # ========================================
+    # REGIONS
+    # ========================================
+
+    def _regions(self, window_rect: dict, x: int, y: int) -> dict:
+        """Screen regions to compare: click ROI, control ROI, optional indicator"""
+        size = self.roi_size
+        width, height = window_rect['width'], window_rect['height']
+
+        def square(cx, cy):
+            left = min(max(0, cx - size // 2), max(0, width - size))
+            top = min(max(0, cy - size // 2), max(0, height - size))
+            return (window_rect['x'] + left, window_rect['y'] + top, min(size, width), min(size, height))
+
+        # Control beside the click ROI, on the side with more room
+        offset = 2 * size if x < width // 2 else -2 * size
+        regions = {'click': square(x, y), 'control': square(x + offset, y)}
+
+        if self.indicator_roi:
+            roi = self.indicator_roi
+            regions['indicator'] = (window_rect['x'] + roi['x'], window_rect['y'] + roi['y'],
+                                    roi['width'], roi['height'])
+        return regions
+
+    def _grab_gray(self, region) -> np.ndarray:
+        frame = self.grab(*region)
+        return frame if frame.ndim == 2 else to_gray(frame)
+
+    def _changed(self, before: np.ndarray, after: np.ndarray) -> float:
+        if before.shape != after.shape:
+            return 1.0
+        return float(np.count_nonzero(cv2.absdiff(before, after) > self.pixel_delta)) / before.size
+
+    # ========================================
+    # VERIFY
+    # ========================================
+
+    def before(self, window_rect: Optional[dict], x: int, y: int) -> Optional[ClickSnapshot]:
+        """Grab the ROIs before the input; None when verification is off or impossible"""
+        if not self.enabled or not window_rect:
+            return None
+
+        start = time.perf_counter()
+        regions = self._regions(window_rect, x, y)
+        try:
+            frames = {name: self._grab_gray(region) for name, region in regions.items()}
+        except Exception:
+            self.stats['unknown'] += 1
+            return None
+        return ClickSnapshot(regions, frames, (time.perf_counter() - start) * 1000)
+
+    def after(self, snapshot: ClickSnapshot) -> Optional[bool]:
+        """
+        Grab the ROIs again (call settle_seconds after the input)
+
+        Returns True if the game reacted, False if not, None if the
+        second grab failed.
+        """
+        start = time.perf_counter()
+        try:
+            frames = {name: self._grab_gray(region) for name, region in snapshot.regions.items()}
+        except Exception:
+            self.stats['unknown'] += 1
+            return None
+
+        changes = {name: self._changed(snapshot.frames[name], frame) for name, frame in frames.items()}
+        score = changes['click'] - changes['control']
+        reacted = score >= self.min_score or changes.get('indicator', 0.0) > 0.0
+
+        # Both grabs and the scoring, excluding the input itself and the settle wait
+        elapsed = (time.perf_counter() - start) * 1000 + snapshot.grab_ms
+        self.stats['checks'] += 1
+        self.stats['reacted' if reacted else 'unchanged'] += 1
+        self.stats['last_score'] = round(score, 4)
+        self.stats['last_ms'] = elapsed
+        self.stats['total_ms'] += elapsed
+        return reacted
+
+    def get_stats(self) -> dict:
+        stats = self.stats.copy()
+        stats['avg_ms'] = stats['total_ms'] / stats['checks'] if stats['checks'] else 0.0
+        return stats
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Color Classifier - every color range in one lookup-table pass
+
+The detectors used to run one cv2.inRange per color (yellow, purple,
+two greens, several blues in BGR and HSV) and OR the masks together.
+Each new rule meant another full-frame pass.
+
+A box range in a 3-channel color space is a per-channel test, so the
+whole rule set compiles into three 256-entry bitmask tables per space:
+    labels = T0[c0] & T1[c1] & T2[c2]
+cv2.LUT applies all three tables in one pass over the frame, and the
+result labels every pixel with all matching classes at once (8 classes
+per uint8 bank; more rules just add banks). A detector then reads its
+mask bits from the label plane instead of scanning the frame again.
+"""
+
+import copy
+
+import cv2
+import numpy as np
+
+
+# Color ranges used by the keeper_engine detectors (OpenCV HSV: H 0-179)
+DEFAULT_COLOR_RULES = {
+    'star_yellow':         {'space': 'hsv', 'lower': [20, 100, 100], 'upper': [30, 255, 255]},
+    'title_purple':        {'space': 'hsv', 'lower': [120, 50, 50],  'upper': [150, 255, 255]},
+    'dragon_green_bright': {'space': 'hsv', 'lower': [35, 80, 80],   'upper': [85, 255, 255]},
+    'dragon_green_dark':   {'space': 'hsv', 'lower': [35, 40, 40],   'upper': [85, 255, 150]},
+    'pattern_green':       {'space': 'hsv', 'lower': [35, 40, 40],   'upper': [85, 255, 255]},
+    'button_blue_hsv':     {'space': 'hsv', 'lower': [100, 100, 100], 'upper': [130, 255, 255]},
+    'button_blue_bgr1':    {'space': 'bgr', 'lower': [180, 100, 30], 'upper': [255, 200, 100]},
+    'button_blue_bgr2':    {'space': 'bgr', 'lower': [150, 80, 40],  'upper': [255, 180, 80]},
+}
+
+BITS_PER_BANK = 8
+
+
+class ColorClassifier:
+    """Compiles color rules into per-channel bitmask LUTs"""
+
+    def __init__(self, rules: dict = None):
+        self.rules = copy.deepcopy(rules if rules is not None else DEFAULT_COLOR_RULES)
+        self._slots = {}   # rule name -> (space, bank, bit value)
+        self._luts = {}    # (space, bank) -> (1, 256, 3) uint8 table
+        self._compile()
+
+    @classmethod
+    def from_config(cls, config: dict):
+        """Default rules with config 'color_rules' entries added or overridden"""
+        rules = copy.deepcopy(DEFAULT_COLOR_RULES)
+        rules.update(config.get('color_rules', {}))
+        return cls(rules)
+
+    def _compile(self):
+        """Assign each rule a bit and build the lookup tables"""
+        per_space = {}
+        for name, rule in self.rules.items():
+            space = rule.get('space', 'hsv')
+            if space not in ('hsv', 'bgr'):
+                raise ValueError(f"Color rule '{name}': unknown space '{space}'")
+
+            index = per_space.get(space, 0)
+            per_space[space] = index + 1
+            bank, bit = divmod(index, BITS_PER_BANK)
+            self._slots[name] = (space, bank, 1 << bit)
+
+            table = self._luts.setdefault((space, bank), np.zeros((1, 256, 3), dtype=np.uint8))
+            for channel in range(3):
+                lo = max(0, int(rule['lower'][channel]))
+                hi = min(255, int(rule['upper'][channel]))
+                if lo <= hi:
+                    table[0, lo:hi + 1, channel] |= 1 << bit
+
+    def classify(self, plane: np.ndarray, space: str, bank: int = 0) -> np.ndarray:
+        """Label plane for one (space, bank): one LUT pass + two ANDs"""
+        labelled = cv2.LUT(plane, self._luts[(space, bank)])
+        c0, c1, c2 = cv2.split(labelled)
+        return cv2.bitwise_and(cv2.bitwise_and(c0, c1), c2)
+
+    def bits(self, names) -> dict:
+        """Group rule names into {(space, bank): OR-ed bit value}"""
+        if isinstance(names, str):
+            names = [names]
+
+        grouped = {}
+        for name in names:
+            if name not in self._slots:
+                raise KeyError(f"Unknown color rule: {name}")
+            space, bank, bit = self._slots[name]
+            grouped[(space, bank)] = grouped.get((space, bank), 0) | bit
+        return grouped
+
+    @staticmethod
+    def mask_from_labels(labels: np.ndarray, bits: int) -> np.ndarray:
+        """0/255 mask of pixels carrying any of the given bits"""
+        if bits == 0xFF:
+            return cv2.compare(labels, 0, cv2.CMP_GT)
+        return cv2.compare(cv2.bitwise_and(labels, bits), 0, cv2.CMP_GT)
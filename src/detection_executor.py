@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Detection Executor - bounded thread pool for independent detectors
+
+OpenCV releases the GIL inside cvtColor/LUT/connectedComponents/
+matchTemplate, and OCR runs in a tesseract subprocess, yet the
+detectors used to run strictly one after another. The executor runs
+them side by side on a small pool against the same read-only frame
+(FrameAnalysis computes each shared plane once, under a lock).
+
+Each detector gets a timeout: VotingEngine stops waiting for a
+detector once its time is up, so a slow OCR call cannot hold back a
+decision the color detectors already support. A timed-out call keeps
+its worker until it returns (threads cannot be killed); the pool is
+sized so one stuck call does not starve the rest.
+
+Config:
+    "detection_executor": {
+        "enabled": true,
+        "max_workers": 4,
+        "timeout_ms": 1500,
+        "timeouts_ms": {"ocr": 4000}
+    }
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+
+class DetectionExecutor:
+    """Lazily started thread pool plus per-detector timeouts"""
+
+    def __init__(self, config: dict = None):
+        self._pool = None
+        self._lock = threading.Lock()
+        self.configure(config or {})
+
+    def configure(self, config: dict):
+        """(Re)read executor settings; a new pool size applies on next start"""
+        settings = config.get('detection_executor', {})
+        self.enabled = settings.get('enabled', True)
+        max_workers = settings.get('max_workers', 4)
+        self.timeout_ms = settings.get('timeout_ms', 1500)
+        self.timeouts_ms = settings.get('timeouts_ms', {})
+
+        if getattr(self, 'max_workers', max_workers) != max_workers:
+            self.close()
+        self.max_workers = max_workers
+
+    def timeout_for(self, name: str) -> float:
+        """Seconds to wait for a detector's result"""
+        return self.timeouts_ms.get(name, self.timeout_ms) / 1000.0
+
+    def submit(self, func: Callable, *args) -> Future:
+        """Run func(*args) on the pool"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="detector")
+            pool = self._pool
+        return pool.submit(func, *args)
+
+    def close(self):
+        """Shut the pool down without waiting for stuck detectors"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
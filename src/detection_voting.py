@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Detection Voting - confidence-weighted, early-exit voting
+
+find_text_in_image and click_play_button used to run every detector
+(OCR included) and click the plain mean of all hits, so one outlier
+dragged the click point and OCR ran even when two cheap detectors
+already agreed. VotingEngine instead:
+- runs detectors cheapest first, by an EWMA of their measured cost
+- groups candidate points into clusters (cluster_radius px)
+- weights each vote by detector weight x returned confidence
+- stops once one cluster's weight reaches agreement_threshold
+- answers with that cluster's weighted centroid, ignoring outliers
+- lets a detector decide alone above its decisive confidence
+  (template matches)
+It also counts, per detector, how often its vote was the decisive one.
+Given a DetectionExecutor, the detectors run concurrently instead and
+votes are counted as results arrive, each detector bounded by its
+timeout.
+
+Detectors return (x, y), (x, y, confidence) or None.
+
+Config (per target):
+    "detection_voting": {
+        "game_card": {
+            "agreement_threshold": 2.0,
+            "cluster_radius": 120,
+            "weights": {"star_rating": 0.8, "ocr": 1.5}
+        }
+    }
+"""
+
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+# EWMA factor for detector cost
+COST_ALPHA = 0.3
+
+
+class VoteCluster:
+    """Votes that landed near each other"""
+
+    __slots__ = ('x', 'y', 'weight', 'members')
+
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.weight = 0.0
+        self.members = []   # (detector name, weight)
+
+    def add(self, name: str, point: Tuple[float, float], weight: float):
+        total = self.weight + weight
+        self.x = (self.x * self.weight + point[0] * weight) / total
+        self.y = (self.y * self.weight + point[1] * weight) / total
+        self.weight = total
+        self.members.append((name, weight))
+
+    def distance(self, point: Tuple[float, float]) -> float:
+        return math.hypot(self.x - point[0], self.y - point[1])
+
+    def center(self) -> Tuple[int, int]:
+        return (int(round(self.x)), int(round(self.y)))
+
+
+class VotingEngine:
+    """Runs named detectors on a frame until enough of them agree"""
+
+    def __init__(self, target: str, config: dict = None, decisive: Dict[str, float] = None,
+                 log_callback: Optional[Callable] = None):
+        self.target = target
+        self.log_callback = log_callback
+        self.decisive = decisive or {}   # detector name -> confidence that decides alone
+        self.configure(config or {})
+
+        self.detector_stats: Dict[str, dict] = {}
+
+        self.stats = {
+            'votes': 0,
+            'early_exits': 0,
+            'no_result': 0,
+            'detectors_skipped': 0,
+            'timeouts': 0,
+            'wall_ms_total': 0.0,
+            'last_wall_ms': 0.0
+        }
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    def configure(self, config: dict):
+        """(Re)read this target's settings from a keeper config"""
+        settings = config.get('detection_voting', {}).get(self.target, {})
+        self.agreement_threshold = settings.get('agreement_threshold', 2.0)
+        self.cluster_radius = settings.get('cluster_radius', 80)
+        self.weights = settings.get('weights', {})
+
+    def _detector_stats(self, name: str) -> dict:
+        stats = self.detector_stats.get(name)
+        if stats is None:
+            stats = {'runs': 0, 'hits': 0, 'agreed': 0, 'decisive': 0, 'skipped': 0, 'timeouts': 0,
+                     'cost_ms': None}
+            self.detector_stats[name] = stats
+        return stats
+
+    def order(self, names) -> list:
+        """Detector names cheapest first (unmeasured ones first, in given order)"""
+        return sorted(names, key=lambda name: self._detector_stats(name)['cost_ms'] or 0.0)
+
+    def _weight(self, name: str, result) -> float:
+        confidence = float(result[2]) if len(result) > 2 else 1.0
+        if name in self.decisive and confidence >= self.decisive[name]:
+            return math.inf
+        return self.weights.get(name, 1.0) * confidence
+
+    def _timed(self, name: str, detect: Callable, img):
+        """detect(img) -> (result, elapsed ms); exceptions count as a miss"""
+        start = time.perf_counter()
+        try:
+            result = detect(img)
+        except Exception as e:
+            self.log_message(f"{self.target}/{name} detector error: {e}", "WARN")
+            result = None
+        return result, (time.perf_counter() - start) * 1000
+
+    def _record(self, name: str, result, elapsed: float):
+        """Count a finished run and update the detector's cost EWMA"""
+        stats = self._detector_stats(name)
+        stats['runs'] += 1
+        stats['cost_ms'] = elapsed if stats['cost_ms'] is None else \
+            COST_ALPHA * elapsed + (1 - COST_ALPHA) * stats['cost_ms']
+        if result:
+            stats['hits'] += 1
+
+    def add_vote(self, clusters: list, name: str, result) -> Tuple[VoteCluster, float]:
+        """Put one detector result into the nearest cluster (or a new one)"""
+        weight = self._weight(name, result)
+        point = (result[0], result[1])
+
+        nearest = min(clusters, key=lambda c: c.distance(point), default=None)
+        if nearest is None or nearest.distance(point) > self.cluster_radius:
+            nearest = VoteCluster()
+            clusters.append(nearest)
+
+        nearest.add(name, point, weight if weight != math.inf else 1.0)
+        if weight == math.inf:
+            nearest.weight = math.inf
+        return nearest, weight
+
+    def vote(self, img, detectors: Dict[str, Callable], executor=None) -> Optional[Tuple[int, int]]:
+        """
+        Run detectors (name -> detect(img)) cheapest first until a cluster
+        reaches the agreement threshold; returns its weighted centre
+
+        With a DetectionExecutor the detectors run concurrently and each
+        is waited for at most its timeout.
+        """
+        self.stats['votes'] += 1
+        start = time.perf_counter()
+        names = self.order(detectors)
+
+        if executor is not None and executor.enabled and len(names) > 1:
+            point = self._vote_parallel(img, detectors, names, executor)
+        else:
+            point = self._vote_sequential(img, detectors, names)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats['wall_ms_total'] += elapsed
+        self.stats['last_wall_ms'] = elapsed
+        return point
+
+    def _consider(self, clusters: list, name: str, result) -> Optional[VoteCluster]:
+        """Add a hit; returns its cluster once that reaches agreement"""
+        cluster, weight = self.add_vote(clusters, name, result)
+        self.log_message(f"✅ {self.target}/{name}: {(int(result[0]), int(result[1]))} "
+                         f"(weight {weight:.2f})", "INFO")
+        return cluster if cluster.weight >= self.agreement_threshold else None
+
+    def _early_exit(self, cluster: VoteCluster, name: str, skipped: list) -> Tuple[int, int]:
+        self.stats['early_exits'] += 1
+        self.stats['detectors_skipped'] += len(skipped)
+        for other in skipped:
+            self._detector_stats(other)['skipped'] += 1
+        return self._decide(cluster, name, skipped)
+
+    def _no_agreement(self, clusters: list, names: list) -> Optional[Tuple[int, int]]:
+        if not clusters:
+            self.stats['no_result'] += 1
+            return None
+
+        # Nobody reached agreement: take the heaviest cluster (ties go to the
+        # cheaper detectors, whatever order results arrived in), credit its strongest vote
+        best = max(clusters, key=lambda c: (c.weight, -min(names.index(name) for name, _ in c.members)))
+        strongest = max(best.members, key=lambda member: member[1])[0]
+        return self._decide(best, strongest, [])
+
+    def _vote_sequential(self, img, detectors: Dict[str, Callable], names: list):
+        clusters = []
+        for index, name in enumerate(names):
+            result, elapsed = self._timed(name, detectors[name], img)
+            self._record(name, result, elapsed)
+            if not result:
+                continue
+
+            agreed = self._consider(clusters, name, result)
+            if agreed:
+                return self._early_exit(agreed, name, names[index + 1:])
+
+        return self._no_agreement(clusters, names)
+
+    def _vote_parallel(self, img, detectors: Dict[str, Callable], names: list, executor):
+        start = time.monotonic()
+        futures = {executor.submit(self._timed, name, detectors[name], img): name for name in names}
+        deadlines = {name: start + executor.timeout_for(name) for name in names}
+
+        clusters = []
+        pending = set(futures)
+        while pending:
+            # Wake on the next result or the nearest detector deadline
+            timeout = max(0.0, min(deadlines[futures[f]] for f in pending) - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = futures[future]
+                result, elapsed = future.result()
+                self._record(name, result, elapsed)
+                if not result:
+                    continue
+
+                agreed = self._consider(clusters, name, result)
+                if agreed:
+                    for other in pending:
+                        other.cancel()
+                    return self._early_exit(agreed, name, [futures[f] for f in pending])
+
+            now = time.monotonic()
+            for future in [f for f in pending if deadlines[futures[f]] <= now]:
+                name = futures[future]
+                future.cancel()
+                pending.discard(future)
+                self.stats['timeouts'] += 1
+                self._detector_stats(name)['timeouts'] += 1
+                self.log_message(f"⌛ {self.target}/{name}: no result within "
+                                 f"{executor.timeout_for(name) * 1000:.0f} ms, not waiting", "WARN")
+
+        return self._no_agreement(clusters, names)
+
+    def _decide(self, cluster: VoteCluster, decisive_name: str, skipped: list) -> Tuple[int, int]:
+        for name, _ in cluster.members:
+            self._detector_stats(name)['agreed'] += 1
+        self._detector_stats(decisive_name)['decisive'] += 1
+
+        agreeing = ', '.join(name for name, _ in cluster.members)
+        note = f", skipped {', '.join(skipped)}" if skipped else ""
+        self.log_message(f"🎯 {self.target.upper()} VOTE: {agreeing} agree at {cluster.center()} "
+                         f"(decided by {decisive_name}{note})", "INFO")
+        return cluster.center()
+
+    def get_stats(self) -> dict:
+        """Vote counters, wall-clock latency, per-detector runs/hits/decisive/cost"""
+        stats = self.stats.copy()
+        if stats['votes']:
+            stats['avg_wall_ms'] = round(stats['wall_ms_total'] / stats['votes'], 2)
+        stats['detectors'] = {
+            name: {**values, 'cost_ms': round(values['cost_ms'] or 0.0, 2)}
+            for name, values in self.detector_stats.items()
+        }
+        return stats
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Dialog Detector - find Roblox error dialogs before clicking anything
+
+dismiss_error_dialogs used to activate the window and click five
+hard-coded points below centre every 15 seconds, dialog or not. This
+detector looks for the modal on a 1/4-size grayscale frame (a few
+hundred microseconds of work):
+1. Dark overlay: the window border ring is dim
+2. Centred panel: the flat gray level that dominates the middle of the
+   window, unlike the overlay, forming a large centred rectangle
+3. OK button: the largest bright (or blue) button-shaped blob in the
+   lower part of the panel; with several buttons, button_side picks
+   one (Roblox puts Reconnect on the right)
+Only then does the keeper click - once, on the button - and it counts
+a dismissal only if the dialog is gone on the next capture.
+
+Config:
+    "error_dialog": {
+        "scale": 4,
+        "overlay_max_brightness": 80,
+        "panel_contrast": 12,
+        "panel_min_area": 0.03,
+        "panel_max_area": 0.6,
+        "center_tolerance": 0.15,
+        "button_brightness": 180,
+        "button_side": "right",
+        "verify_delay_seconds": 1.0
+    }
+"""
+
+import math
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from blob_engine import extract_blobs
+from frame_analysis import FrameAnalysis
+
+# Gray levels a panel pixel may differ from the panel's dominant value
+PANEL_TOLERANCE = 6
+
+
+class DialogDetector:
+    """Dark overlay + centred panel + button, on a downscaled frame"""
+
+    def __init__(self, config: dict):
+        self.configure(config)
+
+        self.stats = {
+            'checks': 0,
+            'dialogs_found': 0,
+            'total_ms': 0.0,
+            'last_ms': 0.0
+        }
+
+    def configure(self, config: dict):
+        """(Re)read detector settings from a keeper config"""
+        settings = config.get('error_dialog', {})
+        self.level = max(0, int(round(math.log2(max(1, settings.get('scale', 4))))))
+        self.overlay_max_brightness = settings.get('overlay_max_brightness', 80)
+        self.panel_contrast = settings.get('panel_contrast', 12)
+        self.panel_min_area = settings.get('panel_min_area', 0.03)
+        self.panel_max_area = settings.get('panel_max_area', 0.6)
+        self.center_tolerance = settings.get('center_tolerance', 0.15)
+        self.button_brightness = settings.get('button_brightness', 180)
+        self.button_side = settings.get('button_side', 'right')
+
+    def detect(self, frame, classifier=None) -> Optional[dict]:
+        """
+        Look for an error dialog in a window capture
+
+        Returns {'panel': (x, y, w, h), 'button': (x, y), 'button_found': bool,
+        'buttons': count} in the frame's pixels, or None when there is no dialog.
+        """
+        start = time.perf_counter()
+        try:
+            return self._detect(FrameAnalysis.of(frame, classifier))
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stats['checks'] += 1
+            self.stats['total_ms'] += elapsed
+            self.stats['last_ms'] = elapsed
+
+    def _detect(self, full: FrameAnalysis) -> Optional[dict]:
+        small = full.downscaled(self.level)
+        gray = small.gray
+        height, width = gray.shape[:2]
+        if height < 16 or width < 16:
+            return None
+
+        # 1. Modal overlay: the outer ring of the window is dimmed
+        ring_h, ring_w = max(1, height // 8), max(1, width // 8)
+        ring = np.concatenate([
+            gray[:ring_h].ravel(), gray[-ring_h:].ravel(),
+            gray[ring_h:-ring_h, :ring_w].ravel(), gray[ring_h:-ring_h, -ring_w:].ravel()
+        ])
+        overlay = float(ring.mean())
+        if overlay > self.overlay_max_brightness:
+            return None
+
+        # 2. Panel: the flat color that dominates the middle of the window,
+        #    distinct from the overlay; text holes closed
+        middle = gray[height * 2 // 5:height * 3 // 5, width * 2 // 5:width * 3 // 5]
+        counts = np.bincount(middle.ravel(), minlength=256)
+        panel_value = int(np.argmax(counts))
+        if counts[panel_value] < 0.25 * middle.size or abs(panel_value - overlay) <= self.panel_contrast:
+            return None
+
+        mask = (cv2.absdiff(gray, np.full_like(gray, panel_value)) <= PANEL_TOLERANCE).astype(np.uint8) * 255
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
+
+        frame_area = float(full.width * full.height)
+        panels = extract_blobs(mask, scale=small.scale).filter_area(
+            self.panel_min_area * frame_area, self.panel_max_area * frame_area
+        ).filter_fill(0.6)
+        if not len(panels):
+            return None
+
+        cx, cy = full.width / 2.0, full.height / 2.0
+        centred = (np.abs(panels.centroids[:, 0] - cx) < self.center_tolerance * full.width) & \
+                  (np.abs(panels.centroids[:, 1] - cy) < self.center_tolerance * full.height)
+        panels = panels._subset(centred)
+        index = panels.largest()
+        if index is None:
+            return None
+
+        px, py, pw, ph = (int(v) for v in panels.bboxes[index])
+        self.stats['dialogs_found'] += 1
+
+        # 3. Button: bright or blue blob in the lower part of the panel
+        button, buttons = self._find_button(small, (px, py, pw, ph))
+        return {
+            'panel': (px, py, pw, ph),
+            'button': button or (px + pw // 2, py + int(ph * 0.8)),
+            'button_found': button is not None,
+            'buttons': buttons
+        }
+
+    def _find_button(self, small: FrameAnalysis, panel):
+        """(button centre or None, number of button-shaped blobs)"""
+        px, py, pw, ph = panel
+        s = small.scale
+        x0, y0 = int(px * s), int((py + ph * 0.45) * s)
+        x1, y1 = int((px + pw) * s), int((py + ph) * s)
+        if x1 - x0 < 4 or y1 - y0 < 4:
+            return None, 0
+
+        gray = small.gray[y0:y1, x0:x1]
+        mask = (gray > self.button_brightness).astype(np.uint8) * 255
+        if small.classifier is not None:
+            mask |= small.color_mask('button_blue_hsv')[y0:y1, x0:x1]
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))
+
+        # Button-sized: not text specks, not the whole panel width
+        buttons = extract_blobs(mask, scale=s).filter_area(0.005 * pw * ph, 0.4 * pw * ph).filter_aspect(1.2, 8)
+        if not len(buttons):
+            return None, 0
+
+        # Several buttons side by side: pick the configured side
+        xs = buttons.centroids[:, 0]
+        index = int(np.argmax(xs)) if self.button_side == 'right' else int(np.argmin(xs))
+        if self.button_side == 'largest':
+            index = buttons.largest()
+
+        bx, by = buttons.centroid(index)
+        return (int(x0 / s) + bx, int(y0 / s) + by), len(buttons)
+
+    def get_stats(self) -> dict:
+        stats = self.stats.copy()
+        if stats['checks']:
+            stats['avg_ms'] = round(stats['total_ms'] / stats['checks'], 3)
+        return stats
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Frame Analysis - shared per-frame cache of derived image planes
+
+Every detector used to convert the same frame on its own: four HSV
+conversions and two grayscale conversions per relaunch attempt.
+FrameAnalysis wraps one captured frame and computes each derived
+plane lazily, at most once, for all detectors that ask for it:
+- bgr       3-channel BGR (from the BGRA capture view)
+- hsv       HSV
+- gray      grayscale
+- gray_eq   histogram-equalized grayscale (OCR)
+- edges     Canny edges (shape detection)
+- downscaled(n)  FrameAnalysis at 1/2**n size, for coarse detection
+- color_mask(names)  masks read from one ColorClassifier label pass
+- blobs(names) / regions()  connected components of a mask / of edges
+
+scale records the frame's size relative to full resolution; blobs and
+regions report areas and positions in full-resolution units, so the
+same detector runs unchanged on a downscaled frame.
+
+Detectors may share one FrameAnalysis across threads: each plane is
+computed under its own lock, so concurrent readers wait for the first
+computation instead of repeating it.
+"""
+
+import threading
+
+import cv2
+import numpy as np
+
+from blob_engine import extract_blobs, extract_regions
+from capture_service import to_bgr, to_gray
+
+
+class FrameAnalysis:
+    """Lazily derived planes of one frame, each computed at most once"""
+
+    def __init__(self, frame: np.ndarray, classifier=None, scale: float = 1.0):
+        self.frame = frame
+        self.classifier = classifier
+        self.scale = scale
+        self._planes = {}
+        self._plane_locks = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, img, classifier=None):
+        """Wrap an image, or pass an existing FrameAnalysis through"""
+        if isinstance(img, cls):
+            if img.classifier is None:
+                img.classifier = classifier
+            return img
+        return cls(img, classifier)
+
+    def _plane(self, key, compute):
+        plane = self._planes.get(key)
+        if plane is not None:
+            return plane
+
+        with self._lock:
+            lock = self._plane_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            plane = self._planes.get(key)
+            if plane is None:
+                plane = compute()
+                self._planes[key] = plane
+        return plane
+
+    @property
+    def height(self) -> int:
+        return self.frame.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.frame.shape[1]
+
+    @property
+    def bgr(self) -> np.ndarray:
+        if self.frame.ndim == 3 and self.frame.shape[2] == 3:
+            return self.frame
+        return self._plane('bgr', lambda: to_bgr(self.frame))
+
+    @property
+    def hsv(self) -> np.ndarray:
+        return self._plane('hsv', lambda: cv2.cvtColor(self.bgr, cv2.COLOR_BGR2HSV))
+
+    @property
+    def gray(self) -> np.ndarray:
+        return self._plane('gray', lambda: to_gray(self.frame))
+
+    @property
+    def gray_eq(self) -> np.ndarray:
+        return self._plane('gray_eq', lambda: cv2.equalizeHist(self.gray))
+
+    @property
+    def edges(self) -> np.ndarray:
+        return self._plane('edges', lambda: cv2.Canny(self.gray, 50, 150))
+
+    def downscaled(self, level: int) -> 'FrameAnalysis':
+        """
+        Analysis of the frame at 1/2**level size, sharing the classifier
+
+        One bilinear resize straight from the capture: several times
+        cheaper than a pyrDown chain and enough for color blobs.
+        """
+        if level <= 0:
+            return self
+        size = (max(1, self.width >> level), max(1, self.height >> level))
+        return self._plane(('downscaled', level), lambda: FrameAnalysis(
+            cv2.resize(self.frame, size, interpolation=cv2.INTER_LINEAR),
+            self.classifier, self.scale / (2 ** level)
+        ))
+
+    def labels(self, space: str, bank: int = 0) -> np.ndarray:
+        """Color-class label plane (one LUT pass per space and bank)"""
+        plane = self.hsv if space == 'hsv' else self.bgr
+        return self._plane(('labels', space, bank),
+                           lambda: self.classifier.classify(plane, space, bank))
+
+    def color_mask(self, names) -> np.ndarray:
+        """0/255 mask of pixels matching any of the named color rules"""
+        if self.classifier is None:
+            raise ValueError("FrameAnalysis has no ColorClassifier")
+
+        key = ('mask',) + ((names,) if isinstance(names, str) else tuple(names))
+        return self._plane(key, lambda: self._color_mask(names))
+
+    def blobs(self, names):
+        """Connected components of color_mask(names), full-resolution units"""
+        return extract_blobs(self.color_mask(names), scale=self.scale)
+
+    def regions(self):
+        """Regions enclosed by the Canny edges, full-resolution units"""
+        return extract_regions(self.edges, scale=self.scale)
+
+    def _color_mask(self, names) -> np.ndarray:
+        mask = None
+        for (space, bank), bits in self.classifier.bits(names).items():
+            part = self.classifier.mask_from_labels(self.labels(space, bank), bits)
+            mask = part if mask is None else cv2.bitwise_or(mask, part)
+        return mask
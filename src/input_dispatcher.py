@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Input Dispatcher - bounded-latency delivery of click input
+
+_click_sendmessage used SendMessageW, which blocks until the target
+window has processed the message: a hung Roblox UI thread hung the
+keeper thread with it, forever. Every input call now goes through an
+InputDispatcher with a per-method latency budget:
+- SendMessage -> SendMessageTimeoutW(SMTO_ABORTIFHUNG): the OS gives
+  up on a hung window (or after budget_ms) and the message is dropped
+- PostMessage -> PostMessageW, whose return value is now checked
+- anything else (PyDirectInput, pyautogui, window activation) runs on
+  a small watchdog worker pool; the keeper stops waiting at the
+  budget and abandons the call
+Messages are delivered through the keeper backend (keeper_backends).
+A method that blows its budget is marked degraded for
+degraded_seconds, so safe_click_roblox skips it and tries the next one
+in click_methods. Every dispatch is timed; get_stats() reports
+calls / timeouts / failures and p50 / p99 latency per method.
+Health-probe dispatches (probe=True) are kept apart under
+"probe:<method>" and never degrade the method: a probe's WM_NULL must
+not skew click latency, and MethodProber reports its own verdict.
+call_async / send_async are the awaitable forms for the asyncio
+engine: the watchdog call is awaited through asyncio.wrap_future and
+the SendMessageTimeoutW call runs on the loop's default executor, so a
+slow window holds a worker thread, never the event loop. Click
+sequences do not call send/call themselves: they yield
+dispatcher.request('send' | 'call', ...) and whoever drives them runs
+it with run() or run_async().
+
+Config:
+    "input_dispatch": {
+        "budget_ms": 250,
+        "budgets_ms": {"directinput": 1000, "pyautogui": 1500},
+        "degraded_seconds": 300,
+        "latency_window": 200
+    }
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from keeper_backends import KeeperBackend, default_backend
+
+
+class DispatchRequest:
+    """A blocking send/call a click sequence yields to its driver"""
+
+    __slots__ = ('kind', 'args', 'kwargs')
+
+    def __init__(self, kind: str, args: tuple, kwargs: dict):
+        self.kind = kind
+        self.args = args
+        self.kwargs = kwargs
+
+
+class InputDispatcher:
+    """Timed, budgeted input calls with per-method degradation"""
+
+    def __init__(self, config: dict, log_callback: Optional[Callable] = None,
+                 backend: Optional[KeeperBackend] = None):
+        self.log_callback = log_callback
+        self.backend = backend or default_backend()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._closed = False
+        self.degraded_until: Dict[str, float] = {}
+        self.method_stats: Dict[str, dict] = {}
+        self.configure(config)
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    def configure(self, config: dict):
+        settings = config.get('input_dispatch', {})
+        self.budget_ms = settings.get('budget_ms', 250)
+        self.budgets_ms = settings.get('budgets_ms', {'directinput': 1000, 'pyautogui': 1500})
+        self.degraded_seconds = settings.get('degraded_seconds', 300)
+        self.latency_window = settings.get('latency_window', 200)
+
+    def budget_for(self, method: str) -> float:
+        """Seconds one call of this method may take"""
+        return self.budgets_ms.get(method, self.budget_ms) / 1000.0
+
+    # ========================================
+    # DEGRADATION
+    # ========================================
+
+    def is_degraded(self, method: str) -> bool:
+        until = self.degraded_until.get(method)
+        if until is None:
+            return False
+        if time.monotonic() >= until:
+            # Cool-down over: give the method another chance
+            del self.degraded_until[method]
+            self.log_message(f"🔄 {method.upper()} no longer degraded, retrying it", "INFO")
+            return False
+        return True
+
+    def mark_degraded(self, method: str, reason: str):
+        self.degraded_until[method] = time.monotonic() + self.degraded_seconds
+        self._stats(method)['degraded'] += 1
+        self.log_message(f"🐢 {method.upper()} degraded for {self.degraded_seconds}s: {reason}", "WARN")
+
+    # ========================================
+    # DISPATCH
+    # ========================================
+
+    def _stats(self, method: str) -> dict:
+        stats = self.method_stats.get(method)
+        if stats is None:
+            stats = {'calls': 0, 'timeouts': 0, 'failures': 0, 'degraded': 0,
+                     'latencies': deque(maxlen=self.latency_window)}
+            self.method_stats[method] = stats
+        return stats
+
+    def _record(self, method: str, start: float, ok: bool, timed_out: bool = False, probe: bool = False):
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            stats = self._stats(f"probe:{method}" if probe else method)
+            stats['calls'] += 1
+            stats['latencies'].append(elapsed)
+            if timed_out:
+                stats['timeouts'] += 1
+            elif not ok:
+                stats['failures'] += 1
+        if timed_out and not probe:
+            self.mark_degraded(method, f"no response within {self.budget_for(method) * 1000:.0f} ms")
+        return ok
+
+    def send(self, hwnd: int, msg: int, wparam: int, lparam: int, method: str = 'sendmessage',
+             probe: bool = False) -> bool:
+        """SendMessageTimeoutW: True once the window processed the message in budget"""
+        if not self.backend.has_input(method):
+            return False
+
+        start = time.perf_counter()
+        ok, timed_out = self.backend.send_message(hwnd, msg, wparam, lparam, int(self.budget_for(method) * 1000))
+        return self._record(method, start, ok, timed_out, probe=probe)
+
+    def post(self, hwnd: int, msg: int, wparam: int, lparam: int, method: str = 'postmessage',
+             probe: bool = False) -> bool:
+        """PostMessageW (never blocks); False when the message was not queued"""
+        if not self.backend.has_input(method):
+            return False
+
+        start = time.perf_counter()
+        return self._record(method, start, self.backend.post_message(hwnd, msg, wparam, lparam), probe=probe)
+
+    def call(self, method: str, func: Callable, *args, probe: bool = False, **kwargs) -> bool:
+        """
+        Run func on the watchdog pool; False if it fails or overruns its budget
+
+        An overrunning call is abandoned (its worker stays busy until
+        it returns) and the method is marked degraded. After close()
+        every call returns False.
+        """
+        pool = self._watchdog_pool()
+        if pool is None:
+            return False
+
+        start = time.perf_counter()
+        future = pool.submit(func, *args, **kwargs)
+        try:
+            future.result(timeout=self.budget_for(method))
+        except FutureTimeout:
+            return self._record(method, start, False, timed_out=True, probe=probe)
+        except Exception as e:
+            self.log_message(f"{method.upper()} input call failed: {e}", "WARN")
+            return self._record(method, start, False, probe=probe)
+        return self._record(method, start, True, probe=probe)
+
+    def _watchdog_pool(self) -> Optional[ThreadPoolExecutor]:
+        """The worker pool, created on first use (None once closed)"""
+        with self._lock:
+            if self._closed:
+                return None
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="input")
+            return self._pool
+
+    # ========================================
+    # ASYNC DISPATCH
+    # ========================================
+
+    async def send_async(self, hwnd: int, msg: int, wparam: int, lparam: int,
+                         method: str = 'sendmessage') -> bool:
+        """send() on the loop's default executor (SendMessageTimeoutW bounds it to the budget)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.send, hwnd, msg, wparam, lparam, method)
+
+    async def call_async(self, method: str, func: Callable, *args, **kwargs) -> bool:
+        """call() without blocking the event loop: the watchdog future is awaited up to the budget"""
+        pool = self._watchdog_pool()
+        if pool is None:
+            return False
+
+        start = time.perf_counter()
+        future = pool.submit(func, *args, **kwargs)
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(future), self.budget_for(method))
+        except asyncio.TimeoutError:
+            return self._record(method, start, False, timed_out=True)
+        except Exception as e:
+            self.log_message(f"{method.upper()} input call failed: {e}", "WARN")
+            return self._record(method, start, False)
+        return self._record(method, start, True)
+
+    # ========================================
+    # DEFERRED DISPATCH
+    # ========================================
+
+    def request(self, kind: str, *args, **kwargs) -> DispatchRequest:
+        """send/call for a click sequence: ok = yield dispatcher.request('send', ...)"""
+        return DispatchRequest(kind, args, kwargs)
+
+    def run(self, request: DispatchRequest) -> bool:
+        return getattr(self, request.kind)(*request.args, **request.kwargs)
+
+    async def run_async(self, request: DispatchRequest) -> bool:
+        return await getattr(self, f"{request.kind}_async")(*request.args, **request.kwargs)
+
+    def close(self):
+        """Shut the worker pool down for good: later calls return False"""
+        with self._lock:
+            self._closed = True
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ========================================
+    # STATS
+    # ========================================
+
+    @staticmethod
+    def _percentile(values, fraction: float) -> float:
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+    def get_stats(self) -> dict:
+        """Per method: calls, timeouts, failures, degraded, p50/p99 ms"""
+        stats = {}
+        with self._lock:
+            for method, values in self.method_stats.items():
+                latencies = list(values['latencies'])
+                stats[method] = {
+                    'calls': values['calls'],
+                    'timeouts': values['timeouts'],
+                    'failures': values['failures'],
+                    'degraded': values['degraded'],
+                    'p50_ms': round(self._percentile(latencies, 0.5), 2) if latencies else None,
+                    'p99_ms': round(self._percentile(latencies, 0.99), 2) if latencies else None
+                }
+        for method in stats:
+            stats[method]['degraded_now'] = self.is_degraded(method)
+        return stats
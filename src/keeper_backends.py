@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Keeper Backends - window lookup, capture, input and processes behind one interface
+
+Every engine path used to call ctypes.windll.user32, win32gui,
+pygetwindow, pyautogui, PyDirectInput, mss and psutil directly, so
+nothing past the imports could run (or be benchmarked) off Windows.
+The keepers now take a KeeperBackend and make every platform call
+through it:
+- windows:   enum_windows / is_window / client_rect / window_rect /
+             activate / foreground_window / move_window
+- capture:   capture (a CaptureService: grab / grab_window / save_png)
+- input:     post_message / send_message (window messages) and
+             move_cursor / click / cursor_position (screen input, per
+             click method: 'directinput' or 'pyautogui')
+- processes: process_ids / terminate_processes / launch_roblox
+NativeBackend is the Windows implementation (the code the engines used
+to inline); x11_backend.X11Backend drives X servers (Xvfb included).
+default_backend() returns the process-wide instance for this host.
+simulated_client.SimulatedBackend drives in-memory Roblox clients
+instead, for tests and benchmarks on any host.
+
+Usage:
+    keeper = AnimeVanguardsKeeperV2(base_dir, config_path, backend=SimulatedBackend())
+"""
+
+import os
+import subprocess
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+import psutil
+
+from capture_service import CaptureService
+from process_watcher import pids_by_name
+
+# Optional platform modules: a missing one only disables what needs it
+try:
+    import win32gui
+    import win32con
+except ImportError:
+    win32gui = None
+
+try:
+    import pyautogui
+except Exception:
+    # Not installed, or no display to attach to (headless Linux)
+    pyautogui = None
+
+try:
+    import PyDirectInput
+except ImportError:
+    PyDirectInput = None
+
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.WinDLL('user32', use_last_error=True)
+    user32.SendMessageTimeoutW.argtypes = (wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM,
+                                           wintypes.UINT, wintypes.UINT, ctypes.POINTER(ctypes.c_size_t))
+    user32.SendMessageTimeoutW.restype = wintypes.LPARAM
+    user32.PostMessageW.argtypes = (wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+    user32.PostMessageW.restype = wintypes.BOOL
+else:
+    user32 = None
+
+SMTO_NORMAL = 0x0000
+SMTO_ABORTIFHUNG = 0x0002
+ERROR_TIMEOUT = 1460
+
+# Click method names (keeper_engine_v2.ClickMethod values)
+POST_MESSAGE = "postmessage"
+SEND_MESSAGE = "sendmessage"
+DIRECT_INPUT = "directinput"
+PYAUTOGUI = "pyautogui"
+
+
+class KeeperBackend:
+    """
+    Platform interface used by the keepers
+
+    Rects are dicts {'x', 'y', 'width', 'height'} in screen coordinates.
+    Window handles are ints; 0/None means "no window".
+    """
+
+    name = "abstract"
+
+    # ProcessWatcher can block on these PIDs (real OS processes)
+    watchable = True
+
+    # Delay a screen-input click leaves before focus may be restored
+    input_pause = 0.1
+
+    capture: CaptureService = None
+
+    # ---- windows ----
+
+    def enum_windows(self) -> List[Tuple[int, str]]:
+        """(hwnd, title) of every visible top-level window, front to back"""
+        raise NotImplementedError
+
+    def is_window(self, hwnd: int) -> bool:
+        raise NotImplementedError
+
+    def window_title(self, hwnd: int) -> str:
+        raise NotImplementedError
+
+    def is_visible(self, hwnd: int) -> bool:
+        raise NotImplementedError
+
+    def is_minimized(self, hwnd: int) -> bool:
+        raise NotImplementedError
+
+    def client_rect(self, hwnd: int) -> Optional[dict]:
+        """Client area of hwnd in screen coordinates"""
+        raise NotImplementedError
+
+    def window_rect(self, hwnd: int) -> Optional[dict]:
+        """Outer window rect (frame included) in screen coordinates"""
+        raise NotImplementedError
+
+    def foreground_window(self) -> Optional[int]:
+        raise NotImplementedError
+
+    def activate(self, hwnd: int) -> bool:
+        """Restore (if minimized) and bring hwnd to the foreground"""
+        raise NotImplementedError
+
+    def move_window(self, hwnd: int, x: int, y: int, width: int, height: int) -> bool:
+        raise NotImplementedError
+
+    def find_window(self, title_match: str = "Roblox") -> Optional[int]:
+        """First visible window whose title contains title_match"""
+        for hwnd, title in self.enum_windows():
+            if title_match in title:
+                return hwnd
+        return None
+
+    # ---- capture ----
+
+    def grab(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        """Screen region as a BGRA (height, width, 4) uint8 array"""
+        return self.capture.grab(left, top, width, height)
+
+    def configure_capture(self, config: dict):
+        """Pick the capture implementation the config asks for (default: keep the current one)"""
+
+    # ---- input ----
+
+    def has_input(self, method: str) -> bool:
+        """Can this backend deliver input with the given click method?"""
+        raise NotImplementedError
+
+    def post_message(self, hwnd: int, msg: int, wparam: int, lparam: int) -> bool:
+        """Queue a window message; False when it was not queued"""
+        raise NotImplementedError
+
+    def send_message(self, hwnd: int, msg: int, wparam: int, lparam: int,
+                     timeout_ms: int) -> Tuple[bool, bool]:
+        """Deliver a window message and wait for it: (processed, timed_out)"""
+        raise NotImplementedError
+
+    def move_cursor(self, x: int, y: int, method: str = PYAUTOGUI):
+        raise NotImplementedError
+
+    def click(self, x: int, y: int, clicks: int = 1, method: str = PYAUTOGUI):
+        """Left click(s) at a screen position"""
+        raise NotImplementedError
+
+    def cursor_position(self, method: str = PYAUTOGUI) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    # ---- processes ----
+
+    def process_ids(self, process_name: str) -> List[int]:
+        raise NotImplementedError
+
+    def terminate_processes(self, process_name: str, timeout: float = 10.0) -> int:
+        """Terminate (then kill) every process with this name; returns how many there were"""
+        raise NotImplementedError
+
+    def launch_roblox(self) -> bool:
+        raise NotImplementedError
+
+
+class NativeBackend(KeeperBackend):
+    """Windows: win32gui windows, mss capture, user32/PyDirectInput/pyautogui input, psutil processes"""
+
+    name = "native"
+
+    def __init__(self):
+        self.capture = CaptureService()
+        self._capture_lock = threading.Lock()
+
+    @property
+    def input_pause(self) -> float:
+        return pyautogui.PAUSE if pyautogui else 0.1
+
+    def configure_capture(self, config: dict):
+        """background_capture.enabled: PrintWindow the Roblox windows instead of reading the screen"""
+        from printwindow_capture import PRINTWINDOW_AVAILABLE, PrintWindowCapture
+        from window_registry import shared_registry
+
+        enabled = config.get('background_capture', {}).get('enabled', False) and PRINTWINDOW_AVAILABLE
+        with self._capture_lock:
+            current = self.capture
+            if enabled and isinstance(current, PrintWindowCapture):
+                current.configure(config)
+                return
+            if enabled:
+                self.capture = PrintWindowCapture(shared_registry(config, self), config)
+            elif isinstance(current, PrintWindowCapture):
+                self.capture = CaptureService()
+            else:
+                return
+        current.close()
+
+    # ---- windows ----
+
+    def enum_windows(self) -> List[Tuple[int, str]]:
+        if not win32gui:
+            return []
+
+        found = []
+
+        def enum_callback(hwnd, results):
+            if win32gui.IsWindowVisible(hwnd):
+                results.append((hwnd, win32gui.GetWindowText(hwnd)))
+
+        win32gui.EnumWindows(enum_callback, found)
+        return found
+
+    def is_window(self, hwnd: int) -> bool:
+        return bool(win32gui and hwnd and win32gui.IsWindow(hwnd))
+
+    def window_title(self, hwnd: int) -> str:
+        return win32gui.GetWindowText(hwnd) if win32gui else ""
+
+    def is_visible(self, hwnd: int) -> bool:
+        return bool(win32gui and win32gui.IsWindowVisible(hwnd))
+
+    def is_minimized(self, hwnd: int) -> bool:
+        return bool(win32gui and win32gui.IsIconic(hwnd))
+
+    def client_rect(self, hwnd: int) -> Optional[dict]:
+        if not win32gui:
+            return None
+        _, _, width, height = win32gui.GetClientRect(hwnd)
+        x, y = win32gui.ClientToScreen(hwnd, (0, 0))
+        return {'x': x, 'y': y, 'width': width, 'height': height}
+
+    def window_rect(self, hwnd: int) -> Optional[dict]:
+        if not win32gui:
+            return None
+        left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+        return {'x': left, 'y': top, 'width': right - left, 'height': bottom - top}
+
+    def foreground_window(self) -> Optional[int]:
+        return win32gui.GetForegroundWindow() if win32gui else None
+
+    def activate(self, hwnd: int) -> bool:
+        if not win32gui or not hwnd:
+            return False
+        if win32gui.IsIconic(hwnd):
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+        win32gui.SetForegroundWindow(hwnd)
+        return True
+
+    def move_window(self, hwnd: int, x: int, y: int, width: int, height: int) -> bool:
+        if not win32gui:
+            return False
+        win32gui.MoveWindow(hwnd, x, y, width, height, True)
+        return True
+
+    # ---- input ----
+
+    def has_input(self, method: str) -> bool:
+        if method in (POST_MESSAGE, SEND_MESSAGE):
+            return user32 is not None
+        if method == DIRECT_INPUT:
+            return PyDirectInput is not None
+        if method == PYAUTOGUI:
+            return pyautogui is not None
+        return False
+
+    def post_message(self, hwnd: int, msg: int, wparam: int, lparam: int) -> bool:
+        if user32 is None:
+            return False
+        return bool(user32.PostMessageW(hwnd, msg, wparam, lparam))
+
+    def send_message(self, hwnd: int, msg: int, wparam: int, lparam: int,
+                     timeout_ms: int) -> Tuple[bool, bool]:
+        if user32 is None:
+            return False, False
+        # SMTO_ABORTIFHUNG: the OS gives up on a hung window instead of blocking
+        result = ctypes.c_size_t(0)
+        ok = user32.SendMessageTimeoutW(hwnd, msg, wparam, lparam, SMTO_NORMAL | SMTO_ABORTIFHUNG,
+                                        int(timeout_ms), ctypes.byref(result))
+        timed_out = not ok and ctypes.get_last_error() in (0, ERROR_TIMEOUT)
+        return bool(ok), timed_out
+
+    def _screen_input(self, method: str):
+        return PyDirectInput if method == DIRECT_INPUT else pyautogui
+
+    def move_cursor(self, x: int, y: int, method: str = PYAUTOGUI):
+        self._screen_input(method).moveTo(x, y)
+
+    def click(self, x: int, y: int, clicks: int = 1, method: str = PYAUTOGUI):
+        if method == DIRECT_INPUT:
+            for _ in range(clicks):
+                PyDirectInput.click(x, y)
+        elif clicks == 2:
+            # pyautogui's own post-call pause is left to the caller
+            pyautogui.doubleClick(x, y, _pause=False)
+        else:
+            pyautogui.click(x, y, clicks=clicks, _pause=False)
+
+    def cursor_position(self, method: str = PYAUTOGUI) -> Tuple[int, int]:
+        return tuple(self._screen_input(method).position())
+
+    # ---- processes ----
+
+    def process_ids(self, process_name: str) -> List[int]:
+        return pids_by_name(process_name)
+
+    def terminate_processes(self, process_name: str, timeout: float = 10.0) -> int:
+        procs = [proc for proc in psutil.process_iter(['name']) if proc.info['name'] == process_name]
+        for proc in procs:
+            try:
+                proc.terminate()
+            except psutil.Error:
+                pass
+        _, alive = psutil.wait_procs(procs, timeout=timeout)
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+        return len(procs)
+
+    def launch_roblox(self) -> bool:
+        # roblox: protocol handler (Start Menu registration)
+        subprocess.Popen('start roblox:', shell=True)
+        return True
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_backend() -> KeeperBackend:
+    """The process-wide backend: X11Backend on Linux with a display, NativeBackend otherwise"""
+    global _default
+    with _default_lock:
+        if _default is None and os.name != 'nt' and os.environ.get('DISPLAY'):
+            try:
+                from x11_backend import X11Backend
+                _default = X11Backend()
+            except RuntimeError:
+                pass
+        if _default is None:
+            _default = NativeBackend()
+        return _default
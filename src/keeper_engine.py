@@ -5,21 +5,35 @@ Advanced monitoring with GUI, crash detection, and auto-relaunch
 """
 
 import time
-import pyautogui
-import psutil
 from datetime import datetime
 import os
 import json
-import threading
-import mss
 import cv2
 import numpy as np
-from PIL import Image
-import pygetwindow as gw
+
+from keeper_backends import default_backend
+from keeper_scheduler import DeadlineScheduler
+from frame_analysis import FrameAnalysis
+from color_classifier import ColorClassifier
+from roi_manager import RoiManager
+from pyramid_search import PyramidSearch
+from template_matcher import TemplateCache
+from detection_voting import VotingEngine
+from detection_executor import DetectionExecutor
+from ocr_service import OcrService
+from dialog_detector import DialogDetector
+from screen_state import ScreenStateClassifier
+from liveness_monitor import LivenessMonitor
+from process_watcher import watch_process
 
 class AnimeVanguardsKeeper:
-    def __init__(self, base_dir, config_path, log_callback=None):
+    def __init__(self, base_dir, config_path, log_callback=None, backend=None):
         self.base_dir = base_dir
+        # Windows, capture, input and processes (default: native Windows)
+        self.backend = backend or default_backend()
+        # Capture is backend-wide: only a keeper that created its backend configures it
+        self.owns_backend = backend is None
+        self.config_path = config_path
         self.config = self.load_config(config_path)
         self.log_callback = log_callback
 
@@ -33,6 +47,23 @@ class AnimeVanguardsKeeper:
         self.running = False
         self.paused = False
         self.monitor_thread = None
+        self.disconnect_readings = 0
+        self.scheduler = DeadlineScheduler(log_callback=self.log_message)
+
+        # One long-lived grabber for every capture (PrintWindow when background_capture is on)
+        if self.owns_backend:
+            self.backend.configure_capture(self.config)
+        self.capture = self.backend.capture
+
+        # All detector color ranges, compiled into one lookup-table pass
+        self.color_classifier = ColorClassifier.from_config(self.config)
+
+        # Detection search windows (configured + learned from past hits)
+        self.rois = RoiManager(self.config, os.path.join(base_dir, "logs", "roi_cache.json"),
+                               log_callback=self.log_message)
+
+        # Optional coarse-to-fine detection on a downscaled frame
+        self.pyramid = PyramidSearch(self.config, self._analysis, log_callback=self.log_message)
 
         # Stats
         self.stats = {
@@ -42,6 +73,10 @@ class AnimeVanguardsKeeper:
             'roblox_crashes': 0,
             'server_loads_detected': 0,
             'error_dialogs_dismissed': 0,
+            'error_dialog_misses': 0,
+            'disconnects': 0,
+            'freezes': 0,
+            'clicks_skipped_loading': 0,
             'last_click': None,
             'last_screenshot': None,
             'last_error_dismissed': None,
@@ -52,6 +87,34 @@ class AnimeVanguardsKeeper:
         os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
         os.makedirs(self.screenshot_dir, exist_ok=True)
 
+        # Reference crops for template matching, loaded once
+        self.templates = None
+        self._load_templates()
+
+        # Long-lived OCR workers (tesserocr in-process, else batched tesseract CLI)
+        self.ocr = OcrService(self.config, log_callback=self.log_message)
+
+        # Cost-ordered, early-exit voting per detection target
+        self.game_card_votes = VotingEngine('game_card', log_callback=self.log_message)
+        self.play_button_votes = VotingEngine('play_button', log_callback=self.log_message)
+        self.detection_executor = DetectionExecutor(self.config)
+        self._configure_voting()
+
+        # Error dialogs are looked for before anything is clicked
+        self.dialogs = DialogDetector(self.config)
+
+        # What the client is showing (home / loading / in_game / dialog / disconnected)
+        self.screen_state = ScreenStateClassifier(self.config, base_dir,
+                                                  os.path.join(base_dir, "logs", "screen_state_refs.json"),
+                                                  log_callback=self.log_message)
+
+        # Frozen-picture detection from periodic low-res samples
+        self.liveness = LivenessMonitor(self.config, log_callback=self.log_message)
+
+        # Roblox PIDs watched for exit while running (no process-table scans)
+        self.process_watcher = None
+        self._closing_roblox = False
+
     def load_config(self, config_path):
         """Load configuration from JSON file"""
         try:
@@ -74,6 +137,49 @@ class AnimeVanguardsKeeper:
             "game_load_wait_seconds": 15
         }
 
+    def reload_config(self):
+        """Reload config from disk and apply new intervals immediately"""
+        self.config = self.load_config(self.config_path)
+        if self.owns_backend:
+            self.backend.configure_capture(self.config)
+        self.capture = self.backend.capture
+        self.color_classifier = ColorClassifier.from_config(self.config)
+        self.rois.configure(self.config)
+        self.pyramid.configure(self.config)
+        self._load_templates()
+        self._configure_voting()
+        self.ocr.configure(self.config)
+        self.dialogs.configure(self.config)
+        self.screen_state.configure(self.config)
+        self.liveness.configure(self.config)
+        for name, interval in self._task_intervals().items():
+            self.scheduler.reschedule(name, interval)
+        self.log_message("🔁 Configuration reloaded")
+
+    def _load_templates(self):
+        """(Re)build the template cache from config"""
+        settings = self.config.get('template_matching', {})
+        directory = os.path.join(self.base_dir, settings.get('directory', 'templates'))
+
+        self.templates = TemplateCache(directory, settings.get('reference_width', 1280),
+                                       log_callback=self.log_message)
+        if settings.get('enabled', True):
+            self.templates.load()
+
+    def _configure_voting(self):
+        """Apply voting settings; a confident template match decides alone"""
+        short_circuit = self.config.get('template_matching', {}).get('short_circuit_confidence', 0.9)
+        for votes in (self.game_card_votes, self.play_button_votes):
+            votes.configure(self.config)
+            votes.decisive = {'template': short_circuit}
+        self.detection_executor.configure(self.config)
+
+    def _log_detection_latency(self, votes, started):
+        """Wall-clock latency of one detection, including ROI widening"""
+        elapsed = (time.perf_counter() - started) * 1000
+        mode = "parallel" if self.detection_executor.enabled else "sequential"
+        self.log_message(f"⏱️  {votes.target} detection: {elapsed:.0f} ms ({mode})", "INFO")
+
     def log_message(self, message, level="INFO"):
         """Log message to file and callback"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -110,23 +216,40 @@ class AnimeVanguardsKeeper:
 
     def is_roblox_running(self):
         """Check if Roblox is running on Windows"""
+        if self.process_watcher:
+            return self.process_watcher.running
         try:
             process_name = self.config.get('roblox_process_name', 'RobloxPlayerBeta.exe')
-            for proc in psutil.process_iter(['name']):
-                if proc.info['name'] == process_name:
-                    return True
-            return False
+            return bool(self.backend.process_ids(process_name))
         except Exception as e:
             self.log_message(f"Error checking Roblox status: {e}", "ERROR")
             return False
 
+    def close_roblox(self):
+        """Terminate the Roblox client (used before relaunching a dead session)"""
+        process_name = self.config.get('roblox_process_name', 'RobloxPlayerBeta.exe')
+
+        # These exits are ours, not crashes
+        self._closing_roblox = True
+        try:
+            closed = self.backend.terminate_processes(process_name, timeout=10)
+        finally:
+            self._closing_roblox = False
+        self.log_message(f"🛑 Closed {closed} Roblox process(es)", "INFO")
+
+    def _on_roblox_exit(self, pid, remaining):
+        """Process watcher: a Roblox process exited (runs on the watcher thread)"""
+        if self._closing_roblox or remaining:
+            return
+        self.log_message(f"⚡ Roblox process {pid} exited", "WARN")
+        # Run the status check now instead of at its next 30 s tick
+        if self.running:
+            self.scheduler.reschedule('status_check', delay=0)
+
     def get_roblox_window(self):
-        """Get Roblox window using pygetwindow"""
+        """Get the Roblox window handle"""
         try:
-            windows = gw.getWindowsWithTitle('Roblox')
-            if windows:
-                return windows[0]
-            return None
+            return self.backend.find_window('Roblox')
         except Exception as e:
             self.log_message(f"Error getting Roblox window: {e}", "WARN")
             return None
@@ -135,10 +258,7 @@ class AnimeVanguardsKeeper:
         """Bring Roblox window to front"""
         try:
             window = self.get_roblox_window()
-            if window:
-                if window.isMinimized:
-                    window.restore()
-                window.activate()
+            if window and self.backend.activate(window):
                 time.sleep(0.5)
                 return True
             return False
@@ -166,8 +286,7 @@ class AnimeVanguardsKeeper:
             target_y = resize_config.get('position_y', 100)
 
             # Move and resize window
-            window.moveTo(target_x, target_y)
-            window.resizeTo(target_width, target_height)
+            self.backend.move_window(window, target_x, target_y, target_width, target_height)
 
             time.sleep(0.5)
 
@@ -183,12 +302,7 @@ class AnimeVanguardsKeeper:
         try:
             window = self.get_roblox_window()
             if window:
-                return {
-                    'x': window.left,
-                    'y': window.top,
-                    'width': window.width,
-                    'height': window.height
-                }
+                return self.backend.window_rect(window)
             return None
         except Exception as e:
             self.log_message(f"Error getting window rect: {e}", "WARN")
@@ -203,12 +317,17 @@ class AnimeVanguardsKeeper:
             return False
 
         # Remember current active window to restore later
-        import pygetwindow as gw
         try:
-            current_window = gw.getActiveWindow()
+            current_window = self.backend.foreground_window()
         except:
             current_window = None
 
+        # Clicking through a loading screen does nothing useful. Look before
+        # activating only when the capture can see the client already
+        visible = self.capture_sees_window()
+        if visible and self.classify_screen(window_info) == 'loading':
+            return self._skip_loading_click()
+
         # Briefly activate Roblox window
         if not self.activate_roblox():
             self.stats['status'] = 'warning'
@@ -216,6 +335,10 @@ class AnimeVanguardsKeeper:
 
         time.sleep(0.3)  # Brief pause for window to activate
 
+        if not visible and self.classify_screen(window_info) == 'loading':
+            self._restore_focus(current_window)
+            return self._skip_loading_click()
+
         # Check if using fixed coordinates
         use_fixed = self.config.get('use_fixed_coordinates', True)
 
@@ -238,7 +361,7 @@ class AnimeVanguardsKeeper:
             center_y = window_info['y'] + (window_info['height'] // 2)
 
         # Double-click in center
-        pyautogui.doubleClick(center_x, center_y)
+        self.backend.click(center_x, center_y, clicks=2)
 
         self.stats['total_clicks'] += 1
         self.stats['last_click'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -250,15 +373,35 @@ class AnimeVanguardsKeeper:
 
         # Restore previous window focus (return to your work)
         time.sleep(0.2)
-        if current_window:
-            try:
-                current_window.activate()
-                self.log_message(f"↩️  Returned focus to: {current_window.title}", "INFO")
-            except:
-                pass
+        self._restore_focus(current_window)
 
         return True
 
+    def _skip_loading_click(self):
+        self.stats['clicks_skipped_loading'] += 1
+        self.log_message("⏳ Loading screen showing, skipping AFK click", "INFO")
+        return False
+
+    def _restore_focus(self, window):
+        """Give the foreground back to the window the user was working in"""
+        if not window:
+            return
+        try:
+            self.backend.activate(window)
+            self.log_message(f"↩️  Returned focus to: {self.backend.window_title(window)}", "INFO")
+        except:
+            pass
+
+    def capture_sees_window(self, window=None):
+        """Does a capture show the client? True in the foreground or with a background (PrintWindow) capture"""
+        if self.capture.background:
+            return True
+        try:
+            window = window or self.get_roblox_window()
+            return bool(window) and self.backend.foreground_window() == window
+        except Exception:
+            return False
+
     def take_screenshot(self):
         """Take a screenshot using mss"""
         try:
@@ -276,15 +419,8 @@ class AnimeVanguardsKeeper:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = os.path.join(self.screenshot_dir, f"roblox_{timestamp}.png")
 
-            with mss.mss() as sct:
-                monitor = {
-                    "left": window_info['x'],
-                    "top": window_info['y'],
-                    "width": window_info['width'],
-                    "height": window_info['height']
-                }
-                screenshot = sct.grab(monitor)
-                mss.tools.to_png(screenshot.rgb, screenshot.size, output=filename)
+            frame = self.capture.grab_window(window_info)
+            self.capture.save_png(frame, filename)
 
             self.stats['total_screenshots'] += 1
             self.stats['last_screenshot'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -300,36 +436,60 @@ class AnimeVanguardsKeeper:
             self.save_stats()
             return False
 
+    def classify_screen(self, window_info=None):
+        """Screen state of the client, or None when unknown / not confident"""
+        if not self.screen_state.enabled:
+            return None
+        try:
+            window_info = window_info or self.get_window_rect()
+            if not window_info:
+                return None
+
+            previous = self.screen_state.state
+            state, confidence = self.screen_state.classify(self._analysis(self.capture.grab_window(window_info)))
+        except Exception as e:
+            self.log_message(f"Screen state check failed: {e}", "WARN")
+            return None
+
+        if state != previous:
+            self.log_message(f"🖥️  Screen: {state} ({confidence:.0%}, "
+                             f"{self.screen_state.stats['last_ms']:.1f} ms)", "INFO")
+            if state == 'loading':
+                self.stats['server_loads_detected'] += 1
+        return state if self.screen_state.is_confident() else None
+
     def dismiss_error_dialogs(self):
-        """Detect and dismiss Roblox error dialogs"""
+        """Detect a Roblox error dialog and click its button once"""
         try:
             window_info = self.get_window_rect()
             if not window_info:
                 return False
 
-            self.activate_roblox()
-            time.sleep(0.2)
+            # Look first: no dialog, no activation, no clicks
+            dialog = self.dialogs.detect(self.capture.grab_window(window_info), self.color_classifier)
+            if not dialog:
+                return False
 
-            center_x = window_info['x'] + (window_info['width'] // 2)
-            center_y = window_info['y'] + (window_info['height'] // 2)
+            bx, by = dialog['button']
+            how = "button" if dialog['button_found'] else "panel fallback"
+            self.log_message(f"⚠️ Error dialog at {dialog['panel']} "
+                             f"(detected in {self.dialogs.stats['last_ms']:.1f} ms), clicking {how} ({bx}, {by})", "INFO")
 
-            # Try clicking potential OK button locations
-            ok_button_locations = [
-                (center_x, center_y + 50),
-                (center_x, center_y + 70),
-                (center_x, center_y + 90),
-                (center_x - 50, center_y + 60),
-                (center_x + 50, center_y + 60),
-            ]
+            self.activate_roblox()
+            time.sleep(0.2)
+            self.backend.click(window_info['x'] + bx, window_info['y'] + by)
+            time.sleep(self.config.get('error_dialog', {}).get('verify_delay_seconds', 1.0))
 
-            for x, y in ok_button_locations:
-                pyautogui.click(x, y)
-                time.sleep(0.1)
+            # Only a dialog that is actually gone counts as dismissed
+            if self.dialogs.detect(self.capture.grab_window(window_info), self.color_classifier):
+                self.stats['error_dialog_misses'] += 1
+                self.log_message("Error dialog still showing after click", "WARN")
+                return False
 
             self.stats['error_dialogs_dismissed'] += 1
             self.stats['last_error_dismissed'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            self.log_message("🆗 Attempted to dismiss error dialogs", "INFO")
+            self.log_message("🆗 Error dialog dismissed", "INFO")
             self.log_stats("ERROR_DIALOG_DISMISSED", f"Total dismissed: {self.stats['error_dialogs_dismissed']}")
             self.save_stats()
 
@@ -343,9 +503,7 @@ class AnimeVanguardsKeeper:
         try:
             self.log_message("🚀 Launching Roblox...", "INFO")
             # Try to launch from Start Menu or default location
-            import subprocess
-            subprocess.Popen('start roblox:', shell=True)
-            return True
+            return self.backend.launch_roblox()
         except Exception as e:
             self.log_message(f"Failed to launch Roblox: {e}", "ERROR")
             return False
@@ -393,7 +551,7 @@ class AnimeVanguardsKeeper:
                 self.log_message(f"✓ Clicking game at FIXED position: ({click_x}, {click_y})", "INFO")
                 self.log_message(f"   Description: {game_click.get('description', 'N/A')}", "INFO")
 
-                pyautogui.click(click_x, click_y)
+                self.backend.click(click_x, click_y)
                 time.sleep(1.5)
 
                 # Click play button with fixed coordinates
@@ -406,30 +564,22 @@ class AnimeVanguardsKeeper:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 screenshot_path = os.path.join(self.screenshot_dir, f"game_search_{timestamp}.png")
 
-                with mss.mss() as sct:
-                    monitor = {
-                        "left": window_info['x'],
-                        "top": window_info['y'],
-                        "width": window_info['width'],
-                        "height": window_info['height']
-                    }
-                    screenshot = sct.grab(monitor)
-                    img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
-                    img.save(screenshot_path)
+                frame = self._analysis(self.capture.grab_window(window_info))
+                self.capture.save_png(frame.frame, screenshot_path)
 
                 self.log_message(f"📸 Captured search screen: {screenshot_path}", "INFO")
 
-                # Try detection methods
-                game_location = self.find_text_in_image(screenshot_path, game_name, window_info)
+                # Try detection methods (on the in-memory frame)
+                game_location = self.find_text_in_image(frame, game_name, window_info)
 
                 if game_location:
                     click_x, click_y = game_location
                     self.log_message(f"✓ Found '{game_name}' at: ({click_x}, {click_y})", "INFO")
-                    pyautogui.click(click_x, click_y)
+                    self.backend.click(click_x, click_y)
                     time.sleep(1.5)
                     return self.click_play_button(window_info)
                 else:
-                    return self.find_game_by_pattern(screenshot_path, window_info)
+                    return self.find_game_by_pattern(frame, window_info)
 
         except Exception as e:
             self.log_message(f"Error finding/clicking game: {e}", "ERROR")
@@ -454,7 +604,7 @@ class AnimeVanguardsKeeper:
             self.log_message(f"✓ Clicking play button at: ({click_x}, {click_y})", "INFO")
             self.log_message(f"   Description: {play_click.get('description', 'N/A')}", "INFO")
 
-            pyautogui.click(click_x, click_y)
+            self.backend.click(click_x, click_y)
             time.sleep(2)
 
             self.log_message("✓ Game launch sequence completed", "INFO")
@@ -472,53 +622,28 @@ class AnimeVanguardsKeeper:
 
             return False
 
-    def find_text_in_image(self, image_path, search_text, window_info):
-        """Use multiple detection methods to find the game with voting system"""
+    def find_text_in_image(self, image, search_text, window_info):
+        """
+        Use multiple detection methods to find the game with voting system
+
+        image is a capture frame (BGRA view or BGR array) or an image path.
+        The game card ROIs are searched first, then the whole frame.
+        """
         try:
-            img = cv2.imread(image_path)
-
-            detection_votes = []
-
-            # Method 1: Look for star rating pattern (⭐ 8.5)
-            star_location = self.detect_star_rating(img)
-            if star_location:
-                detection_votes.append(('star_rating', star_location))
-                self.log_message(f"✅ Method 1: Found star rating at {star_location}", "INFO")
-
-            # Method 2: Detect purple/blue gradient text (ANIME VANGUARDS title)
-            gradient_location = self.detect_gradient_text(img)
-            if gradient_location:
-                detection_votes.append(('gradient_text', gradient_location))
-                self.log_message(f"✅ Method 2: Found gradient text at {gradient_location}", "INFO")
-
-            # Method 3: Green dragon artwork detection (improved)
-            dragon_location = self.detect_green_dragon(img)
-            if dragon_location:
-                detection_votes.append(('green_dragon', dragon_location))
-                self.log_message(f"✅ Method 3: Found green dragon at {dragon_location}", "INFO")
-
-            # Method 4: Try OCR if available
-            try:
-                import pytesseract
-                ocr_location = self.detect_with_ocr(img, search_text)
-                if ocr_location:
-                    detection_votes.append(('ocr', ocr_location))
-                    self.log_message(f"✅ Method 4: OCR found text at {ocr_location}", "INFO")
-            except:
-                pass
-
-            # Voting: Use the most common location
-            if detection_votes:
-                # Average all detected locations
-                avg_x = sum(loc[0] for _, loc in detection_votes) // len(detection_votes)
-                avg_y = sum(loc[1] for _, loc in detection_votes) // len(detection_votes)
-
-                final_x = window_info['x'] + avg_x
-                final_y = window_info['y'] + avg_y
-
-                self.log_message(f"🎯 VOTING RESULT: {len(detection_votes)} methods agree!", "INFO")
-                self.log_message(f"📍 Final location: ({final_x}, {final_y})", "INFO")
+            img = cv2.imread(image) if isinstance(image, str) else image
 
+            detect = self.pyramid.wrap(
+                lambda crop: self._vote_game_location(crop, search_text, window_info['width'])
+            )
+            started = time.perf_counter()
+            location = self.rois.search('game_card', self._analysis(img), detect)
+            self._log_detection_latency(self.game_card_votes, started)
+
+            if location:
+                final_x = window_info['x'] + location[0]
+                final_y = window_info['y'] + location[1]
+
+                self.log_message(f"📍 Final location: ({final_x}, {final_y})", "INFO")
                 return (final_x, final_y)
 
             return None
@@ -527,31 +652,51 @@ class AnimeVanguardsKeeper:
             self.log_message(f"Multi-detection error: {e}", "WARN")
             return None
 
-    def detect_star_rating(self, img):
-        """Detect the ⭐ 8.5 rating badge"""
+    def _vote_game_location(self, img, search_text, window_width=None):
+        """Vote the game card detectors on one frame (or crop); frame-relative result"""
+        # Every detector shares one set of derived planes
+        img = self._analysis(img)
+
+        detectors = {
+            'template': lambda i: self.detect_with_template(i, 'game_card', window_width),
+            'star_rating': self.detect_star_rating,        # ⭐ 8.5 rating badge
+            'gradient_text': self.detect_gradient_text,    # ANIME VANGUARDS title
+            'green_dragon': self.detect_green_dragon,      # dragon artwork
+        }
+        if self.ocr.available:
+            detectors['ocr'] = lambda i: self.detect_with_ocr(i, search_text)
+
+        return self.game_card_votes.vote(img, detectors, self.detection_executor)
+
+    def detect_with_template(self, img, target, window_width=None):
+        """Template match for a target: (x, y, confidence) above min_confidence, or None"""
         try:
-            # Convert to HSV
-            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+            settings = self.config.get('template_matching', {})
+            if not settings.get('enabled', True) or not self.templates.has_target(target):
+                return None
 
-            # Yellow color range for star
-            lower_yellow = np.array([20, 100, 100])
-            upper_yellow = np.array([30, 255, 255])
+            hit = self.templates.match(self._analysis(img), target, window_width)
+            if hit and hit[2] >= settings.get('min_confidence', 0.7):
+                return hit
+            return None
+        except Exception as e:
+            self.log_message(f"Template match error: {e}", "WARN")
+            return None
 
-            mask = cv2.inRange(hsv, lower_yellow, upper_yellow)
+    def _analysis(self, img):
+        """Shared FrameAnalysis for a frame, wired to the color classifier"""
+        return FrameAnalysis.of(img, self.color_classifier)
 
-            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    def detect_star_rating(self, img):
+        """Detect the ⭐ 8.5 rating badge"""
+        try:
+            # Yellow star is small; take the top-most one (top-left of game card)
+            star = self._analysis(img).blobs('star_yellow').filter_area(50, 500).first_centroid()
 
-            if contours:
-                # Find star-shaped contours (small area in top-left of game card)
-                for contour in contours:
-                    area = cv2.contourArea(contour)
-                    if 50 < area < 500:  # Star is small
-                        M = cv2.moments(contour)
-                        if M["m00"] != 0:
-                            cx = int(M["m10"] / M["m00"])
-                            cy = int(M["m01"] / M["m00"])
-                            # Game card is below and to the right of star
-                            return (cx + 50, cy + 80)
+            if star:
+                cx, cy = star
+                # Game card is below and to the right of star
+                return (cx + 50, cy + 80)
 
             return None
         except:
@@ -560,28 +705,12 @@ class AnimeVanguardsKeeper:
     def detect_gradient_text(self, img):
         """Detect purple/blue gradient text (ANIME VANGUARDS title)"""
         try:
-            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+            # Find largest purple area (title text)
+            title = self._analysis(img).blobs('title_purple').filter_area(min_area=200).largest_centroid()
 
-            # Purple/blue color range
-            lower_purple = np.array([120, 50, 50])
-            upper_purple = np.array([150, 255, 255])
-
-            mask = cv2.inRange(hsv, lower_purple, upper_purple)
-
-            # Find large text areas
-            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-            if contours:
-                # Find largest purple area (title text)
-                large_contours = [c for c in contours if cv2.contourArea(c) > 200]
-
-                if large_contours:
-                    largest = max(large_contours, key=cv2.contourArea)
-                    M = cv2.moments(largest)
-                    if M["m00"] != 0:
-                        cx = int(M["m10"] / M["m00"])
-                        cy = int(M["m01"] / M["m00"])
-                        return (cx, cy + 30)  # Click slightly below text
+            if title:
+                cx, cy = title
+                return (cx, cy + 30)  # Click slightly below text
 
             return None
         except:
@@ -590,106 +719,83 @@ class AnimeVanguardsKeeper:
     def detect_green_dragon(self, img):
         """Enhanced green dragon artwork detection"""
         try:
-            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-
-            # Multiple green ranges for better detection
-            masks = []
+            # Multiple green ranges (bright + dark), read from the same label plane
+            blobs = self._analysis(img).blobs(['dragon_green_bright', 'dragon_green_dark'])
 
-            # Bright green
-            lower_green1 = np.array([35, 80, 80])
-            upper_green1 = np.array([85, 255, 255])
-            masks.append(cv2.inRange(hsv, lower_green1, upper_green1))
-
-            # Dark green
-            lower_green2 = np.array([35, 40, 40])
-            upper_green2 = np.array([85, 255, 150])
-            masks.append(cv2.inRange(hsv, lower_green2, upper_green2))
-
-            # Combine masks
-            combined_mask = masks[0]
-            for mask in masks[1:]:
-                combined_mask = cv2.bitwise_or(combined_mask, mask)
-
-            # Find large green areas (dragon artwork)
-            contours, _ = cv2.findContours(combined_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-            if contours:
-                # Find largest green area
-                large_contours = [c for c in contours if cv2.contourArea(c) > 1000]
-
-                if large_contours:
-                    largest = max(large_contours, key=cv2.contourArea)
-                    M = cv2.moments(largest)
-                    if M["m00"] != 0:
-                        cx = int(M["m10"] / M["m00"])
-                        cy = int(M["m01"] / M["m00"])
-                        return (cx, cy)
-
-            return None
+            # Find largest large green area (dragon artwork)
+            return blobs.filter_area(min_area=1000).largest_centroid()
         except:
             return None
 
     def detect_with_ocr(self, img, search_text):
-        """OCR detection if pytesseract is available"""
+        """OCR the search words in an ROI crop, or in the text regions of a full frame"""
         try:
-            import pytesseract
+            if not self.ocr.available:
+                return None
 
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            img = self._analysis(img)
 
-            # Enhance contrast for better OCR
-            gray = cv2.equalizeHist(gray)
+            # Text is unreadable on coarse pyramid levels; the refine pass reads it
+            if img.scale < 1.0:
+                return None
 
-            data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT)
+            # Contrast-enhanced gray for better OCR
+            gray = img.gray_eq
 
             search_words = search_text.upper().split()
+            regions = self._ocr_regions(img)
+            crops = [gray[y:y + h, x:x + w] for x, y, w, h in regions]
 
-            for i, text in enumerate(data['text']):
-                if text.strip().upper() in search_words:
-                    x = data['left'][i]
-                    y = data['top'][i]
-                    w = data['width'][i]
-                    h = data['height'][i]
-
-                    return (x + w//2, y + h//2)
+            # All regions in one OCR call (cached per crop)
+            for (x, y, _, _), words in zip(regions, self.ocr.read_batch(crops)):
+                for word in words:
+                    if word.text.upper() in search_words:
+                        return (x + word.left + word.width // 2, y + word.top + word.height // 2)
 
             return None
         except:
             return None
 
-    def find_game_by_pattern(self, screenshot_path, window_info):
+    def _ocr_regions(self, img):
+        """Crops worth reading: the whole image if ROI-sized, else title-colored text boxes"""
+        settings = self.config.get('ocr', {})
+        if img.width * img.height <= settings.get('max_pixels', 250000):
+            return [(0, 0, img.width, img.height)]
+
+        blobs = img.blobs('title_purple').filter_area(min_area=200)
+        if not len(blobs):
+            return [(0, 0, img.width, img.height)]
+
+        pad = settings.get('text_padding', 16)
+        regions = []
+        for index in np.argsort(-blobs.areas)[:settings.get('max_text_regions', 4)]:
+            x, y, w, h = (int(v) for v in blobs.bboxes[index])
+            x0, y0 = max(0, x - pad), max(0, y - pad)
+            regions.append((x0, y0, min(img.width, x + w + pad) - x0, min(img.height, y + h + pad) - y0))
+        return regions
+
+    def find_game_by_pattern(self, image, window_info):
         """Fallback: Find game by visual pattern (green dragon artwork)"""
         try:
             self.log_message("🔍 Searching for game by visual pattern...", "INFO")
 
-            img = cv2.imread(screenshot_path)
-            img_hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-
-            # Look for green colors (dragon artwork)
-            lower_green = np.array([35, 40, 40])
-            upper_green = np.array([85, 255, 255])
+            img = cv2.imread(image) if isinstance(image, str) else image
 
-            mask_green = cv2.inRange(img_hsv, lower_green, upper_green)
+            # Find largest green area (game card with dragon), card ROIs first
+            card = self.rois.search('game_card', self._analysis(img),
+                                    self.pyramid.wrap(self._detect_green_pattern))
 
-            # Find contours
-            contours, _ = cv2.findContours(mask_green, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            if card:
+                cx, cy = card
 
-            if contours:
-                # Find largest green area (game card with dragon)
-                largest_contour = max(contours, key=cv2.contourArea)
-                M = cv2.moments(largest_contour)
+                click_x = window_info['x'] + cx
+                click_y = window_info['y'] + cy
 
-                if M["m00"] != 0:
-                    cx = int(M["m10"] / M["m00"])
-                    cy = int(M["m01"] / M["m00"])
-
-                    click_x = window_info['x'] + cx
-                    click_y = window_info['y'] + cy
-
-                    self.log_message(f"✓ Found game card (green pattern) at: ({click_x}, {click_y})", "INFO")
-                    pyautogui.click(click_x, click_y)
-                    time.sleep(1.5)
+                self.log_message(f"✓ Found game card (green pattern) at: ({click_x}, {click_y})", "INFO")
+                self.backend.click(click_x, click_y)
+                time.sleep(1.5)
 
-                    return self.click_play_button(window_info)
+                return self.click_play_button(window_info)
 
             # Last resort: click default position
             self.log_message("⚠️  Using default click position", "WARN")
@@ -699,7 +805,7 @@ class AnimeVanguardsKeeper:
             click_x = center_x - 100
             click_y = center_y + 50
 
-            pyautogui.click(click_x, click_y)
+            self.backend.click(click_x, click_y)
             time.sleep(1.5)
 
             return self.click_play_button(window_info)
@@ -708,170 +814,96 @@ class AnimeVanguardsKeeper:
             self.log_message(f"Pattern matching error: {e}", "ERROR")
             return False
 
+    def _detect_green_pattern(self, img):
+        """Largest green (dragon artwork) area"""
+        return self._analysis(img).blobs('pattern_green').largest_centroid()
+
     def click_play_button(self, window_info):
         """Find and click the blue play button using multi-method detection"""
         try:
             self.log_message("▶️  Searching for play button with enhanced detection...", "INFO")
 
-            # Take another screenshot to find play button
-            with mss.mss() as sct:
-                monitor = {
-                    "left": window_info['x'],
-                    "top": window_info['y'],
-                    "width": window_info['width'],
-                    "height": window_info['height']
-                }
-                screenshot = sct.grab(monitor)
-                img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
-                img_np = np.array(img)
-
-                # Convert to BGR for OpenCV
-                img_bgr = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-
-                button_votes = []
-
-                # Method 1: Bright blue detection (primary blue tone)
-                blue_loc1 = self.detect_blue_button_method1(img_bgr)
-                if blue_loc1:
-                    button_votes.append(('bright_blue', blue_loc1))
-                    self.log_message(f"✅ Bright blue detected at {blue_loc1}", "INFO")
-
-                # Method 2: HSV blue detection (better for gradients)
-                blue_loc2 = self.detect_blue_button_method2(img_bgr)
-                if blue_loc2:
-                    button_votes.append(('hsv_blue', blue_loc2))
-                    self.log_message(f"✅ HSV blue detected at {blue_loc2}", "INFO")
-
-                # Method 3: Rectangle shape detection (buttons are rectangular)
-                rect_loc = self.detect_button_by_shape(img_bgr)
-                if rect_loc:
-                    button_votes.append(('rectangle', rect_loc))
-                    self.log_message(f"✅ Rectangle shape detected at {rect_loc}", "INFO")
-
-                # Voting system
-                if button_votes:
-                    avg_x = sum(loc[0] for _, loc in button_votes) // len(button_votes)
-                    avg_y = sum(loc[1] for _, loc in button_votes) // len(button_votes)
-
-                    click_x = window_info['x'] + avg_x
-                    click_y = window_info['y'] + avg_y
-
-                    self.log_message(f"🎯 PLAY BUTTON: {len(button_votes)} methods agree!", "INFO")
-                    self.log_message(f"✓ Clicking play button at: ({click_x}, {click_y})", "INFO")
-
-                    pyautogui.click(click_x, click_y)
-                    time.sleep(2)
-
-                    self.log_message("✓ Game launch sequence completed", "INFO")
-                    self.log_stats("AUTO_RELAUNCH", f"Rejoined {self.config.get('game_name', 'game')}")
-                    return True
-
-                # Fallback: click in lower-right area where play button usually is
-                center_x = window_info['x'] + (window_info['width'] // 2)
-                center_y = window_info['y'] + (window_info['height'] // 2)
-
-                click_x = center_x + 200
-                click_y = center_y + 200
-
-                self.log_message(f"⚠️  Using fallback play button location: ({click_x}, {click_y})", "WARN")
-                pyautogui.click(click_x, click_y)
+            # Capture just the play button ROIs first, the whole window on a miss
+            detect = self.pyramid.wrap(lambda crop: self._vote_play_button(crop, window_info['width']))
+            started = time.perf_counter()
+            location = self.rois.locate('play_button', window_info, self.capture, detect)
+            self._log_detection_latency(self.play_button_votes, started)
+
+            if location:
+                click_x = window_info['x'] + location[0]
+                click_y = window_info['y'] + location[1]
+
+                self.log_message(f"✓ Clicking play button at: ({click_x}, {click_y})", "INFO")
+
+                self.backend.click(click_x, click_y)
                 time.sleep(2)
 
+                self.log_message("✓ Game launch sequence completed", "INFO")
+                self.log_stats("AUTO_RELAUNCH", f"Rejoined {self.config.get('game_name', 'game')}")
                 return True
 
-        except Exception as e:
-            self.log_message(f"Error clicking play button: {e}", "ERROR")
-            return False
-
-    def detect_blue_button_method1(self, img):
-        """Detect bright blue button (BGR method)"""
-        try:
-            # Multiple blue ranges for better detection
-            lower_blue1 = np.array([180, 100, 30])
-            upper_blue1 = np.array([255, 200, 100])
+            # Fallback: click in lower-right area where play button usually is
+            center_x = window_info['x'] + (window_info['width'] // 2)
+            center_y = window_info['y'] + (window_info['height'] // 2)
 
-            mask1 = cv2.inRange(img, lower_blue1, upper_blue1)
+            click_x = center_x + 200
+            click_y = center_y + 200
 
-            lower_blue2 = np.array([150, 80, 40])
-            upper_blue2 = np.array([255, 180, 80])
+            self.log_message(f"⚠️  Using fallback play button location: ({click_x}, {click_y})", "WARN")
+            self.backend.click(click_x, click_y)
+            time.sleep(2)
 
-            mask2 = cv2.inRange(img, lower_blue2, upper_blue2)
+            return True
 
-            # Combine masks
-            mask = cv2.bitwise_or(mask1, mask2)
+        except Exception as e:
+            self.log_message(f"Error clicking play button: {e}", "ERROR")
+            return False
 
-            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    def _vote_play_button(self, img, window_width=None):
+        """Vote the play button detectors on one frame (or crop); frame-relative result"""
+        img = self._analysis(img)
 
-            if contours:
-                # Find largest blue area with reasonable size
-                valid_contours = [c for c in contours if 500 < cv2.contourArea(c) < 50000]
+        detectors = {
+            'template': lambda i: self.detect_with_template(i, 'play_button', window_width),
+            'bright_blue': self.detect_blue_button_method1,   # primary blue tone (BGR)
+            'hsv_blue': self.detect_blue_button_method2,      # better for gradients
+            'rectangle': self.detect_button_by_shape,         # buttons are rectangular
+        }
 
-                if valid_contours:
-                    largest = max(valid_contours, key=cv2.contourArea)
-                    M = cv2.moments(largest)
+        return self.play_button_votes.vote(img, detectors, self.detection_executor)
 
-                    if M["m00"] != 0:
-                        cx = int(M["m10"] / M["m00"])
-                        cy = int(M["m01"] / M["m00"])
-                        return (cx, cy)
+    def detect_blue_button_method1(self, img):
+        """Detect bright blue button (BGR method)"""
+        try:
+            # Multiple blue ranges for better detection
+            blobs = self._analysis(img).blobs(['button_blue_bgr1', 'button_blue_bgr2'])
 
-            return None
+            # Find largest blue area with reasonable size
+            return blobs.filter_area(500, 50000).largest_centroid()
         except:
             return None
 
     def detect_blue_button_method2(self, img):
         """Detect blue button using HSV (better for gradients)"""
         try:
-            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-
             # Blue hue range in HSV
-            lower_blue = np.array([100, 100, 100])
-            upper_blue = np.array([130, 255, 255])
-
-            mask = cv2.inRange(hsv, lower_blue, upper_blue)
-
-            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-            if contours:
-                valid_contours = [c for c in contours if 500 < cv2.contourArea(c) < 50000]
-
-                if valid_contours:
-                    largest = max(valid_contours, key=cv2.contourArea)
-                    M = cv2.moments(largest)
-
-                    if M["m00"] != 0:
-                        cx = int(M["m10"] / M["m00"])
-                        cy = int(M["m01"] / M["m00"])
-                        return (cx, cy)
-
-            return None
+            return self._analysis(img).blobs('button_blue_hsv').filter_area(500, 50000).largest_centroid()
         except:
             return None
 
     def detect_button_by_shape(self, img):
         """Detect button by rectangular shape"""
         try:
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            edges = cv2.Canny(gray, 50, 150)
+            # Regions enclosed by edges; a rectangle outline encloses a region
+            # that (nearly) fills its bounding box
+            regions = self._analysis(img).regions().filter_area(500, 50000)
 
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # Button-like: mostly rectangular, wider than tall
+            buttons = regions.filter_fill(0.7).filter_aspect(1.5, 5)
 
-            for contour in contours:
-                # Approximate the contour to a polygon
-                peri = cv2.arcLength(contour, True)
-                approx = cv2.approxPolyDP(contour, 0.02 * peri, True)
-
-                # If it has 4 sides (rectangle) and reasonable size
-                if len(approx) == 4:
-                    area = cv2.contourArea(contour)
-                    if 500 < area < 50000:
-                        # Get bounding box
-                        x, y, w, h = cv2.boundingRect(contour)
-
-                        # Check aspect ratio (buttons are usually wider than tall)
-                        aspect_ratio = w / float(h)
-                        if 1.5 < aspect_ratio < 5:  # Button-like ratio
-                            return (x + w//2, y + h//2)
+            if len(buttons):
+                x, y, w, h = buttons.bboxes[0]
+                return (int(x + w // 2), int(y + h // 2))
 
             return None
         except:
@@ -909,7 +941,63 @@ class AnimeVanguardsKeeper:
             # Auto-relaunch disabled - user joins manually
             # Just log and wait for user to restart
             return False
-        return True
+
+        # Running is not the same as alive and connected
+        if self.liveness.is_stalled():
+            return self.handle_dead_session('frozen')
+
+        # A covered window shows some other program: nothing to judge
+        if not self.capture_sees_window():
+            return True
+        if self.classify_screen() != 'disconnected':
+            self.disconnect_readings = 0
+            return True
+
+        # One frame can be wrong; relaunching kills the client, so wait for a second reading
+        self.disconnect_readings += 1
+        if self.disconnect_readings < 2:
+            self.log_message("🔌 Screen looks disconnected, confirming on the next check", "WARN")
+            return True
+        self.disconnect_readings = 0
+        return self.handle_dead_session('disconnected')
+
+    def handle_dead_session(self, reason):
+        """Client is open but frozen/disconnected: restart it when auto_relaunch is on"""
+        counter = 'freezes' if reason == 'frozen' else 'disconnects'
+        self.stats[counter] += 1
+        self.stats['status'] = reason
+        if reason == 'frozen':
+            self.log_message(f"🧊 ALERT: Roblox picture frozen for {self.liveness.still_seconds():.0f}s!", "CRITICAL")
+        else:
+            self.log_message("🔌 ALERT: Roblox is disconnected!", "CRITICAL")
+        self.log_stats(reason.upper(), f"Total {counter}: {self.stats[counter]}")
+        self.save_stats()
+
+        if not self.config.get('auto_relaunch', False):
+            self.log_message("⚠️  Please rejoin the game manually.", "WARN")
+            return False
+
+        self.close_roblox()
+        self.liveness.reset()
+        return self.auto_relaunch_sequence()
+
+    def sample_liveness(self):
+        """Feed a low-res sample of the visible window to the liveness monitor"""
+        if not self.liveness.enabled:
+            return False
+        try:
+            # A minimized window shows no picture to judge, and neither does a
+            # covered one unless the capture renders it in the background
+            window = self.get_roblox_window()
+            if not window or self.backend.is_minimized(window) or not self.capture_sees_window(window):
+                return False
+
+            window_info = self.backend.window_rect(window)
+            self.liveness.sample(self.capture.grab_window(window_info))
+            return True
+        except Exception as e:
+            self.log_message(f"Liveness sample failed: {e}", "WARN")
+            return False
 
     def start(self):
         """Start the keeper monitoring"""
@@ -929,13 +1017,21 @@ class AnimeVanguardsKeeper:
         self.log_message("🚀 Anime Vanguards Keeper Started")
         self.log_message("✓ Roblox is running")
 
+        # Crashes are reported by the watcher thread as they happen
+        if self.backend.watchable:
+            process_name = self.config.get('roblox_process_name', 'RobloxPlayerBeta.exe')
+            self.process_watcher = watch_process(process_name, self.config, on_exit=self._on_roblox_exit,
+                                                 log_callback=self.log_message)
+
         # Initial actions
         self.safe_click_roblox()
         self.take_screenshot()
 
-        # Start monitoring thread
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        # Start monitoring thread (sleeps until the next task is due)
+        self.scheduler = DeadlineScheduler(log_callback=self.log_message)
+        self._schedule_tasks()
+        self.scheduler.start(name="keeper-monitor")
+        self.monitor_thread = self.scheduler.thread
 
         return True
 
@@ -945,6 +1041,11 @@ class AnimeVanguardsKeeper:
             return False
 
         self.paused = not self.paused
+        if self.paused:
+            self.scheduler.pause()
+        else:
+            self.scheduler.resume()
+
         status = "paused" if self.paused else "resumed"
         self.stats['status'] = status
         self.log_message(f"⏸️  Keeper {status}")
@@ -957,6 +1058,11 @@ class AnimeVanguardsKeeper:
             return False
 
         self.running = False
+        self.scheduler.stop()
+        self.detection_executor.close()
+        if self.process_watcher:
+            self.process_watcher.stop()
+            self.process_watcher = None
         self.stats['status'] = 'stopped'
         self.log_message("🛑 Keeper stopped by user")
         self.save_stats()
@@ -966,49 +1072,46 @@ class AnimeVanguardsKeeper:
 
         return True
 
-    def _monitor_loop(self):
-        """Main monitoring loop"""
-        last_click_time = time.time()
-        last_screenshot_time = time.time()
-        last_status_check = time.time()
-        last_error_check = time.time()
-
-        click_interval = self.config.get('click_interval_minutes', 18) * 60
-        screenshot_interval = self.config.get('screenshot_interval_seconds', 3600)
-        error_check_interval = self.config.get('error_check_interval_seconds', 15)
-        status_check_interval = self.config.get('status_check_interval_seconds', 30)
-
-        while self.running:
-            if self.paused:
-                time.sleep(1)
-                continue
-
-            current_time = time.time()
-
-            # Check for error dialogs
-            if current_time - last_error_check >= error_check_interval:
-                self.dismiss_error_dialogs()
-                last_error_check = current_time
+    def _task_intervals(self):
+        """Scheduler task name -> interval in seconds, from config"""
+        return {
+            'error_check': self.config.get('error_check_interval_seconds', 15),
+            'status_check': self.config.get('status_check_interval_seconds', 30),
+            'liveness': self.config.get('liveness', {}).get('sample_interval_seconds', 10),
+            'screenshot': self.config.get('screenshot_interval_seconds', 3600),
+            'click': self.config.get('click_interval_minutes', 18) * 60
+        }
 
-            # Check Roblox status
-            if current_time - last_status_check >= status_check_interval:
-                self.monitor_roblox_status()
-                last_status_check = current_time
+    def _scheduled_screenshot(self):
+        self.log_message("📊 Hourly screenshot time!")
+        self.take_screenshot()
 
-            # Take screenshot
-            if current_time - last_screenshot_time >= screenshot_interval:
-                self.log_message("📊 Hourly screenshot time!")
-                self.take_screenshot()
-                last_screenshot_time = current_time
+    def _scheduled_click(self):
+        self.log_message("⏰ Time to keep active!")
+        self.safe_click_roblox()
 
-            # Click to keep active
-            if current_time - last_click_time >= click_interval:
-                self.log_message("⏰ Time to keep active!")
-                self.safe_click_roblox()
-                last_click_time = current_time
+    def _schedule_tasks(self):
+        """Register the monitoring tasks with the scheduler"""
+        intervals = self._task_intervals()
 
-            time.sleep(1)
+        self.scheduler.schedule('error_check', intervals['error_check'], self.dismiss_error_dialogs)
+        self.scheduler.schedule('status_check', intervals['status_check'], self.monitor_roblox_status)
+        self.scheduler.schedule('liveness', intervals['liveness'], self.sample_liveness)
+        self.scheduler.schedule('screenshot', intervals['screenshot'], self._scheduled_screenshot)
+        self.scheduler.schedule('click', intervals['click'], self._scheduled_click)
 
     def get_stats(self):
         """Get current stats"""
-        return self.stats.copy()
+        stats = self.stats.copy()
+        stats['detection_rois'] = self.rois.get_stats()
+        stats['detection_pyramid'] = self.pyramid.get_stats()
+        stats['template_matching'] = self.templates.stats.copy()
+        stats['ocr'] = self.ocr.stats.copy()
+        stats['error_dialog'] = self.dialogs.get_stats()
+        stats['screen_state'] = self.screen_state.get_stats()
+        stats['liveness'] = self.liveness.get_stats()
+        stats['detection_voting'] = {
+            'game_card': self.game_card_votes.get_stats(),
+            'play_button': self.play_button_votes.get_stats()
+        }
+        return stats
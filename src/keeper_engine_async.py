@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Anime Vanguards Keeper - asyncio Engine
+
+Runs the V2 click sequences on awaitable timers instead of time.sleep:
+- Each keeper is a coroutine, not a thread
+- Down/up delays, activation waits and click intervals are asyncio
+  sleeps, so one event loop interleaves input for hundreds of windows
+- SendMessageTimeout and watchdog input calls are awaited through the
+  dispatcher's call_async / send_async; click planning, window lookups,
+  verification grabs and the stats file write run on the default
+  executor: nothing that waits on a window runs on the loop thread
+- The blocking process scan runs on the loop's shared default executor
+- AsyncKeeperFleet drives every Roblox window from a single event loop
+
+Usage:
+    keeper = AsyncKeeperV2(base_dir, config_path)
+    await keeper.start()
+    ...
+    await keeper.stop()
+"""
+
+import os
+import json
+import time
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from keeper_engine_v2 import AnimeVanguardsKeeperV2
+from input_dispatcher import InputDispatcher, DispatchRequest
+from keeper_fleet import KeeperFleet
+
+
+def _advance(steps, value):
+    """Resume a click sequence: (finished, yielded step or return value)"""
+    try:
+        return False, steps.send(value)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+async def drive_steps_async(steps, dispatcher: InputDispatcher) -> bool:
+    """
+    Run a V2 click sequence, awaiting each yielded delay and dispatch request
+
+    The code between yields (window lookups, rect reads) runs on the
+    default executor, so only the awaits happen on the loop.
+    """
+    loop = asyncio.get_running_loop()
+    done, step = await loop.run_in_executor(None, _advance, steps, None)
+    while not done:
+        if isinstance(step, DispatchRequest):
+            result = await dispatcher.run_async(step)
+        else:
+            await asyncio.sleep(step)
+            result = None
+        done, step = await loop.run_in_executor(None, _advance, steps, result)
+    return bool(step)
+
+
+class AsyncKeeperV2(AnimeVanguardsKeeperV2):
+    """
+    V2 keeper whose start/stop/safe_click are coroutines
+
+    pause() and reload_config() stay synchronous so a Tk GUI thread can
+    call them; they wake the keeper's coroutine thread-safely.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._task = None
+        self._probe_task = None
+        self._probe_future = None
+        self._loop = None
+        self._wake = None
+        self._next_due = 0.0
+
+    # ========================================
+    # ASYNC CLICK INTERFACE
+    # ========================================
+
+    async def click_with_method(self, method_name: str, x: int, y: int, double: bool = False) -> bool:
+        """Run one click method's sequence without blocking the loop"""
+        steps = self._click_steps(method_name)
+        if not steps:
+            return False
+        return await drive_steps_async(steps(x, y, double), self.dispatcher)
+
+    async def safe_click(self) -> bool:
+        """
+        Async version of safe_click_roblox
+        Tries all available methods in priority order
+        """
+        # Window lookups and capture grabs run on the default executor
+        loop = asyncio.get_running_loop()
+        plan = await loop.run_in_executor(None, self._plan_click)
+        if not plan:
+            return False
+        x, y, double_click = plan
+
+        for method_name, _ in self.usable_click_methods():
+            start_time = time.time()
+            try:
+                snapshot = await loop.run_in_executor(None, self._snapshot_click, x, y)
+                success = await self.click_with_method(method_name, x, y, double_click)
+                elapsed = (time.time() - start_time) * 1000  # ms
+
+                if success and snapshot:
+                    await asyncio.sleep(self.verifier.settle_seconds)
+                    success = await loop.run_in_executor(None, self._confirm_click, method_name, snapshot)
+
+                if success:
+                    self._record_click_success(method_name, x, y, elapsed)
+                    return True
+                else:
+                    self._record_click_failure(method_name, elapsed)
+                    self.log_message(f"⚠️  {method_name.upper()} failed, trying next method...")
+
+            except Exception as e:
+                self._record_click_failure(method_name, (time.time() - start_time) * 1000)
+                self.log_message(f"❌ {method_name.upper()} exception: {e}", "ERROR")
+                continue
+
+        self._record_all_failed()
+        return False
+
+    def save_stats(self):
+        """Save statistics; on the loop, serialised there and written on the default executor"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return super().save_stats()
+        loop.run_in_executor(None, self._write_stats, json.dumps(self.stats, indent=2))
+
+    # ========================================
+    # KEEPER COROUTINE
+    # ========================================
+
+    async def keeper_tick_async(self) -> float:
+        """One keeper cycle; returns the delay until the next one"""
+        click_interval = self._click_interval()
+
+        try:
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(None, self.is_roblox_running):
+                self.log_message("⚠️  Roblox not running!", "WARN")
+                self.stats['status'] = 'warning'
+                return 5
+
+            self.log_message(f"⏰ Click interval reached ({click_interval}s)")
+            success = await self.safe_click()
+
+            if success:
+                self.log_message(f"✅ AFK prevention successful")
+            else:
+                self.log_message(f"❌ AFK prevention failed", "ERROR")
+
+            self.log_message(f"⏳ Next click in {click_interval} seconds ({click_interval/60:.1f} minutes)")
+            return click_interval
+
+        except Exception as e:
+            self.log_message(f"Error in keeper loop: {e}", "ERROR")
+            return 10
+
+    async def _wait_for_wake(self, timeout: Optional[float]):
+        """Sleep until timeout or until pause/stop/reload wakes us"""
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def keeper_loop_async(self, first_delay: float = 0.0):
+        """Keeper coroutine: sleeps until the next click is due"""
+        loop = asyncio.get_running_loop()
+        self._next_due = loop.time() + first_delay
+
+        while self.running:
+            if self.paused:
+                await self._wait_for_wake(None)
+                continue
+
+            remaining = self._next_due - loop.time()
+            if remaining > 0:
+                await self._wait_for_wake(remaining)
+                continue
+
+            delay = await self.keeper_tick_async()
+            self._next_due = loop.time() + delay
+
+        if self._probe_task:
+            self._probe_task.cancel()
+        self.log_message("🛑 Keeper loop stopped")
+
+    async def probe_loop_async(self):
+        """Method health probes on the default executor (they make blocking Win32 calls)"""
+        loop = asyncio.get_running_loop()
+        while self.running:
+            delay = self.prober.interval
+            if not self.paused:
+                # Shielded: cancelling this task must not orphan a probe stop() waits for
+                self._probe_future = loop.run_in_executor(None, self.prober.probe)
+                delay = await asyncio.shield(self._probe_future)
+            await asyncio.sleep(delay)
+
+    def _notify(self):
+        """Wake the keeper coroutine from any thread"""
+        if not self._loop or not self._wake:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            self._wake.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def attach(self, first_delay: float = 0.0):
+        """Start the keeper coroutine on the running loop (no process check)"""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.running = True
+        self.paused = False
+        self.stats['status'] = 'running'
+        self.stats['start_time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._task = self._loop.create_task(self.keeper_loop_async(first_delay))
+        self._probe_task = self._loop.create_task(self.probe_loop_async())
+        return self._task
+
+    # ========================================
+    # CONTROL
+    # ========================================
+
+    async def start(self) -> bool:
+        """Start the keeper on the running event loop"""
+        if self.running:
+            self.log_message("Keeper already running", "WARN")
+            return False
+
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, self.is_roblox_running):
+            self.log_message("Roblox is not running!", "ERROR")
+            return False
+
+        self.attach()
+        self._start_process_watcher()
+        self.log_message("🚀 Keeper loop started")
+        return True
+
+    def pause(self) -> bool:
+        """Toggle pause state"""
+        self.paused = not self.paused
+        self.stats['status'] = 'paused' if self.paused else 'running'
+        self._notify()
+        return self.paused
+
+    def reload_config(self):
+        """Reload config from disk and apply it without restarting"""
+        old_interval = self._click_interval()
+        self._apply_config(self.load_config())
+
+        # Keep the time already elapsed since the last click
+        self._next_due += self._click_interval() - old_interval
+        self._notify()
+        self.log_message("🔁 Configuration reloaded")
+
+    async def stop(self) -> bool:
+        """Stop the keeper and wait for its coroutine to finish"""
+        if not self.running:
+            return False
+
+        self.running = False
+        self._notify()
+        self._stop_process_watcher()
+        if self._task:
+            await self._task
+        # A probe still running in the executor dispatches through our pool
+        if self._probe_future:
+            await asyncio.gather(self._probe_future, return_exceptions=True)
+        self.close()
+
+        self.stats['status'] = 'stopped'
+        return True
+
+
+class AsyncKeeperFleet(KeeperFleet):
+    """
+    Fleet mode on one event loop: one coroutine per Roblox window
+
+    The discovery/process-check coroutine is shared, and its result is
+    reused by every window instead of each keeper scanning processes.
+    """
+
+    keeper_class = AsyncKeeperV2
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.roblox_alive = False
+        self._discovery_task = None
+        self._loop = None
+        self._wake = None
+        self._retiring = set()
+
+    def _watch_window(self, hwnd: int, keeper: AsyncKeeperV2, first_delay: float):
+        """Start a coroutine for a newly discovered window"""
+        # Reuse the fleet's process check rather than one scan per window
+        keeper.is_roblox_running = lambda: self.roblox_alive
+        keeper.attach(first_delay)
+
+    def _unwatch_window(self, hwnd: int):
+        """Stop the coroutine of a window that disappeared, then release its keeper"""
+        keeper = self.keepers.get(hwnd)
+        if keeper:
+            task = asyncio.get_running_loop().create_task(self._retire(keeper))
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+
+    async def _retire(self, keeper: AsyncKeeperV2):
+        # stop() waits for a click in flight before closing the dispatcher
+        await keeper.stop()
+        keeper.save_stats()
+
+    def _on_roblox_exit(self, pid: int, remaining: int):
+        """Process watcher: a client exited (watcher thread)"""
+        self.log_message(f"⚡ Roblox process {pid} exited ({remaining} still running)", "WARN")
+        if not remaining:
+            # Every window stops clicking now, and discovery drops them right away
+            self.roblox_alive = False
+        if self.running and self._loop:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _discovery_loop(self):
+        """Shared process check and window rediscovery"""
+        loop = asyncio.get_running_loop()
+
+        while self.running:
+            # Cleared before the pass, so an exit reported during it triggers another
+            self._wake.clear()
+            if not self.paused:
+                self.roblox_alive = await loop.run_in_executor(None, self._roblox_running)
+                if not self.roblox_alive:
+                    self.log_message("⚠️  Roblox not running!", "WARN")
+                    self.stats['status'] = 'warning'
+                else:
+                    self.stats['status'] = 'running'
+                # Also without Roblox: windows of exited clients are dropped
+                self.discover_windows()
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.rediscover_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> bool:
+        """Start the fleet on the running event loop"""
+        if self.running:
+            self.log_message("Fleet already running", "WARN")
+            return False
+
+        self.running = True
+        self.paused = False
+        self.stats['status'] = 'running'
+        self.stats['start_time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._start_process_watcher()
+        self._discovery_task = asyncio.get_running_loop().create_task(self._discovery_loop())
+        self.log_message("🚀 Fleet started")
+        return True
+
+    def pause(self) -> bool:
+        """Toggle pause state for every window"""
+        self.paused = not self.paused
+        self.stats['status'] = 'paused' if self.paused else 'running'
+        for keeper in list(self.keepers.values()):
+            if keeper.paused != self.paused:
+                keeper.pause()
+        return self.paused
+
+    async def stop(self) -> bool:
+        """Stop the fleet and every window coroutine"""
+        if not self.running:
+            return False
+
+        self.running = False
+        self._wake.set()
+        self._stop_process_watcher()
+        if self._discovery_task:
+            await self._discovery_task
+
+        await asyncio.gather(*self._retiring, *(keeper.stop() for keeper in list(self.keepers.values())))
+        for keeper in list(self.keepers.values()):
+            keeper.save_stats()
+
+        self.log_message("🛑 Fleet stopped")
+        self.stats['status'] = 'stopped'
+        return True
+
+
+async def main():
+    """Run the async fleet headless from the console"""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config_path = os.path.join(base_dir, "config", "config_v2.json")
+
+    fleet = AsyncKeeperFleet(base_dir, config_path)
+    await fleet.start()
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await fleet.stop()
+        print(json.dumps(fleet.get_stats(), indent=2))
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -20,36 +20,17 @@ import os
 import json
 import time
 import random
-import psutil
-import threading
 from datetime import datetime
 from typing import Optional, Tuple, Callable
-import ctypes
-from ctypes import wintypes
-
-# Standard imports
-try:
-    import pygetwindow as gw
-except ImportError:
-    gw = None
-
-try:
-    import pyautogui
-except ImportError:
-    pyautogui = None
-
-try:
-    import PyDirectInput
-except ImportError:
-    PyDirectInput = None
-
-try:
-    import win32gui
-    import win32ui
-    import win32con
-    from PIL import Image
-except ImportError:
-    win32gui = None
+
+from keeper_backends import KeeperBackend, default_backend
+from keeper_scheduler import DeadlineScheduler
+from process_watcher import watch_process
+from window_registry import shared_registry
+from input_dispatcher import InputDispatcher, DispatchRequest
+from method_selector import MethodSelector
+from method_prober import MethodProber
+from click_verifier import ClickVerifier
 
 
 class ClickMethod:
@@ -65,14 +46,28 @@ class AnimeVanguardsKeeperV2:
     Industry-grade AFK keeper with multi-method fallback system
     """
 
-    def __init__(self, base_dir: str, config_path: str, log_callback: Optional[Callable] = None):
-        """Initialize keeper with configuration"""
+    def __init__(self, base_dir: str, config_path: str, log_callback: Optional[Callable] = None,
+                 hwnd: Optional[int] = None, config: Optional[dict] = None,
+                 instance_name: Optional[str] = None, backend: Optional[KeeperBackend] = None):
+        """
+        Initialize keeper with configuration
+
+        hwnd pins the keeper to one specific Roblox window (fleet mode).
+        config skips reading config_path when the caller already loaded it.
+        instance_name keeps per-window stats files apart.
+        backend supplies windows, capture and input (default: native Windows).
+        """
         self.base_dir = base_dir
+        self.backend = backend or default_backend()
+        # Capture is backend-wide: only a keeper that created its backend configures it
+        self.owns_backend = backend is None
         self.config_path = config_path
         self.log_callback = log_callback
+        self.hwnd = hwnd
+        self.instance_name = instance_name
 
         # Load configuration
-        self.config = self.load_config()
+        self.config = config if config is not None else self.load_config()
 
         # Statistics
         self.stats = {
@@ -99,16 +94,38 @@ class AnimeVanguardsKeeperV2:
         self.running = False
         self.paused = False
         self.keeper_thread = None
+        self.scheduler = DeadlineScheduler(log_callback=self.log_message)
+        self.process_watcher = None
+
+        # Window handles and geometry, cached and shared with every keeper in this process
+        self.windows = shared_registry(self.config, self.backend)
 
-        # Windows API setup
-        self.user32 = ctypes.windll.user32
+        # Window messages
         self.WM_LBUTTONDOWN = 0x0201
         self.WM_LBUTTONUP = 0x0202
         self.WM_LBUTTONDBLCLK = 0x0203
+        self.WM_NULL = 0x0000
 
         # Click method priority order
         self.click_methods = self._get_click_method_priority()
 
+        # Every input call is timed and bounded; overrunning methods get skipped
+        self.dispatcher = InputDispatcher(self.config, log_callback=self.log_message, backend=self.backend)
+
+        # This window's method order, learned from click outcomes and latency
+        self.selector = MethodSelector([name for name, _ in self.click_methods], self.config)
+
+        # Background health checks; broken methods are skipped without trying them
+        self.activation_target = None
+        self.prober = MethodProber(self._probe_checks(), self.config, log_callback=self.log_message)
+
+        # Background (PrintWindow) capture when configured, so verification sees occluded windows
+        if self.owns_backend:
+            self.backend.configure_capture(self.config)
+
+        # Optional before/after check that the game actually reacted to a click
+        self.verifier = ClickVerifier(self.config, grab=self.backend.grab)
+
         # Humanization settings
         self.humanization = self.config.get('humanization', {})
         self.position_variance = self.humanization.get('position_variance', 10)
@@ -119,7 +136,10 @@ class AnimeVanguardsKeeperV2:
         self.log_message("🎮 ANIME VANGUARDS KEEPER V2 - INDUSTRY GRADE")
         self.log_message("=" * 80)
         self.log_message(f"Available click methods: {', '.join([m for m, _ in self.click_methods])}")
-        self.log_message(f"Primary method: {self.click_methods[0][0]}")
+        if self.click_methods:
+            self.log_message(f"Primary method: {self.click_methods[0][0]}")
+        else:
+            self.log_message(f"No click method available on the {self.backend.name} backend", "WARN")
         self.log_message(f"Humanization: {'Enabled' if self.config.get('humanization_enabled', True) else 'Disabled'}")
 
     def _get_click_method_priority(self) -> list:
@@ -140,16 +160,16 @@ class AnimeVanguardsKeeperV2:
 
         priority = user_preference if user_preference else default_priority
 
-        # Build available methods list
+        # Build available methods list (what the backend can deliver)
+        funcs = {
+            ClickMethod.POST_MESSAGE: self._click_postmessage,
+            ClickMethod.SEND_MESSAGE: self._click_sendmessage,
+            ClickMethod.DIRECT_INPUT: self._click_directinput,
+            ClickMethod.PYAUTOGUI: self._click_pyautogui
+        }
         for method in priority:
-            if method == ClickMethod.POST_MESSAGE:
-                methods.append((ClickMethod.POST_MESSAGE, self._click_postmessage))
-            elif method == ClickMethod.SEND_MESSAGE:
-                methods.append((ClickMethod.SEND_MESSAGE, self._click_sendmessage))
-            elif method == ClickMethod.DIRECT_INPUT and PyDirectInput:
-                methods.append((ClickMethod.DIRECT_INPUT, self._click_directinput))
-            elif method == ClickMethod.PYAUTOGUI and pyautogui:
-                methods.append((ClickMethod.PYAUTOGUI, self._click_pyautogui))
+            if method in funcs and self.backend.has_input(method):
+                methods.append((method, funcs[method]))
 
         return methods
 
@@ -167,6 +187,9 @@ class AnimeVanguardsKeeperV2:
 
     def log_message(self, message: str, level: str = "INFO"):
         """Log message to callback"""
+        if self.instance_name:
+            message = f"[{self.instance_name}] {message}"
+
         if self.log_callback:
             self.log_callback(message)
         else:
@@ -174,52 +197,54 @@ class AnimeVanguardsKeeperV2:
             print(f"[{timestamp}] [{level}] {message}")
 
     def is_roblox_running(self) -> bool:
-        """Check if Roblox process is running"""
+        """Check if Roblox process is running (from the watcher once started)"""
+        if self.process_watcher:
+            return self.process_watcher.running
         process_name = self.config.get('roblox_process_name', 'RobloxPlayerBeta.exe')
-        for proc in psutil.process_iter(['name']):
-            try:
-                if proc.info['name'] == process_name:
-                    return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        return False
+        return bool(self.backend.process_ids(process_name))
 
-    def get_window_handle(self) -> Optional[int]:
-        """Get Roblox window handle"""
-        if not win32gui:
-            return None
+    def _start_process_watcher(self):
+        """Watch the Roblox PIDs for exit instead of scanning every tick"""
+        if not self.backend.watchable:
+            return
+        process_name = self.config.get('roblox_process_name', 'RobloxPlayerBeta.exe')
+        self.process_watcher = watch_process(process_name, self.config, on_exit=self._on_roblox_exit,
+                                             log_callback=self.log_message)
+
+    def _stop_process_watcher(self):
+        if self.process_watcher:
+            self.process_watcher.stop()
+            self.process_watcher = None
+
+    def _on_roblox_exit(self, pid: int, remaining: int):
+        """Process watcher: a Roblox process exited (runs on the watcher thread)"""
+        if remaining or not self.running:
+            return
+        self.stats['roblox_crashes'] += 1
+        self.stats['status'] = 'warning'
+        self.log_message(f"⚡ Roblox process {pid} exited (crashes: {self.stats['roblox_crashes']})", "WARN")
+
+    def enumerate_window_handles(self, title_match: str = "Roblox") -> list:
+        """Get handles of every visible window whose title contains title_match (fresh enumeration)"""
+        return self.windows.enumerate(title_match)
 
-        def enum_callback(hwnd, results):
-            if win32gui.IsWindowVisible(hwnd):
-                title = win32gui.GetWindowText(hwnd)
-                if "Roblox" in title:
-                    results.append(hwnd)
+    def get_window_handle(self) -> Optional[int]:
+        """Get Roblox window handle (the pinned one in fleet mode), validated via the registry"""
+        if self.hwnd:
+            return self.hwnd if self.windows.validate(self.hwnd) else None
 
-        handles = []
-        win32gui.EnumWindows(enum_callback, handles)
-        return handles[0] if handles else None
+        return self.windows.first()
 
     def get_window_rect(self) -> Optional[dict]:
-        """Get Roblox window dimensions"""
-        if not win32gui:
-            return None
-
+        """Get Roblox window dimensions (cached client rect in screen coordinates)"""
         hwnd = self.get_window_handle()
         if not hwnd:
             return None
 
-        try:
-            rect = win32gui.GetClientRect(hwnd)
-            pos = win32gui.ClientToScreen(hwnd, (0, 0))
-            return {
-                'x': pos[0],
-                'y': pos[1],
-                'width': rect[2],
-                'height': rect[3]
-            }
-        except Exception as e:
-            self.log_message(f"Failed to get window rect: {e}", "ERROR")
-            return None
+        rect = self.windows.rect(hwnd)
+        if rect is None:
+            self.log_message(f"Failed to get window rect for hwnd={hwnd}", "ERROR")
+        return rect
 
     def apply_humanization(self, x: int, y: int) -> Tuple[int, int, float]:
         """
@@ -249,15 +274,46 @@ class AnimeVanguardsKeeperV2:
 
         return random.random() < self.double_click_chance
 
+    # ========================================
+    # CLICK SEQUENCES
+    # ========================================
+    #
+    # Each click method is written once as a step generator: it yields
+    # the delay to wait before the next input action, or a dispatcher
+    # request (a send / watchdog call that may block up to its budget)
+    # whose result is sent back in, and finally returns True/False.
+    # _drive_steps runs a sequence with time.sleep and blocking dispatch;
+    # the asyncio engine runs the same sequence with asyncio.sleep and
+    # awaitable dispatch, so one event loop can interleave many windows.
+
+    def _drive_steps(self, steps) -> bool:
+        """Run a click sequence on the calling thread"""
+        try:
+            step = next(steps)
+            while True:
+                if isinstance(step, DispatchRequest):
+                    step = steps.send(self.dispatcher.run(step))
+                else:
+                    time.sleep(step)
+                    step = steps.send(None)
+        except StopIteration as stop:
+            return bool(stop.value)
+
+    def _click_steps(self, method_name: str) -> Optional[Callable]:
+        """Step generator factory for a click method"""
+        return {
+            ClickMethod.POST_MESSAGE: self._postmessage_steps,
+            ClickMethod.SEND_MESSAGE: self._sendmessage_steps,
+            ClickMethod.DIRECT_INPUT: self._directinput_steps,
+            ClickMethod.PYAUTOGUI: self._pyautogui_steps
+        }.get(method_name)
+
     # ========================================
     # CLICK METHOD 1: PostMessage (Fastest)
     # ========================================
 
-    def _click_postmessage(self, x: int, y: int, double: bool = False) -> bool:
-        """
-        Click using PostMessage - Async, fastest method
-        Works in background without activation
-        """
+    def _postmessage_steps(self, x: int, y: int, double: bool = False):
+        """PostMessage click sequence"""
         hwnd = self.get_window_handle()
         if not hwnd:
             return False
@@ -265,32 +321,29 @@ class AnimeVanguardsKeeperV2:
         try:
             lParam = (y << 16) | (x & 0xFFFF)
 
-            if double:
-                # Double-click sequence
-                self.user32.PostMessageW(hwnd, self.WM_LBUTTONDBLCLK, 0x0001, lParam)
-                time.sleep(0.05)
-                self.user32.PostMessageW(hwnd, self.WM_LBUTTONUP, 0x0000, lParam)
-            else:
-                # Single click
-                self.user32.PostMessageW(hwnd, self.WM_LBUTTONDOWN, 0x0001, lParam)
-                time.sleep(0.05)
-                self.user32.PostMessageW(hwnd, self.WM_LBUTTONUP, 0x0000, lParam)
-
-            return True
+            down = self.WM_LBUTTONDBLCLK if double else self.WM_LBUTTONDOWN
+            if not self.dispatcher.post(hwnd, down, 0x0001, lParam):
+                return False
+            yield 0.05
+            return self.dispatcher.post(hwnd, self.WM_LBUTTONUP, 0x0000, lParam)
 
         except Exception as e:
             self.log_message(f"PostMessage click failed: {e}", "WARN")
             return False
 
+    def _click_postmessage(self, x: int, y: int, double: bool = False) -> bool:
+        """
+        Click using PostMessage - Async, fastest method
+        Works in background without activation
+        """
+        return self._drive_steps(self._postmessage_steps(x, y, double))
+
     # ========================================
     # CLICK METHOD 2: SendMessage (Reliable)
     # ========================================
 
-    def _click_sendmessage(self, x: int, y: int, double: bool = False) -> bool:
-        """
-        Click using SendMessage - Synchronous, reliable method
-        Works in background without activation
-        """
+    def _sendmessage_steps(self, x: int, y: int, double: bool = False):
+        """SendMessage click sequence"""
         hwnd = self.get_window_handle()
         if not hwnd:
             return False
@@ -298,33 +351,31 @@ class AnimeVanguardsKeeperV2:
         try:
             lParam = (y << 16) | (x & 0xFFFF)
 
-            if double:
-                # Double-click sequence
-                self.user32.SendMessageW(hwnd, self.WM_LBUTTONDBLCLK, 0x0001, lParam)
-                time.sleep(0.05)
-                self.user32.SendMessageW(hwnd, self.WM_LBUTTONUP, 0x0000, lParam)
-            else:
-                # Single click
-                self.user32.SendMessageW(hwnd, self.WM_LBUTTONDOWN, 0x0001, lParam)
-                time.sleep(0.05)
-                self.user32.SendMessageW(hwnd, self.WM_LBUTTONUP, 0x0000, lParam)
-
-            return True
+            # SendMessageTimeoutW: a hung window cannot block the keeper
+            down = self.WM_LBUTTONDBLCLK if double else self.WM_LBUTTONDOWN
+            if not (yield self.dispatcher.request('send', hwnd, down, 0x0001, lParam)):
+                return False
+            yield 0.05
+            return (yield self.dispatcher.request('send', hwnd, self.WM_LBUTTONUP, 0x0000, lParam))
 
         except Exception as e:
             self.log_message(f"SendMessage click failed: {e}", "WARN")
             return False
 
+    def _click_sendmessage(self, x: int, y: int, double: bool = False) -> bool:
+        """
+        Click using SendMessage - Synchronous, reliable method
+        Works in background without activation
+        """
+        return self._drive_steps(self._sendmessage_steps(x, y, double))
+
     # ========================================
     # CLICK METHOD 3: DirectInput (Game-Compatible)
     # ========================================
 
-    def _click_directinput(self, x: int, y: int, double: bool = False) -> bool:
-        """
-        Click using PyDirectInput - Better game recognition
-        May require brief activation
-        """
-        if not PyDirectInput:
+    def _directinput_steps(self, x: int, y: int, double: bool = False):
+        """DirectInput click sequence"""
+        if not self.backend.has_input(ClickMethod.DIRECT_INPUT):
             return False
 
         try:
@@ -336,16 +387,17 @@ class AnimeVanguardsKeeperV2:
             abs_x = window_rect['x'] + x
             abs_y = window_rect['y'] + y
 
-            # Move and click using DirectInput
-            PyDirectInput.moveTo(abs_x, abs_y)
-            time.sleep(0.05)
+            # Move and click using DirectInput (each call on the watchdog pool)
+            method = ClickMethod.DIRECT_INPUT
+            if not (yield self.dispatcher.request('call', method, self.backend.move_cursor, abs_x, abs_y, method)):
+                return False
+            yield 0.05
 
+            if not (yield self.dispatcher.request('call', method, self.backend.click, abs_x, abs_y, 1, method)):
+                return False
             if double:
-                PyDirectInput.click(abs_x, abs_y)
-                time.sleep(0.05)
-                PyDirectInput.click(abs_x, abs_y)
-            else:
-                PyDirectInput.click(abs_x, abs_y)
+                yield 0.05
+                return (yield self.dispatcher.request('call', method, self.backend.click, abs_x, abs_y, 1, method))
 
             return True
 
@@ -353,34 +405,41 @@ class AnimeVanguardsKeeperV2:
             self.log_message(f"DirectInput click failed: {e}", "WARN")
             return False
 
+    def _click_directinput(self, x: int, y: int, double: bool = False) -> bool:
+        """
+        Click using PyDirectInput - Better game recognition
+        May require brief activation
+        """
+        return self._drive_steps(self._directinput_steps(x, y, double))
+
     # ========================================
     # CLICK METHOD 4: PyAutoGUI (Fallback)
     # ========================================
 
-    def _click_pyautogui(self, x: int, y: int, double: bool = False) -> bool:
-        """
-        Click using PyAutoGUI - Requires window activation
-        This is the current method (fallback only)
-        """
-        if not pyautogui or not gw:
+    def _pyautogui_steps(self, x: int, y: int, double: bool = False):
+        """PyAutoGUI click sequence (activate, click, restore focus)"""
+        if not self.backend.has_input(ClickMethod.PYAUTOGUI):
             return False
 
         try:
-            # Save current window
-            current_window = None
-            try:
-                current_window = gw.getActiveWindow()
-            except:
-                pass
-
-            # Activate Roblox
-            windows = gw.getWindowsWithTitle("Roblox")
-            if not windows:
+            # Activation target pre-resolved by the health probe, if still valid
+            target = self.activation_target
+            if not target or not target[1] or not self.windows.validate(target[1]):
+                target = self._resolve_activation()
+            if not target:
                 return False
+            activate, hwnd = target
+
+            # Roblox already in front: no activation, no wait, nothing to restore
+            current_window = None
+            foreground = self.backend.foreground_window()
+            if foreground != hwnd:
+                # Save current window
+                current_window = foreground
 
-            roblox_window = windows[0]
-            roblox_window.activate()
-            time.sleep(0.3)
+                if not (yield self.dispatcher.request('call', ClickMethod.PYAUTOGUI, activate)):
+                    return False
+                yield 0.3
 
             # Get absolute coordinates
             window_rect = self.get_window_rect()
@@ -390,17 +449,17 @@ class AnimeVanguardsKeeperV2:
             abs_x = window_rect['x'] + x
             abs_y = window_rect['y'] + y
 
-            # Click
-            if double:
-                pyautogui.doubleClick(abs_x, abs_y)
-            else:
-                pyautogui.click(abs_x, abs_y)
+            # Click (pyautogui's own post-call pause becomes a yielded step)
+            method = ClickMethod.PYAUTOGUI
+            if not (yield self.dispatcher.request('call', method, self.backend.click,
+                                                  abs_x, abs_y, 2 if double else 1, method)):
+                return False
 
             # Restore previous window
-            time.sleep(0.2)
             if current_window:
+                yield self.backend.input_pause + 0.2
                 try:
-                    current_window.activate()
+                    self.backend.activate(current_window)
                 except:
                     pass
 
@@ -410,14 +469,109 @@ class AnimeVanguardsKeeperV2:
             self.log_message(f"PyAutoGUI click failed: {e}", "WARN")
             return False
 
+    def _resolve_activation(self) -> Optional[Tuple[Callable, int]]:
+        """(activate, hwnd) for the pyautogui fallback, or None without a window"""
+        # Fleet mode: activate our own window, not the first match
+        hwnd = self.get_window_handle()
+        if not hwnd:
+            return None
+        return (lambda: self.backend.activate(hwnd)), hwnd
+
+    def _click_pyautogui(self, x: int, y: int, double: bool = False) -> bool:
+        """
+        Click using PyAutoGUI - Requires window activation
+        This is the current method (fallback only)
+        """
+        return self._drive_steps(self._pyautogui_steps(x, y, double))
+
+    # ========================================
+    # METHOD HEALTH PROBES
+    # ========================================
+    #
+    # Each check returns None when its method could click right now, or
+    # the reason it could not. None of them sends mouse input.
+
+    def _probe_checks(self) -> dict:
+        """Health check per configured click method"""
+        checks = {
+            ClickMethod.POST_MESSAGE: self._probe_postmessage,
+            ClickMethod.SEND_MESSAGE: self._probe_sendmessage,
+            ClickMethod.DIRECT_INPUT: self._probe_directinput,
+            ClickMethod.PYAUTOGUI: self._probe_pyautogui
+        }
+        return {name: checks[name] for name, _ in self.click_methods}
+
+    def _probe_window(self) -> Tuple[Optional[int], Optional[str]]:
+        """(hwnd, None) for a valid Roblox window, else (None, reason)"""
+        hwnd = self.get_window_handle()
+        if not hwnd:
+            return None, "no valid Roblox window"
+        return hwnd, None
+
+    def _probe_on_screen(self) -> Tuple[Optional[dict], Optional[str]]:
+        """Screen-coordinate methods also need a visible, restored window"""
+        hwnd, reason = self._probe_window()
+        if reason:
+            return None, reason
+        info = self.windows.info(hwnd)
+        if info is None or info.rect is None:
+            return None, "window geometry unavailable"
+        if info.minimized:
+            return None, "window minimized"
+        return info.rect, None
+
+    def _probe_postmessage(self) -> Optional[str]:
+        hwnd, reason = self._probe_window()
+        if reason:
+            return reason
+        if not self.dispatcher.post(hwnd, self.WM_NULL, 0, 0, method=ClickMethod.POST_MESSAGE, probe=True):
+            return "message queue rejected WM_NULL"
+        return None
+
+    def _probe_sendmessage(self) -> Optional[str]:
+        hwnd, reason = self._probe_window()
+        if reason:
+            return reason
+        if not self.dispatcher.send(hwnd, self.WM_NULL, 0, 0, method=ClickMethod.SEND_MESSAGE, probe=True):
+            return "window did not answer WM_NULL in budget (hung?)"
+        return None
+
+    def _probe_directinput(self) -> Optional[str]:
+        method = ClickMethod.DIRECT_INPUT
+        if not self.backend.has_input(method):
+            return "PyDirectInput not available"
+        _, reason = self._probe_on_screen()
+        if reason:
+            return reason
+        if not self.dispatcher.call(method, self.backend.cursor_position, method, probe=True):
+            return "cursor query failed"
+        return None
+
+    def _probe_pyautogui(self) -> Optional[str]:
+        method = ClickMethod.PYAUTOGUI
+        if not self.backend.has_input(method):
+            return "pyautogui not available"
+        _, reason = self._probe_on_screen()
+        if reason:
+            return reason
+        if not self.dispatcher.call(method, self.backend.cursor_position, method, probe=True):
+            return "cursor query failed"
+
+        # Pre-resolve the activation target so the fallback skips the window search
+        self.activation_target = self._resolve_activation()
+        if not self.activation_target:
+            return "no window to activate"
+        return None
+
     # ========================================
     # UNIFIED CLICK INTERFACE
     # ========================================
 
-    def safe_click_roblox(self) -> bool:
+    def _plan_click(self) -> Optional[Tuple[int, int, bool]]:
         """
-        Unified click method with multi-method fallback system
-        Tries all available methods in priority order
+        Work out where and how to click this cycle
+
+        Returns (x, y, double_click) in client coordinates, or None
         """
         # Get click coordinates
         use_fixed = self.config.get('use_fixed_coordinates', True)
@@ -425,7 +579,7 @@ class AnimeVanguardsKeeperV2:
 
         if not window_rect:
             self.log_message("Could not get window info", "WARN")
-            return False
+            return None
 
         # Get base coordinates
         if use_fixed:
@@ -444,104 +598,186 @@ class AnimeVanguardsKeeperV2:
         self.log_message(f"🎯 Attempting click at ({x}, {y}), double={double_click}")
         self.log_message(f"   Humanization: ±{self.position_variance}px, delay={delay:.3f}s")
 
-        # Try each method in priority order
-        for method_name, method_func in self.click_methods:
+        return x, y, double_click
+
+    def usable_click_methods(self) -> list:
+        """click_methods in adaptive order, minus degraded ones and those the last probe found broken"""
+        funcs = dict(self.click_methods)
+        return [(name, funcs[name]) for name in self.selector.order(list(funcs))
+                if not self.dispatcher.is_degraded(name) and not self.prober.is_broken(name)]
+
+    def _snapshot_click(self, x: int, y: int):
+        """ROIs around the click point before the input (None without verification)"""
+        if not self.verifier.enabled:
+            return None
+        return self.verifier.before(self.get_window_rect(), x, y)
+
+    def _confirm_click(self, method_name: str, snapshot) -> bool:
+        """After the settle wait: did the game react? (an unknown verdict counts as yes)"""
+        if self.verifier.after(snapshot) is False:
+            self.log_message(f"👁️  {method_name.upper()} input sent but the game did not react "
+                             f"(score {self.verifier.stats['last_score']})", "WARN")
+            return False
+        return True
+
+    def _record_click_success(self, method_name: str, x: int, y: int, elapsed: float):
+        """Update statistics after a delivered click"""
+        self.stats['total_clicks'] += 1
+        self.stats['method_stats'][method_name] += 1
+        self.selector.record(method_name, True, elapsed)
+        self.stats['last_click'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.stats['status'] = 'active'
+
+        self.log_message(f"✅ Click SUCCESS using {method_name.upper()}")
+        self.log_message(f"   Position: ({x}, {y}), Time: {elapsed:.1f}ms")
+        dispatch = self.dispatcher.get_stats().get(method_name)
+        if dispatch and dispatch['p50_ms'] is not None:
+            self.log_message(f"   Dispatch latency: p50 {dispatch['p50_ms']}ms, p99 {dispatch['p99_ms']}ms")
+        self.log_message(f"   Total clicks: {self.stats['total_clicks']}")
+        self.log_message(f"   Method stats: {self.stats['method_stats']}")
+
+        # Save stats
+        self.save_stats()
+
+    def _record_click_failure(self, method_name: str, elapsed: float):
+        """Update statistics after a method failed to deliver a click"""
+        self.stats['method_failures'][method_name] += 1
+        self.selector.record(method_name, False, elapsed)
+
+    def _record_all_failed(self):
+        """Log that every click method failed"""
+        self.log_message("❌ ALL CLICK METHODS FAILED!", "ERROR")
+        self.log_message(f"   Failures: {self.stats['method_failures']}")
+
+    def safe_click_roblox(self) -> bool:
+        """
+        Unified click method with multi-method fallback system
+        Tries all available methods in priority order
+        """
+        plan = self._plan_click()
+        if not plan:
+            return False
+        x, y, double_click = plan
+
+        # Try each method in adaptive order, skipping degraded ones
+        for method_name, method_func in self.usable_click_methods():
+            start_time = time.time()
             try:
-                start_time = time.time()
+                snapshot = self._snapshot_click(x, y)
                 success = method_func(x, y, double_click)
                 elapsed = (time.time() - start_time) * 1000  # ms
 
-                if success:
-                    # Update statistics
-                    self.stats['total_clicks'] += 1
-                    self.stats['method_stats'][method_name] += 1
-                    self.stats['last_click'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    self.stats['status'] = 'active'
-
-                    self.log_message(f"✅ Click SUCCESS using {method_name.upper()}")
-                    self.log_message(f"   Position: ({x}, {y}), Time: {elapsed:.1f}ms")
-                    self.log_message(f"   Total clicks: {self.stats['total_clicks']}")
-                    self.log_message(f"   Method stats: {self.stats['method_stats']}")
-
-                    # Save stats
-                    self.save_stats()
+                if success and snapshot:
+                    # Give the game time to draw its reaction before comparing
+                    time.sleep(self.verifier.settle_seconds)
+                    success = self._confirm_click(method_name, snapshot)
 
+                if success:
+                    self._record_click_success(method_name, x, y, elapsed)
                     return True
                 else:
                     # Method failed, try next
-                    self.stats['method_failures'][method_name] += 1
+                    self._record_click_failure(method_name, elapsed)
                     self.log_message(f"⚠️  {method_name.upper()} failed, trying next method...")
 
             except Exception as e:
-                self.stats['method_failures'][method_name] += 1
+                self._record_click_failure(method_name, (time.time() - start_time) * 1000)
                 self.log_message(f"❌ {method_name.upper()} exception: {e}", "ERROR")
                 continue
 
         # All methods failed
-        self.log_message("❌ ALL CLICK METHODS FAILED!", "ERROR")
-        self.log_message(f"   Failures: {self.stats['method_failures']}")
+        self._record_all_failed()
         return False
 
     def save_stats(self):
         """Save statistics to file"""
-        stats_file = os.path.join(self.base_dir, "stats", "keeper_stats.json")
-        os.makedirs(os.path.dirname(stats_file), exist_ok=True)
+        self._write_stats(json.dumps(self.stats, indent=2))
+
+    def _write_stats(self, text: str):
+        filename = f"keeper_stats_{self.instance_name}.json" if self.instance_name else "keeper_stats.json"
+        stats_file = os.path.join(self.base_dir, "stats", filename)
 
         try:
+            os.makedirs(os.path.dirname(stats_file), exist_ok=True)
             with open(stats_file, 'w') as f:
-                json.dump(self.stats, f, indent=2)
+                f.write(text)
         except Exception as e:
             self.log_message(f"Failed to save stats: {e}", "ERROR")
 
     def get_stats(self) -> dict:
         """Get current statistics"""
-        return self.stats.copy()
+        stats = self.stats.copy()
+        stats['dispatch'] = self.dispatcher.get_stats()
+        stats['method_selector'] = self.selector.get_stats()
+        stats['method_probe'] = self.prober.get_stats()
+        if self.verifier.enabled:
+            stats['click_verification'] = self.verifier.get_stats()
+        if not self.hwnd:
+            stats['window_registry'] = self.windows.get_stats()
+        return stats
 
     # ========================================
     # KEEPER MAIN LOOP
     # ========================================
 
-    def keeper_loop(self):
-        """Main keeper loop"""
-        self.log_message("🚀 Keeper loop started")
-        self.stats['status'] = 'running'
-        self.stats['start_time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def _click_interval(self) -> float:
+        """Click interval in seconds"""
+        return self.config.get('click_interval_minutes', 18) * 60
 
-        click_interval = self.config.get('click_interval_minutes', 18) * 60  # Convert to seconds
+    def keeper_tick(self) -> float:
+        """
+        One keeper cycle, run by the scheduler when the click is due
 
-        while self.running:
-            try:
-                # Check if paused
-                if self.paused:
-                    time.sleep(1)
-                    continue
-
-                # Check if Roblox is still running
-                if not self.is_roblox_running():
-                    self.log_message("⚠️  Roblox not running!", "WARN")
-                    self.stats['status'] = 'warning'
-                    time.sleep(5)
-                    continue
-
-                # Perform AFK prevention click
-                self.log_message(f"⏰ Click interval reached ({click_interval}s)")
-                success = self.safe_click_roblox()
+        Returns the delay until the next cycle
+        """
+        click_interval = self._click_interval()
 
-                if success:
-                    self.log_message(f"✅ AFK prevention successful")
-                else:
-                    self.log_message(f"❌ AFK prevention failed", "ERROR")
+        try:
+            # Check if Roblox is still running
+            if not self.is_roblox_running():
+                self.log_message("⚠️  Roblox not running!", "WARN")
+                self.stats['status'] = 'warning'
+                return 5
+
+            # Perform AFK prevention click
+            self.log_message(f"⏰ Click interval reached ({click_interval}s)")
+            success = self.safe_click_roblox()
+
+            if success:
+                self.log_message(f"✅ AFK prevention successful")
+            else:
+                self.log_message(f"❌ AFK prevention failed", "ERROR")
 
-                # Wait for next interval
-                self.log_message(f"⏳ Next click in {click_interval} seconds ({click_interval/60:.1f} minutes)")
-                time.sleep(click_interval)
+            self.log_message(f"⏳ Next click in {click_interval} seconds ({click_interval/60:.1f} minutes)")
+            return click_interval
 
-            except Exception as e:
-                self.log_message(f"Error in keeper loop: {e}", "ERROR")
-                time.sleep(10)
+        except Exception as e:
+            self.log_message(f"Error in keeper loop: {e}", "ERROR")
+            return 10
 
-        self.log_message("🛑 Keeper loop stopped")
-        self.stats['status'] = 'stopped'
+    def reload_config(self):
+        """Reload config from disk and apply it without restarting"""
+        self._apply_config(self.load_config())
+
+        # Wakes the scheduler, so a shorter interval applies right away
+        self.scheduler.reschedule('click', self._click_interval())
+        self.log_message("🔁 Configuration reloaded")
+
+    def _apply_config(self, config: dict):
+        """Re-derive config-dependent settings"""
+        self.config = config
+        self.click_methods = self._get_click_method_priority()
+        self.humanization = self.config.get('humanization', {})
+        self.position_variance = self.humanization.get('position_variance', 10)
+        self.timing_variance = self.humanization.get('timing_variance', 0.05)
+        self.double_click_chance = self.humanization.get('double_click_chance', 0.3)
+        self.windows.configure(self.config)
+        self.dispatcher.configure(self.config)
+        self.selector.configure(self.config, [name for name, _ in self.click_methods])
+        self.prober.configure(self.config, self._probe_checks())
+        self.verifier.configure(self.config)
+        if self.owns_backend:
+            self.backend.configure_capture(self.config)
 
     def start(self) -> bool:
         """Start the keeper"""
@@ -554,14 +790,27 @@ class AnimeVanguardsKeeperV2:
             return False
 
         self.running = True
-        self.keeper_thread = threading.Thread(target=self.keeper_loop, daemon=True)
-        self.keeper_thread.start()
+        self.paused = False
+        self.stats['status'] = 'running'
+        self.stats['start_time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+        self.scheduler = DeadlineScheduler(log_callback=self.log_message)
+        self.scheduler.schedule('click', self._click_interval(), self.keeper_tick, first_delay=0)
+        self.scheduler.schedule('probe', self.prober.interval, self.prober.probe, first_delay=0)
+        self.scheduler.start(name="keeper-v2")
+        self.keeper_thread = self.scheduler.thread
+        self._start_process_watcher()
+
+        self.log_message("🚀 Keeper loop started")
         return True
 
     def pause(self) -> bool:
         """Toggle pause state"""
         self.paused = not self.paused
+        if self.paused:
+            self.scheduler.pause()
+        else:
+            self.scheduler.resume()
         self.stats['status'] = 'paused' if self.paused else 'running'
         return self.paused
 
@@ -571,8 +820,16 @@ class AnimeVanguardsKeeperV2:
             return False
 
         self.running = False
-        if self.keeper_thread:
-            self.keeper_thread.join(timeout=5)
+        self.scheduler.stop()
+        self._stop_process_watcher()
+        self.close()
 
+        self.log_message("🛑 Keeper loop stopped")
         self.stats['status'] = 'stopped'
         return True
+
+    def close(self):
+        """Release this keeper's input workers and its window's capture surface"""
+        self.dispatcher.close()
+        if self.hwnd:
+            self.backend.capture.release(self.hwnd)
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Anime Vanguards Keeper - Fleet Mode
+
+Drives every Roblox client on this host from one process:
+- One EnumWindows pass per rediscovery finds all Roblox windows, and
+  refreshes the window registry every keeper reads handles/rects from
+- One process watcher (exit events, no periodic scans) serves all windows
+- One deadline scheduler thread services every window's click timer
+- Each window keeps its own V2 keeper (stats, method order, calibration)
+- Capture is configured once, from the shared config: background_capture
+  applies to every window and cannot be overridden per window
+
+A per-window keeper is just a few dicts and bound methods, so each extra
+client adds well under 1 MB on top of the shared process.
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Optional, Callable
+
+from keeper_backends import KeeperBackend, default_backend
+from keeper_engine_v2 import AnimeVanguardsKeeperV2
+from keeper_scheduler import DeadlineScheduler
+from process_watcher import watch_process
+from window_registry import shared_registry
+
+
+class KeeperFleet:
+    """
+    Manages one AnimeVanguardsKeeperV2 per Roblox window
+    """
+
+    keeper_class = AnimeVanguardsKeeperV2
+
+    def __init__(self, base_dir: str, config_path: str, log_callback: Optional[Callable] = None,
+                 backend: Optional[KeeperBackend] = None):
+        """Initialize fleet with the shared configuration"""
+        self.base_dir = base_dir
+        self.backend = backend or default_backend()
+        self.config_path = config_path
+        self.log_callback = log_callback
+
+        # Shared configuration (read once, cloned per window)
+        self.config = self.load_config()
+        fleet_config = self.config.get('fleet', {})
+        self.rediscover_interval = fleet_config.get('rediscover_interval_seconds', 30)
+        self.stagger_seconds = fleet_config.get('stagger_seconds', 5)
+        self.window_overrides = fleet_config.get('window_overrides', {})
+        self.click_interval = self.config.get('click_interval_minutes', 18) * 60
+
+        # Per-window state (each window's click timer is a scheduler task)
+        self.keepers = {}          # hwnd -> AnimeVanguardsKeeperV2
+        self.slots = {}            # hwnd -> stable slot number
+        self._next_slot = 1
+
+        # Fleet statistics
+        self.stats = {
+            'status': 'stopped',
+            'start_time': None,
+            'windows': 0,
+            'windows_lost': 0,
+            'total_clicks': 0
+        }
+
+        # Threading
+        self.running = False
+        self.paused = False
+        self.fleet_thread = None
+        self.scheduler = DeadlineScheduler(log_callback=self.log_message)
+        self._lock = threading.Lock()
+        self.process_watcher = None
+        self.windows = shared_registry(self.config, self.backend)
+
+        # One capture for every window (keepers built with our backend leave it alone)
+        self.backend.configure_capture(self.config)
+
+    def load_config(self) -> dict:
+        """Load configuration from JSON file"""
+        try:
+            with open(self.config_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            self.log_message(f"Config not found: {self.config_path}", "ERROR")
+            return {}
+        except json.JSONDecodeError as e:
+            self.log_message(f"Invalid JSON in config: {e}", "ERROR")
+            return {}
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    # ========================================
+    # WINDOW DISCOVERY
+    # ========================================
+
+    def _window_config(self, slot: int) -> dict:
+        """
+        Build the config for one window
+
+        window_overrides entries are keyed by slot number ("1", "2", ...)
+        and are merged over the shared config, so each client can carry
+        its own fixed_coordinates calibration or click_method_priority.
+        """
+        override = self.window_overrides.get(str(slot))
+        if not override:
+            return self.config
+        if 'background_capture' in override:
+            self.log_message(f"Window {slot}: background_capture is fleet-wide, override ignored", "WARN")
+
+        window_config = copy.deepcopy(self.config)
+        for key, value in override.items():
+            if isinstance(value, dict) and isinstance(window_config.get(key), dict):
+                window_config[key].update(value)
+            else:
+                window_config[key] = value
+        return window_config
+
+    def discover_windows(self) -> int:
+        """
+        Enumerate Roblox windows once and sync the keeper set
+
+        Returns the number of windows now managed
+        """
+        handles = self.windows.enumerate()
+
+        with self._lock:
+            # Drop keepers whose window disappeared
+            for hwnd in [h for h in self.keepers if h not in handles]:
+                self.log_message(f"⚠️  Window {self.slots[hwnd]} (hwnd={hwnd}) disappeared", "WARN")
+                self._unwatch_window(hwnd)
+                del self.keepers[hwnd]
+                del self.slots[hwnd]
+                self.stats['windows_lost'] += 1
+
+            # Add keepers for new windows, staggering their first click
+            for hwnd in handles:
+                if hwnd in self.keepers:
+                    continue
+
+                slot = self._next_slot
+                self._next_slot += 1
+
+                keeper = self.keeper_class(
+                    self.base_dir,
+                    self.config_path,
+                    log_callback=self.log_callback,
+                    hwnd=hwnd,
+                    config=self._window_config(slot),
+                    instance_name=f"win{slot}",
+                    backend=self.backend
+                )
+                keeper.running = True
+                keeper.stats['status'] = 'running'
+                keeper.stats['start_time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+                self.keepers[hwnd] = keeper
+                self.slots[hwnd] = slot
+                self._watch_window(hwnd, keeper, self.stagger_seconds * len(self.keepers))
+                self.log_message(f"🪟 Managing window {slot} (hwnd={hwnd})")
+
+            self.stats['windows'] = len(self.keepers)
+            return len(self.keepers)
+
+    # ========================================
+    # SCHEDULED TASKS
+    # ========================================
+
+    def _watch_window(self, hwnd: int, keeper: AnimeVanguardsKeeperV2, first_delay: float):
+        """Start servicing a newly discovered window"""
+        self.scheduler.schedule(
+            f"click:{hwnd}",
+            self.click_interval,
+            lambda: self._click_window(hwnd),
+            first_delay=first_delay
+        )
+        self.scheduler.schedule(f"probe:{hwnd}", keeper.prober.interval, keeper.prober.probe, first_delay=0)
+
+    def _unwatch_window(self, hwnd: int):
+        """Stop servicing a window that disappeared and release its keeper"""
+        self.scheduler.cancel(f"click:{hwnd}")
+        self.scheduler.cancel(f"probe:{hwnd}")
+        keeper = self.keepers.get(hwnd)
+        if keeper:
+            keeper.running = False
+            keeper.stats['status'] = 'stopped'
+            keeper.save_stats()
+            keeper.close()
+
+    def _click_window(self, hwnd: int):
+        """Scheduler task: AFK click for one window"""
+        keeper = self.keepers.get(hwnd)
+        if keeper and keeper.safe_click_roblox():
+            self.stats['total_clicks'] += 1
+
+    def _discovery_tick(self):
+        """Scheduler task: shared process check and window rediscovery"""
+        if not self._roblox_running():
+            self.log_message("⚠️  Roblox not running!", "WARN")
+            self.stats['status'] = 'warning'
+        else:
+            self.stats['status'] = 'running'
+        # Also without Roblox: windows of exited clients are dropped
+        self.discover_windows()
+
+    def _roblox_running(self) -> bool:
+        """Shared by the whole fleet: the watcher's PID set, else one process-table scan"""
+        if self.process_watcher:
+            return self.process_watcher.running
+        process_name = self.config.get('roblox_process_name', 'RobloxPlayerBeta.exe')
+        return bool(self.backend.process_ids(process_name))
+
+    def _start_process_watcher(self):
+        if not self.backend.watchable:
+            return
+        process_name = self.config.get('roblox_process_name', 'RobloxPlayerBeta.exe')
+        self.process_watcher = watch_process(process_name, self.config, on_exit=self._on_roblox_exit,
+                                             log_callback=self.log_message)
+
+    def _stop_process_watcher(self):
+        if self.process_watcher:
+            self.process_watcher.stop()
+            self.process_watcher = None
+
+    def _on_roblox_exit(self, pid: int, remaining: int):
+        """Process watcher: a client exited - rediscover windows now (watcher thread)"""
+        self.log_message(f"⚡ Roblox process {pid} exited ({remaining} still running)", "WARN")
+        if self.running:
+            self.scheduler.reschedule('discover', delay=0)
+
+    def start(self) -> bool:
+        """Start the fleet"""
+        if self.running:
+            self.log_message("Fleet already running", "WARN")
+            return False
+
+        self.running = True
+        self.paused = False
+        self.stats['status'] = 'running'
+        self.stats['start_time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        self.scheduler.schedule('discover', self.rediscover_interval, self._discovery_tick, first_delay=0)
+        self._start_process_watcher()
+        self.scheduler.start(name="keeper-fleet")
+        self.fleet_thread = self.scheduler.thread
+
+        self.log_message("🚀 Fleet started")
+        return True
+
+    def pause(self) -> bool:
+        """Toggle pause state for every window"""
+        self.paused = not self.paused
+        if self.paused:
+            self.scheduler.pause()
+        else:
+            self.scheduler.resume()
+
+        self.stats['status'] = 'paused' if self.paused else 'running'
+        for keeper in list(self.keepers.values()):
+            keeper.paused = self.paused
+            keeper.stats['status'] = self.stats['status']
+        return self.paused
+
+    def stop(self) -> bool:
+        """Stop the fleet"""
+        if not self.running:
+            return False
+
+        self.running = False
+        self.scheduler.stop()
+        self._stop_process_watcher()
+        self.log_message("🛑 Fleet stopped")
+
+        for keeper in list(self.keepers.values()):
+            keeper.running = False
+            keeper.stats['status'] = 'stopped'
+            keeper.save_stats()
+            keeper.close()
+
+        self.stats['status'] = 'stopped'
+        return True
+
+    def get_stats(self) -> dict:
+        """Get fleet statistics plus a per-window breakdown"""
+        stats = self.stats.copy()
+        stats['window_registry'] = self.windows.get_stats()
+        with self._lock:
+            stats['per_window'] = {
+                f"win{self.slots[hwnd]}": keeper.get_stats()
+                for hwnd, keeper in self.keepers.items()
+            }
+        return stats
+
+
+def main():
+    """Run the fleet headless from the console"""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config_path = os.path.join(base_dir, "config", "config_v2.json")
+
+    fleet = KeeperFleet(base_dir, config_path)
+    fleet.start()
+
+    try:
+        while fleet.running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        fleet.stop()
+        print(json.dumps(fleet.get_stats(), indent=2))
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
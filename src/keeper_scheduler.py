@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Deadline Scheduler for the keeper engines
+
+Replaces the "wake every second and compare last_* timestamps" loops:
+- Tasks live in a heap ordered by their next deadline
+- The scheduler thread sleeps on a condition variable until the
+  earliest deadline, so an idle keeper costs no CPU at all
+- pause/resume/stop/reschedule notify the condition and take
+  effect immediately instead of after the current sleep
+- Thousands of tasks (many windows x several timers) cost O(log n)
+  per run, never a scan over all timers
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Callable, Tuple
+
+
+class ScheduledTask:
+    """One repeating (or one-shot) task"""
+
+    __slots__ = ('name', 'interval', 'callback', 'due', 'generation', 'cancelled')
+
+    def __init__(self, name: str, interval: Optional[float], callback: Callable, due: float):
+        self.name = name
+        self.interval = interval      # None = one-shot
+        self.callback = callback
+        self.due = due                # time.monotonic() deadline
+        self.generation = 0           # bumped on reschedule to invalidate heap entries
+        self.cancelled = False
+
+
+class DeadlineScheduler:
+    """
+    Heap-based scheduler that sleeps until the next due task
+
+    A task callback may return a number to override its next delay
+    (e.g. retry sooner after a failure); otherwise it is re-armed
+    interval seconds after it finished.
+    """
+
+    def __init__(self, log_callback: Optional[Callable] = None):
+        self.log_callback = log_callback
+
+        self._heap = []
+        self._tasks = {}                  # name -> ScheduledTask
+        self._seq = itertools.count()     # heap tie-breaker
+        self._cond = threading.Condition()
+
+        self.running = False
+        self.paused = False
+        self.thread = None
+
+        self.stats = {
+            'tasks_run': 0,
+            'task_errors': 0,
+            'wakeups': 0
+        }
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    # ========================================
+    # TASK MANAGEMENT
+    # ========================================
+
+    def _push(self, task: ScheduledTask):
+        heapq.heappush(self._heap, (task.due, next(self._seq), task.generation, task))
+
+    def schedule(self, name: str, interval: Optional[float], callback: Callable,
+                 first_delay: Optional[float] = None) -> ScheduledTask:
+        """
+        Add (or replace) a task
+
+        first_delay defaults to interval; pass 0 to run on the next wakeup.
+        """
+        delay = interval if first_delay is None else first_delay
+        with self._cond:
+            old = self._tasks.get(name)
+            if old:
+                old.cancelled = True
+
+            task = ScheduledTask(name, interval, callback, time.monotonic() + (delay or 0))
+            self._tasks[name] = task
+            self._push(task)
+            self._cond.notify()
+            return task
+
+    def reschedule(self, name: str, interval: Optional[float] = None,
+                   delay: Optional[float] = None) -> bool:
+        """
+        Change a task's interval and/or next deadline (config change)
+
+        Without delay the next deadline keeps the time already elapsed
+        since the task last ran, measured against the new interval.
+        """
+        with self._cond:
+            task = self._tasks.get(name)
+            if not task:
+                return False
+
+            now = time.monotonic()
+            if interval is not None:
+                if delay is None and task.interval is not None:
+                    last_run = task.due - task.interval
+                    delay = max(0.0, last_run + interval - now)
+                task.interval = interval
+
+            if delay is not None:
+                task.due = now + delay
+                task.generation += 1
+                self._push(task)
+
+            self._cond.notify()
+            return True
+
+    def cancel(self, name: str) -> bool:
+        """Remove a task (its heap entry is discarded lazily)"""
+        with self._cond:
+            task = self._tasks.pop(name, None)
+            if not task:
+                return False
+            task.cancelled = True
+            self._cond.notify()
+            return True
+
+    def has_task(self, name: str) -> bool:
+        """Check if a task is scheduled"""
+        with self._cond:
+            return name in self._tasks
+
+    def time_until(self, name: str) -> Optional[float]:
+        """Seconds until a task is next due (None if unknown)"""
+        with self._cond:
+            task = self._tasks.get(name)
+            if not task:
+                return None
+            return max(0.0, task.due - time.monotonic())
+
+    # ========================================
+    # CONTROL
+    # ========================================
+
+    def wake(self):
+        """Wake the scheduler so it re-evaluates its state now"""
+        with self._cond:
+            self._cond.notify()
+
+    def pause(self):
+        """Stop running tasks until resume()"""
+        with self._cond:
+            self.paused = True
+            self._cond.notify()
+
+    def resume(self):
+        """Resume running tasks (overdue ones fire immediately)"""
+        with self._cond:
+            self.paused = False
+            self._cond.notify()
+
+    def stop(self, timeout: float = 5):
+        """Stop the scheduler and wait for its thread"""
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+
+    def start(self, name: str = "keeper-scheduler") -> bool:
+        """Run the scheduler on a daemon thread"""
+        if self.running:
+            return False
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run_loop, name=name, daemon=True)
+        self.thread.start()
+        return True
+
+    # ========================================
+    # MAIN LOOP
+    # ========================================
+
+    def _next_due_task(self) -> Tuple[Optional[ScheduledTask], int]:
+        """Block until a task is due: (task, its generation), or (None, 0) when stopped"""
+        with self._cond:
+            while self.running:
+                if self.paused:
+                    self._cond.wait()
+                    self.stats['wakeups'] += 1
+                    continue
+
+                # Discard stale entries (cancelled or rescheduled)
+                while self._heap:
+                    due, _, generation, task = self._heap[0]
+                    if task.cancelled or generation != task.generation:
+                        heapq.heappop(self._heap)
+                        continue
+                    break
+
+                if not self._heap:
+                    self._cond.wait()
+                    self.stats['wakeups'] += 1
+                    continue
+
+                due, _, _, task = self._heap[0]
+                remaining = due - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    self.stats['wakeups'] += 1
+                    continue
+
+                heapq.heappop(self._heap)
+                return task, task.generation
+
+            return None, 0
+
+    def run(self):
+        """Run tasks on the calling thread until stop() is called"""
+        self.running = True
+        self._run_loop()
+
+    def _run_loop(self):
+        """Run tasks as they fall due until stopped"""
+        while True:
+            task, generation = self._next_due_task()
+            if task is None:
+                break
+
+            next_delay = None
+            try:
+                next_delay = task.callback()
+                self.stats['tasks_run'] += 1
+            except Exception as e:
+                self.stats['task_errors'] += 1
+                self.log_message(f"Scheduled task '{task.name}' failed: {e}", "ERROR")
+
+            with self._cond:
+                if task.cancelled or self._tasks.get(task.name) is not task:
+                    continue
+
+                if isinstance(next_delay, (int, float)) and not isinstance(next_delay, bool):
+                    delay = next_delay
+                elif task.interval is not None:
+                    delay = task.interval
+                else:
+                    self._tasks.pop(task.name, None)
+                    continue
+
+                due = time.monotonic() + delay
+                if task.generation != generation and task.due <= due:
+                    # Rescheduled while it ran (e.g. reschedule(name, delay=0) from
+                    # another thread): that earlier deadline stands
+                    continue
+
+                task.due = due
+                task.generation += 1
+                self._push(task)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Liveness Monitor - catch a frozen client that is still "running"
+
+monitor_roblox_status only checked that RobloxPlayerBeta.exe exists,
+so a hung client (or a frozen picture) passed as healthy for hours.
+LivenessMonitor samples the window every few seconds:
+- each sample is reduced to an 80x45 grayscale thumbnail and kept in
+  a fixed ring buffer (one preallocated uint8 array)
+- frame-to-frame change is the fraction of thumbnail pixels whose
+  absolute difference exceeds pixel_delta
+- once nothing has moved for stall_seconds, the newest thumbnail is
+  diffed against the whole buffer in one vectorized pass; only if it
+  matches every buffered frame is the client flagged as stalled (slow
+  drift below the per-sample threshold does not count as frozen)
+Samples are only taken while the capture can see the window: in the
+foreground, or at any time with background_capture (PrintWindow) on,
+which is what a client left AFK behind other windows needs. A gap
+between samples restarts the observation instead of counting as
+stillness.
+
+Config:
+    "liveness": {
+        "enabled": true,
+        "sample_interval_seconds": 10,
+        "stall_seconds": 300,
+        "pixel_delta": 8,
+        "min_changed_fraction": 0.001
+    }
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from frame_analysis import FrameAnalysis
+
+# Thumbnail size (width, height)
+THUMB_SIZE = (80, 45)
+
+# Ring buffer never grows beyond this many thumbnails
+MAX_BUFFER = 64
+
+
+class LivenessMonitor:
+    """Ring buffer of thumbnails + absdiff change tracking"""
+
+    def __init__(self, config: dict, log_callback: Optional[Callable] = None):
+        self.log_callback = log_callback
+
+        self.stats = {
+            'samples': 0,
+            'gaps': 0,
+            'stalls': 0,
+            'last_change': 0.0,
+            'sample_ms': 0.0
+        }
+
+        self.configure(config)
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    def configure(self, config: dict):
+        """(Re)read settings; resizes the ring buffer and starts over"""
+        settings = config.get('liveness', {})
+        self.enabled = settings.get('enabled', True)
+        self.sample_interval = settings.get('sample_interval_seconds', 10)
+        self.stall_seconds = settings.get('stall_seconds', 300)
+        self.pixel_delta = settings.get('pixel_delta', 8)
+        self.min_changed_fraction = settings.get('min_changed_fraction', 0.001)
+
+        size = int(min(MAX_BUFFER, max(2, self.stall_seconds / max(0.1, self.sample_interval) + 1)))
+        self._buffer = np.zeros((size, THUMB_SIZE[1], THUMB_SIZE[0]), dtype=np.uint8)
+        self._times = np.zeros(size, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        """Forget all samples (after a relaunch, or a gap in observation)"""
+        self._count = 0
+        self._next = 0
+        self.last_sample = None
+        self.last_motion = None
+        self.stalled = False
+
+    def sample(self, frame) -> float:
+        """Add a capture; returns the fraction of pixels that changed"""
+        if not self.enabled:
+            return 0.0
+
+        start = time.perf_counter()
+        now = time.monotonic()
+
+        # A gap (window hidden, keeper paused) breaks the chain of samples
+        if self.last_sample is not None and now - self.last_sample > 3 * self.sample_interval:
+            self.stats['gaps'] += 1
+            self.reset()
+
+        thumb = cv2.resize(FrameAnalysis.of(frame).gray, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+
+        changed = 1.0
+        if self._count:
+            previous = self._buffer[(self._next - 1) % len(self._buffer)]
+            diff = cv2.absdiff(thumb, previous)
+            changed = float(np.count_nonzero(diff > self.pixel_delta)) / diff.size
+
+        self._buffer[self._next] = thumb
+        self._times[self._next] = now
+        self._next = (self._next + 1) % len(self._buffer)
+        self._count = min(self._count + 1, len(self._buffer))
+        self.last_sample = now
+
+        if changed >= self.min_changed_fraction or self.last_motion is None:
+            self.last_motion = now
+            if self.stalled:
+                self.log_message("▶️  Client picture is moving again", "INFO")
+            self.stalled = False
+        elif not self.stalled and now - self.last_motion >= self.stall_seconds and self._static_window(thumb, now):
+            self.stalled = True
+            self.stats['stalls'] += 1
+            self.log_message(f"🧊 Client picture unchanged for {now - self.last_motion:.0f}s", "WARN")
+
+        self.stats['samples'] += 1
+        self.stats['last_change'] = round(changed, 4)
+        self.stats['sample_ms'] = (time.perf_counter() - start) * 1000
+        return changed
+
+    def _static_window(self, thumb: np.ndarray, now: float) -> bool:
+        """Newest thumbnail vs every buffered one from the stall window, in one pass"""
+        recent = self._times[:self._count] >= now - self.stall_seconds
+        frames = self._buffer[:self._count][recent]
+        diff = np.abs(frames.astype(np.int16) - thumb.astype(np.int16)) > self.pixel_delta
+        changed = diff.reshape(len(frames), -1).mean(axis=1)
+        return bool(changed.max() < self.min_changed_fraction)
+
+    def is_stalled(self) -> bool:
+        return self.enabled and self.stalled
+
+    def still_seconds(self) -> float:
+        """Seconds since the picture last changed (0 when unknown)"""
+        if self.last_motion is None:
+            return 0.0
+        return self.last_sample - self.last_motion
+
+    def get_stats(self) -> dict:
+        stats = self.stats.copy()
+        stats['stalled'] = self.is_stalled()
+        stats['still_seconds'] = round(self.still_seconds(), 1)
+        stats['buffered'] = self._count
+        return stats
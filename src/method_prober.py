@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Method Prober - background health checks for click methods
+
+safe_click_roblox only found out that a method was broken at click
+time, then fell through the list one method (and one set of sleeps)
+at a time. MethodProber runs a health check per click method on the
+keeper's scheduler, every interval_seconds, without sending input:
+- handle validity (the registry's IsWindow check)
+- the method's module is importable (PyDirectInput, pyautogui)
+- a dry-run dispatch through the InputDispatcher: WM_NULL for
+  PostMessage / SendMessage (a hung window fails SendMessageTimeout),
+  a cursor-position query for DirectInput / pyautogui; these are
+  recorded under "probe:<method>", apart from the click figures
+Each check also pre-resolves what its method needs at click time
+(the pyautogui activation target), so a fallback click skips lookups.
+usable_click_methods() skips methods whose last probe failed, as long
+as that result is younger than max_age_seconds.
+
+Config:
+    "method_probe": {
+        "enabled": true,
+        "interval_seconds": 30,
+        "max_age_seconds": 90
+    }
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+
+class MethodProber:
+    """Runs per-method health checks and remembers which methods are broken"""
+
+    def __init__(self, checks: Dict[str, Callable[[], Optional[str]]], config: dict,
+                 log_callback: Optional[Callable] = None):
+        """
+        checks maps method name -> check(); a check returns None when the
+        method is usable, otherwise the reason it is not.
+        """
+        self.checks = dict(checks)
+        self.log_callback = log_callback
+        self.results: Dict[str, dict] = {}
+
+        self.stats = {
+            'probes': 0,
+            'skips': 0,
+            'probe_ms': 0.0
+        }
+
+        self.configure(config)
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    def configure(self, config: dict, checks: Optional[Dict[str, Callable]] = None):
+        """(Re)read settings; checks replaces the set of probed methods"""
+        settings = config.get('method_probe', {})
+        self.enabled = settings.get('enabled', True)
+        self.interval = settings.get('interval_seconds', 30)
+        self.max_age = settings.get('max_age_seconds', 90)
+        if checks is not None:
+            self.checks = dict(checks)
+            self.results = {name: result for name, result in self.results.items() if name in self.checks}
+
+    def probe(self) -> float:
+        """Scheduler task: check every method once; returns the delay until the next probe"""
+        if not self.enabled:
+            return self.interval
+
+        start = time.perf_counter()
+        for name, check in list(self.checks.items()):
+            try:
+                reason = check()
+            except Exception as e:
+                reason = f"probe raised {e}"
+
+            previous = self.results.get(name)
+            if reason and (previous is None or previous['reason'] != reason):
+                self.log_message(f"🩺 {name.upper()} unusable: {reason}", "WARN")
+            elif not reason and previous and previous['reason']:
+                self.log_message(f"🩺 {name.upper()} healthy again", "INFO")
+
+            self.results[name] = {'reason': reason, 'at': time.monotonic()}
+
+        self.stats['probes'] += 1
+        self.stats['probe_ms'] = (time.perf_counter() - start) * 1000
+        return self.interval
+
+    def is_broken(self, name: str) -> bool:
+        """Did the last probe (if recent enough) find this method unusable?"""
+        if not self.enabled:
+            return False
+        result = self.results.get(name)
+        if not result or not result['reason'] or time.monotonic() - result['at'] > self.max_age:
+            return False
+        self.stats['skips'] += 1
+        return True
+
+    def get_stats(self) -> dict:
+        stats = self.stats.copy()
+        now = time.monotonic()
+        stats['methods'] = {
+            name: {'healthy': not result['reason'], 'reason': result['reason'],
+                   'age_seconds': round(now - result['at'], 1)}
+            for name, result in self.results.items()
+        }
+        return stats
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Method Selector - adaptive click-method order per window
+
+_get_click_method_priority fixed the order at startup and the numbers
+safe_click_roblox collected (method_stats, method_failures, elapsed)
+were never used. MethodSelector keeps, per method, decayed success and
+failure counts plus a latency EWMA, and orders methods by expected
+time to a delivered click:
+
+    expected_ms = latency_ms + (1 - p_success) * failure_penalty_ms
+
+with p_success = (successes + 1) / (successes + failures + 2). Counts
+decay on every update, so a client whose behaviour changes (a method
+starts failing after an update) is re-ranked within a few clicks.
+Unmeasured methods start at p = 0.5, zero latency; ties keep the
+configured order. With probability explore_rate a click starts with
+another method instead (an exploration probe), so rankings of methods
+that are not currently first stay fresh. Methods listed in
+explore_exclude are never probed: by default every screen-input method
+(directinput and pyautogui move the real cursor, pyautogui also steals
+focus), so only window-message methods are explored unless the user
+opts the others in.
+
+Each V2 keeper (one per window in fleet mode) has its own selector.
+
+Config:
+    "click_method_selector": {
+        "enabled": true,
+        "decay": 0.95,
+        "latency_alpha": 0.3,
+        "failure_penalty_ms": 2000,
+        "explore_rate": 0.05,
+        "explore_exclude": ["directinput", "pyautogui"]
+    }
+"""
+
+import random
+from typing import Dict, List, Optional
+
+
+class MethodScore:
+    """Decayed outcome counts and latency of one method"""
+
+    __slots__ = ('successes', 'failures', 'latency_ms', 'attempts')
+
+    def __init__(self):
+        self.successes = 0.0
+        self.failures = 0.0
+        self.latency_ms = None
+        self.attempts = 0
+
+    @property
+    def p_success(self) -> float:
+        return (self.successes + 1.0) / (self.successes + self.failures + 2.0)
+
+
+class MethodSelector:
+    """Orders click methods by expected time to a successful click"""
+
+    def __init__(self, methods: List[str], config: dict, rng: Optional[random.Random] = None):
+        self.methods = list(methods)
+        self.scores: Dict[str, MethodScore] = {}
+        self.rng = rng or random.Random()
+        self.last_order = list(self.methods)
+
+        self.stats = {
+            'orders': 0,
+            'explorations': 0,
+            'reorders': 0
+        }
+
+        self.configure(config)
+
+    def configure(self, config: dict, methods: Optional[List[str]] = None):
+        """(Re)read settings; methods replaces the configured order"""
+        settings = config.get('click_method_selector', {})
+        self.enabled = settings.get('enabled', True)
+        self.decay = settings.get('decay', 0.95)
+        self.latency_alpha = settings.get('latency_alpha', 0.3)
+        self.failure_penalty_ms = settings.get('failure_penalty_ms', 2000)
+        self.explore_rate = settings.get('explore_rate', 0.05)
+        self.explore_exclude = set(settings.get('explore_exclude', ['directinput', 'pyautogui']))
+        if methods is not None:
+            self.methods = list(methods)
+
+    def _score(self, method: str) -> MethodScore:
+        score = self.scores.get(method)
+        if score is None:
+            score = MethodScore()
+            self.scores[method] = score
+        return score
+
+    def expected_ms(self, method: str) -> float:
+        score = self._score(method)
+        return (score.latency_ms or 0.0) + (1.0 - score.p_success) * self.failure_penalty_ms
+
+    def record(self, method: str, success: bool, latency_ms: float):
+        """Outcome of one attempt with this method"""
+        score = self._score(method)
+        score.attempts += 1
+        score.successes = score.successes * self.decay + (1.0 if success else 0.0)
+        score.failures = score.failures * self.decay + (0.0 if success else 1.0)
+        if success:
+            # Failed attempts often return early; only delivered clicks say how fast a method is
+            score.latency_ms = latency_ms if score.latency_ms is None else \
+                self.latency_alpha * latency_ms + (1 - self.latency_alpha) * score.latency_ms
+
+    def order(self, methods: Optional[List[str]] = None) -> List[str]:
+        """Methods to try this click, most promising first (maybe one exploration probe)"""
+        methods = list(self.methods if methods is None else methods)
+        if not self.enabled or len(methods) < 2:
+            return methods
+
+        self.stats['orders'] += 1
+        rank = {name: index for index, name in enumerate(methods)}
+        ordered = sorted(methods, key=lambda name: (round(self.expected_ms(name), 3), rank[name]))
+
+        if ordered != self.last_order:
+            self.stats['reorders'] += 1
+            self.last_order = list(ordered)
+
+        candidates = [name for name in ordered[1:] if name not in self.explore_exclude]
+        if candidates and self.rng.random() < self.explore_rate:
+            probe = self.rng.choice(candidates)
+            self.stats['explorations'] += 1
+            return [probe] + [name for name in ordered if name != probe]
+
+        return ordered
+
+    def get_stats(self) -> dict:
+        stats = self.stats.copy()
+        stats['order'] = list(self.last_order)
+        stats['methods'] = {
+            name: {
+                'attempts': score.attempts,
+                'p_success': round(score.p_success, 3),
+                'latency_ms': round(score.latency_ms, 2) if score.latency_ms is not None else None,
+                'expected_ms': round(self.expected_ms(name), 1)
+            }
+            for name, score in self.scores.items()
+        }
+        return stats
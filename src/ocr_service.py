@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+OCR Service - long-lived Tesseract workers with batching and a result cache
+
+detect_with_ocr used to call pytesseract.image_to_data on the whole
+equalized frame: a fresh tesseract process plus temp image files per
+call, hundreds of ms to seconds each time. This service:
+- Uses in-process tesserocr bindings when installed: a fixed pool of
+  PyTessBaseAPI workers, each initialised (language data loaded) once
+  and fed raw pixel buffers; recognition releases the GIL
+- Otherwise falls back to the tesseract CLI over pipes: the crops of
+  one batch are stacked into a single page, sent as PNG on stdin and
+  read back as TSV from stdout - one process per batch, no temp files
+- OCRs only the crops it is given (ROIs / text candidates), several
+  per call via read_batch
+- Keeps an LRU cache keyed on a hash of each crop's pixels, so a
+  repeated home-screen frame skips OCR entirely
+
+Config:
+    "ocr": {
+        "backend": "auto",        # auto | tesserocr | cli
+        "workers": 2,
+        "lang": "eng",
+        "psm": 11,
+        "cache_size": 64,
+        "timeout_seconds": 10,
+        "tesseract_cmd": "tesseract"
+    }
+"""
+
+import hashlib
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import cv2
+import numpy as np
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# One recognized word; left/top are relative to the crop it came from
+OcrWord = namedtuple('OcrWord', ['text', 'confidence', 'left', 'top', 'width', 'height'])
+
+# Blank rows between stacked crops in a CLI batch (keeps lines apart)
+BATCH_GAP = 24
+
+
+def crop_key(crop: np.ndarray) -> bytes:
+    """Cache key: shape + hash of the pixels"""
+    digest = hashlib.blake2b(np.ascontiguousarray(crop).data, digest_size=16)
+    digest.update(repr(crop.shape).encode())
+    return digest.digest()
+
+
+class TesserocrBackend:
+    """Fixed pool of in-process tesseract engines"""
+
+    name = 'tesserocr'
+
+    def __init__(self, workers: int, lang: str, psm: int):
+        self._apis = queue.Queue()
+        self._all = []
+        for _ in range(max(1, workers)):
+            api = tesserocr.PyTessBaseAPI(lang=lang, psm=psm)
+            self._apis.put(api)
+            self._all.append(api)
+        self._pool = ThreadPoolExecutor(max_workers=len(self._all), thread_name_prefix="ocr")
+
+    def read(self, crop: np.ndarray) -> List[OcrWord]:
+        api = self._apis.get()
+        try:
+            crop = np.ascontiguousarray(crop)
+            height, width = crop.shape[:2]
+            api.SetImageBytes(crop.tobytes(), width, height, 1, width)
+            api.Recognize()
+
+            words = []
+            iterator = api.GetIterator()
+            if iterator is None:
+                return words
+
+            level = tesserocr.RIL.WORD
+            for word in tesserocr.iterate_level(iterator, level):
+                text = word.GetUTF8Text(level)
+                box = word.BoundingBox(level)
+                if text and text.strip() and box:
+                    x1, y1, x2, y2 = box
+                    words.append(OcrWord(text.strip(), word.Confidence(level), x1, y1, x2 - x1, y2 - y1))
+            return words
+        finally:
+            api.Clear()
+            self._apis.put(api)
+
+    def read_batch(self, crops: List[np.ndarray], timeout: float) -> List[List[OcrWord]]:
+        futures = [self._pool.submit(self.read, crop) for crop in crops]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+        for api in self._all:
+            api.End()
+        self._all = []
+
+
+class CliBackend:
+    """tesseract executable, one process per batch over stdin/stdout"""
+
+    name = 'cli'
+
+    def __init__(self, command: str, lang: str, psm: int):
+        self.command = command
+        self.lang = lang
+        self.psm = psm
+
+    @staticmethod
+    def stack(crops: List[np.ndarray]):
+        """Stack crops into one white page; returns (page, y offset per crop)"""
+        width = max(crop.shape[1] for crop in crops)
+        height = sum(crop.shape[0] for crop in crops) + BATCH_GAP * (len(crops) + 1)
+        page = np.full((height, width), 255, dtype=np.uint8)
+
+        offsets = []
+        y = BATCH_GAP
+        for crop in crops:
+            h, w = crop.shape[:2]
+            page[y:y + h, :w] = crop
+            offsets.append(y)
+            y += h + BATCH_GAP
+        return page, offsets
+
+    def read_batch(self, crops: List[np.ndarray], timeout: float) -> List[List[OcrWord]]:
+        page, offsets = self.stack(crops)
+        ok, png = cv2.imencode('.png', page)
+        if not ok:
+            raise RuntimeError("could not encode OCR batch")
+
+        proc = subprocess.run(
+            [self.command, 'stdin', 'stdout', '-l', self.lang, '--psm', str(self.psm), 'tsv'],
+            input=png.tobytes(), capture_output=True, timeout=timeout,
+            creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.decode(errors='replace').strip() or "tesseract failed")
+
+        results = [[] for _ in crops]
+        for line in proc.stdout.decode('utf-8', errors='replace').splitlines()[1:]:
+            cols = line.split('\t')
+            if len(cols) < 12 or cols[0] != '5' or not cols[11].strip():
+                continue
+
+            left, top, width, height = (int(v) for v in cols[6:10])
+            center = top + height // 2
+
+            # Map the word back to the crop whose band it lies in
+            for index, (y, crop) in enumerate(zip(offsets, crops)):
+                if y <= center < y + crop.shape[0]:
+                    results[index].append(OcrWord(cols[11].strip(), float(cols[10]),
+                                                  left, top - y, width, height))
+                    break
+        return results
+
+    def close(self):
+        pass
+
+
+class OcrService:
+    """Batch OCR of crops with long-lived workers and an LRU result cache"""
+
+    def __init__(self, config: dict, log_callback: Optional[Callable] = None):
+        self.log_callback = log_callback
+        self.backend = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'calls': 0,
+            'crops': 0,
+            'cache_hits': 0,
+            'ocr_ms': 0.0,
+            'errors': 0
+        }
+
+        self.configure(config)
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    def configure(self, config: dict):
+        """(Re)start the backend from a keeper config"""
+        settings = config.get('ocr', {})
+        self.cache_size = settings.get('cache_size', 64)
+        self.timeout = settings.get('timeout_seconds', 10)
+
+        self.close()
+        self.backend = self._start_backend(settings)
+
+    def _start_backend(self, settings: dict):
+        choice = settings.get('backend', 'auto')
+        lang = settings.get('lang', 'eng')
+        psm = settings.get('psm', 11)
+
+        if choice in ('auto', 'tesserocr') and TESSEROCR_AVAILABLE:
+            try:
+                backend = TesserocrBackend(settings.get('workers', 2), lang, psm)
+                self.log_message(f"🔤 OCR: {settings.get('workers', 2)} in-process tesseract worker(s)", "INFO")
+                return backend
+            except Exception as e:
+                self.log_message(f"tesserocr unavailable ({e}), trying the tesseract CLI", "WARN")
+
+        if choice in ('auto', 'cli'):
+            command = shutil.which(settings.get('tesseract_cmd', 'tesseract'))
+            if command:
+                self.log_message(f"🔤 OCR: tesseract CLI ({command}), batched over pipes", "INFO")
+                return CliBackend(command, lang, psm)
+
+        return None
+
+    @property
+    def available(self) -> bool:
+        return self.backend is not None
+
+    def read(self, crop: np.ndarray) -> List[OcrWord]:
+        """Words in one grayscale crop"""
+        return self.read_batch([crop])[0]
+
+    def read_batch(self, crops: List[np.ndarray]) -> List[List[OcrWord]]:
+        """Words in each grayscale crop; cached crops skip OCR"""
+        if not self.available:
+            return [[] for _ in crops]
+
+        self.stats['calls'] += 1
+        self.stats['crops'] += len(crops)
+
+        keys = [crop_key(crop) for crop in crops]
+        results = [None] * len(crops)
+        missing = []
+
+        with self._lock:
+            for index, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[index] = cached
+                    self.stats['cache_hits'] += 1
+                else:
+                    missing.append(index)
+
+        if missing:
+            start = time.perf_counter()
+            try:
+                words = self.backend.read_batch([crops[i] for i in missing], self.timeout)
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.log_message(f"OCR failed: {e}", "WARN")
+                words = None
+            self.stats['ocr_ms'] += (time.perf_counter() - start) * 1000
+
+            if words is None:
+                # Failures are not cached; the next frame tries again
+                for index in missing:
+                    results[index] = []
+                return results
+
+            with self._lock:
+                for index, found in zip(missing, words):
+                    results[index] = found
+                    self._cache[keys[index]] = found
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return results
+
+    def close(self):
+        """Release the OCR workers"""
+        backend, self.backend = self.backend, None
+        if backend is not None:
+            backend.close()
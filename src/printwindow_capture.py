@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+PrintWindow Capture - background captures of (occluded) Roblox windows
+
+BackgroundModeKeeper.screenshot_printwindow (background_mode_prototype.py)
+proved PrintWindow captures a window that is covered or off to the
+side, but it created and destroyed a window DC, a compatible DC and a
+bitmap on every call, then copied the bits out with GetBitmapBits into
+a PIL image. PrintWindowCapture is the production version, a drop-in
+CaptureService for the keepers:
+- one memory DC per window, plus DIB sections whose pixel memory is
+  wrapped once as BGRA NumPy arrays: PrintWindow renders straight into
+  the array, so a frame costs one blit and no allocations
+- the DIB sections are recreated only when the window rect changes
+- grab(left, top, width, height) in screen coordinates is served from
+  the Roblox window (found through the shared WindowRegistry) whose
+  rect contains the region, as a slice of that window's frame; any
+  other region, or a failed PrintWindow, falls back to mss
+- buffers DIB sections per window rotate, so a frame stays valid
+  until that many more captures of the same window
+- a DIB section is deleted only once no frame (or slice of one) still
+  points into it, so a resize, a closed window or a capture swap never
+  frees memory a detector is still reading
+flags defaults to PW_RENDERFULLCONTENT, which Roblox's DirectX
+surface needs (Windows 8.1+); without it the client area comes back
+black. Enable it through the backend: backend.configure_capture(config).
+
+Config:
+    "background_capture": {
+        "enabled": false,
+        "flags": 2,
+        "buffers": 2,
+        "title_match": "Roblox"
+    }
+"""
+
+import ctypes
+import os
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+
+import numpy as np
+
+from capture_service import CaptureService
+
+if os.name == 'nt':
+    from ctypes import wintypes
+
+    user32 = ctypes.WinDLL('user32', use_last_error=True)
+    gdi32 = ctypes.WinDLL('gdi32', use_last_error=True)
+
+    class BITMAPINFOHEADER(ctypes.Structure):
+        _fields_ = [('biSize', wintypes.DWORD), ('biWidth', wintypes.LONG), ('biHeight', wintypes.LONG),
+                    ('biPlanes', wintypes.WORD), ('biBitCount', wintypes.WORD),
+                    ('biCompression', wintypes.DWORD), ('biSizeImage', wintypes.DWORD),
+                    ('biXPelsPerMeter', wintypes.LONG), ('biYPelsPerMeter', wintypes.LONG),
+                    ('biClrUsed', wintypes.DWORD), ('biClrImportant', wintypes.DWORD)]
+
+    class BITMAPINFO(ctypes.Structure):
+        _fields_ = [('bmiHeader', BITMAPINFOHEADER), ('bmiColors', wintypes.DWORD * 3)]
+
+    user32.PrintWindow.argtypes = (wintypes.HWND, wintypes.HDC, wintypes.UINT)
+    user32.PrintWindow.restype = wintypes.BOOL
+    gdi32.CreateCompatibleDC.argtypes = (wintypes.HDC,)
+    gdi32.CreateCompatibleDC.restype = wintypes.HDC
+    gdi32.CreateDIBSection.argtypes = (wintypes.HDC, ctypes.POINTER(BITMAPINFO), wintypes.UINT,
+                                       ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD)
+    gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+    gdi32.SelectObject.argtypes = (wintypes.HDC, wintypes.HGDIOBJ)
+    gdi32.SelectObject.restype = wintypes.HGDIOBJ
+    gdi32.DeleteObject.argtypes = (wintypes.HGDIOBJ,)
+    gdi32.DeleteObject.restype = wintypes.BOOL
+    gdi32.DeleteDC.argtypes = (wintypes.HDC,)
+    gdi32.DeleteDC.restype = wintypes.BOOL
+    gdi32.GdiFlush.restype = wintypes.BOOL
+
+    PRINTWINDOW_AVAILABLE = True
+else:
+    PRINTWINDOW_AVAILABLE = False
+
+PW_CLIENTONLY = 0x1
+PW_RENDERFULLCONTENT = 0x2
+BI_RGB = 0
+DIB_RGB_COLORS = 0
+
+
+class WindowSurface:
+    """Memory DC and DIB sections PrintWindow renders one window into"""
+
+    __slots__ = ('hwnd', 'memory_dc', 'stock_bitmap', 'bitmaps', 'frames', 'width', 'height', 'turn')
+
+    def __init__(self, hwnd: int):
+        self.hwnd = hwnd
+        # Compatible with the screen: no window DC is held between frames
+        self.memory_dc = gdi32.CreateCompatibleDC(None)
+        if not self.memory_dc:
+            raise OSError(f"CreateCompatibleDC failed ({ctypes.get_last_error()})")
+        self.stock_bitmap = None
+        self.bitmaps = []
+        self.frames = []
+        self.width = self.height = 0
+        self.turn = 0
+
+    def resize(self, width: int, height: int, buffers: int):
+        """(Re)create the DIB sections for a new window size"""
+        self._release_bitmaps()
+
+        info = BITMAPINFO()
+        header = info.bmiHeader
+        header.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+        header.biWidth = width
+        header.biHeight = -height      # top-down rows, like every other capture
+        header.biPlanes = 1
+        header.biBitCount = 32
+        header.biCompression = BI_RGB
+
+        for _ in range(buffers):
+            bits = ctypes.c_void_p()
+            bitmap = gdi32.CreateDIBSection(self.memory_dc, ctypes.byref(info), DIB_RGB_COLORS,
+                                            ctypes.byref(bits), None, 0)
+            if not bitmap:
+                self._release_bitmaps()
+                raise OSError(f"CreateDIBSection {width}x{height} failed ({ctypes.get_last_error()})")
+            self.bitmaps.append(bitmap)
+            buffer = (ctypes.c_ubyte * (width * height * 4)).from_address(bits.value)
+            # Every frame view keeps buffer alive; the bitmap goes with the last of them
+            weakref.finalize(buffer, gdi32.DeleteObject, bitmap)
+            self.frames.append(np.ndarray((height, width, 4), dtype=np.uint8, buffer=buffer))
+
+        self.width, self.height = width, height
+        self.turn = 0
+
+    def render(self, flags: int) -> Optional[np.ndarray]:
+        """PrintWindow into the next DIB section; its BGRA array, or None on failure"""
+        index = self.turn
+        previous = gdi32.SelectObject(self.memory_dc, self.bitmaps[index])
+        if self.stock_bitmap is None:
+            self.stock_bitmap = previous
+        ok = user32.PrintWindow(self.hwnd, self.memory_dc, flags)
+        # GDI batches drawing calls; the array must not be read before they land
+        gdi32.GdiFlush()
+        if not ok:
+            return None
+        self.turn = (index + 1) % len(self.bitmaps)
+        return self.frames[index]
+
+    def _release_bitmaps(self):
+        """Deselect the DIB sections; each is deleted when its last frame view is gone"""
+        if self.stock_bitmap is not None:
+            gdi32.SelectObject(self.memory_dc, self.stock_bitmap)
+        self.bitmaps = []
+        self.frames = []
+
+    def close(self):
+        self._release_bitmaps()
+        gdi32.DeleteDC(self.memory_dc)
+
+
+class PrintWindowCapture(CaptureService):
+    """CaptureService that renders Roblox windows with PrintWindow instead of reading the screen"""
+
+    # Covered windows are captured as themselves
+    background = True
+
+    def __init__(self, windows, config: dict):
+        """windows: the backend's WindowRegistry (handles and validation)"""
+        super().__init__()
+        self.windows = windows
+        self._surfaces: Dict[int, WindowSurface] = {}
+        self._surface_lock = threading.Lock()
+
+        self.stats.update({
+            'printwindow_frames': 0,
+            'resizes': 0,
+            'fallbacks': 0,
+            'failures': 0
+        })
+
+        self.configure(config)
+
+    def configure(self, config: dict):
+        settings = config.get('background_capture', {})
+        self.flags = settings.get('flags', PW_RENDERFULLCONTENT)
+        self.buffers = max(1, settings.get('buffers', 2))
+        self.title_match = settings.get('title_match', "Roblox")
+
+    def _window_at(self, left: int, top: int, width: int, height: int):
+        """(hwnd, window rect) of the Roblox window containing the region"""
+        handles = self.windows.handles(self.title_match)
+        if any(hwnd not in handles for hwnd in self._surfaces):
+            with self._surface_lock:
+                for hwnd in [hwnd for hwnd in self._surfaces if hwnd not in handles]:
+                    self._release(hwnd)
+
+        for hwnd in handles:
+            rect = self.windows.backend.window_rect(hwnd)
+            if (rect and rect['x'] <= left and rect['y'] <= top
+                    and left + width <= rect['x'] + rect['width'] and top + height <= rect['y'] + rect['height']):
+                return hwnd, rect
+        return None, None
+
+    def _render(self, hwnd: int, rect: dict) -> Optional[np.ndarray]:
+        surface = self._surfaces.get(hwnd)
+        if surface is None:
+            surface = self._surfaces[hwnd] = WindowSurface(hwnd)
+        if (surface.width, surface.height) != (rect['width'], rect['height']) or len(surface.bitmaps) != self.buffers:
+            surface.resize(rect['width'], rect['height'], self.buffers)
+            self.stats['resizes'] += 1
+        return surface.render(self.flags)
+
+    def grab(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        """BGRA view of a screen region, rendered from the window that contains it"""
+        start = time.perf_counter()
+
+        frame = None
+        hwnd, rect = self._window_at(left, top, width, height)
+        if hwnd:
+            with self._surface_lock:
+                try:
+                    frame = self._render(hwnd, rect)
+                except OSError:
+                    frame = None
+                if frame is None:
+                    self.stats['failures'] += 1
+                    self._release(hwnd)
+
+        if frame is None:
+            self.stats['fallbacks'] += 1
+            return super().grab(left, top, width, height)
+
+        x, y = left - rect['x'], top - rect['y']
+        view = frame[y:y + height, x:x + width]
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats['frames'] += 1
+        self.stats['printwindow_frames'] += 1
+        self.stats['total_ms'] += elapsed
+        self.stats['last_ms'] = elapsed
+        return view
+
+    def _release(self, hwnd: int):
+        surface = self._surfaces.pop(hwnd, None)
+        if surface is not None:
+            surface.close()
+
+    def release(self, hwnd: int):
+        """Free the DC and bitmaps of a window that went away"""
+        with self._surface_lock:
+            self._release(hwnd)
+
+    def close(self):
+        with self._surface_lock:
+            for hwnd in list(self._surfaces):
+                self._release(hwnd)
+        super().close()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Process Watcher - event-driven crash detection
+
+is_roblox_running walked the whole process table every status check
+(every loop iteration in V2), so a crash was noticed up to 30 s late
+and every check cost more on a busy host. ProcessWatcher instead:
+- resolves the Roblox PIDs once (one process_iter scan)
+- blocks on their exit from a watcher thread:
+    Linux:   pidfd_open + select, alongside a stop pipe
+    Windows: OpenProcess(SYNCHRONIZE) handles + a stop event in one
+             WaitForMultipleObjects call
+    other:   psutil.wait_procs in short slices (fallback)
+- calls on_exit(pid, remaining) within milliseconds of an exit
+- re-resolves only when every PID is gone (polling every
+  rescan_seconds until a client is back), plus a slow refresh to pick
+  up clients started alongside the watched ones
+is_roblox_running then answers from the watched PID set, no scan.
+
+Self-check against dummy child processes (Linux or Windows):
+    python src/process_watcher.py
+
+Config:
+    "process_watcher": {
+        "enabled": true,
+        "rescan_seconds": 5,
+        "refresh_seconds": 60
+    }
+"""
+
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+import psutil
+
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.CreateEventW.argtypes = (ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR)
+    kernel32.CreateEventW.restype = wintypes.HANDLE
+    kernel32.SetEvent.argtypes = (wintypes.HANDLE,)
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    kernel32.WaitForMultipleObjects.argtypes = (wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE),
+                                                wintypes.BOOL, wintypes.DWORD)
+    kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+
+    SYNCHRONIZE = 0x00100000
+    WAIT_OBJECT_0 = 0x00000000
+    WAIT_TIMEOUT = 0x00000102
+    # WaitForMultipleObjects limit, minus the stop event
+    MAX_WAIT_PIDS = 63
+
+# psutil fallback: how long one wait_procs slice may block
+PSUTIL_SLICE = 0.25
+
+
+def pids_by_name(process_name: str) -> List[int]:
+    """PIDs of every process with this exact name (one process-table scan)"""
+    pids = []
+    for proc in psutil.process_iter(['name']):
+        try:
+            if proc.info['name'] == process_name:
+                pids.append(proc.pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return pids
+
+
+def watch_process(process_name: str, config: dict, on_exit: Optional[Callable] = None,
+                  log_callback: Optional[Callable] = None) -> Optional['ProcessWatcher']:
+    """Started watcher for every process named process_name, or None when disabled"""
+    settings = config.get('process_watcher', {})
+    if not settings.get('enabled', True):
+        return None
+
+    watcher = ProcessWatcher(lambda: pids_by_name(process_name), on_exit,
+                             rescan_seconds=settings.get('rescan_seconds', 5),
+                             refresh_seconds=settings.get('refresh_seconds', 60),
+                             log_callback=log_callback)
+    watcher.start(name="roblox-watcher")
+    return watcher
+
+
+class ProcessWatcher:
+    """Watcher thread that blocks on process exit instead of polling"""
+
+    def __init__(self, resolve: Callable[[], Iterable[int]], on_exit: Optional[Callable] = None,
+                 rescan_seconds: float = 5.0, refresh_seconds: float = 60.0,
+                 log_callback: Optional[Callable] = None):
+        """
+        resolve() returns the PIDs to watch (e.g. lambda: pids_by_name(name)).
+        on_exit(pid, remaining) runs on the watcher thread for every exit.
+        """
+        self.resolve = resolve
+        self.on_exit = on_exit
+        self.rescan_seconds = rescan_seconds
+        self.refresh_seconds = refresh_seconds
+        self.log_callback = log_callback
+
+        if hasattr(os, 'pidfd_open'):
+            self.mechanism = 'pidfd'
+        elif os.name == 'nt':
+            self.mechanism = 'win32'
+        else:
+            self.mechanism = 'psutil'
+
+        self.pids = set()
+        self.resolved = False       # True once the first resolve has run
+        self.thread = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._stop_r = self._stop_w = None
+        self._stop_event = None
+
+        self.stats = {
+            'mechanism': self.mechanism,
+            'resolves': 0,
+            'exits': 0
+        }
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    # ========================================
+    # LIFECYCLE
+    # ========================================
+
+    def start(self, name: str = "process-watcher"):
+        """Resolve once and start the watcher thread"""
+        if self.thread and self.thread.is_alive():
+            return
+
+        self._stopping.clear()
+        if self.mechanism == 'pidfd':
+            self._stop_r, self._stop_w = os.pipe()
+        elif self.mechanism == 'win32':
+            self._stop_event = kernel32.CreateEventW(None, True, False, None)
+
+        self._resolve()
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Wake the watcher thread out of its wait and join it"""
+        self._stopping.set()
+        if self._stop_w is not None:
+            os.write(self._stop_w, b'x')
+        if self._stop_event is not None:
+            kernel32.SetEvent(self._stop_event)
+
+        if self.thread:
+            self.thread.join(timeout)
+            self.thread = None
+
+        for fd in (self._stop_r, self._stop_w):
+            if fd is not None:
+                os.close(fd)
+        self._stop_r = self._stop_w = None
+        if self._stop_event is not None:
+            kernel32.CloseHandle(self._stop_event)
+            self._stop_event = None
+
+    @property
+    def running(self) -> bool:
+        """Any watched process alive (answers from the PID set, no scan)"""
+        with self._lock:
+            return bool(self.pids)
+
+    # ========================================
+    # WATCHER THREAD
+    # ========================================
+
+    def _resolve(self):
+        try:
+            pids = set(self.resolve())
+        except Exception as e:
+            self.log_message(f"Process lookup failed: {e}", "WARN")
+            pids = set()
+        with self._lock:
+            self.pids = pids
+            self.resolved = True
+        self.stats['resolves'] += 1
+
+    def _run(self):
+        while not self._stopping.is_set():
+            with self._lock:
+                pids = sorted(self.pids)
+
+            if not pids:
+                # Nothing to wait on: look again every rescan_seconds
+                if self._stopping.wait(self.rescan_seconds):
+                    break
+                self._resolve()
+                continue
+
+            try:
+                exited = self._wait(pids, self.refresh_seconds)
+            except Exception as e:
+                self.log_message(f"Process wait failed ({self.mechanism}): {e}", "WARN")
+                exited = []
+                if self._stopping.wait(self.rescan_seconds):
+                    break
+
+            if self._stopping.is_set():
+                break
+
+            if not exited:
+                # Refresh timeout: pick up clients started since the last resolve
+                self._resolve()
+                continue
+
+            for pid in exited:
+                with self._lock:
+                    self.pids.discard(pid)
+                    remaining = len(self.pids)
+                self.stats['exits'] += 1
+                if self.on_exit:
+                    try:
+                        self.on_exit(pid, remaining)
+                    except Exception as e:
+                        self.log_message(f"Process exit handler failed: {e}", "ERROR")
+
+    def _wait(self, pids: List[int], timeout: float) -> List[int]:
+        """Block until a watched PID exits (returns them) or timeout/stop (returns [])"""
+        if self.mechanism == 'pidfd':
+            return self._wait_pidfd(pids, timeout)
+        if self.mechanism == 'win32':
+            return self._wait_win32(pids, timeout)
+        return self._wait_psutil(pids, timeout)
+
+    def _wait_pidfd(self, pids: List[int], timeout: float) -> List[int]:
+        fds = {}
+        gone = []
+        try:
+            for pid in pids:
+                try:
+                    fds[os.pidfd_open(pid)] = pid
+                except ProcessLookupError:
+                    gone.append(pid)
+            if gone:
+                return gone
+
+            ready, _, _ = select.select([self._stop_r] + list(fds), [], [], timeout)
+            return [fds[fd] for fd in ready if fd in fds]
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _wait_win32(self, pids: List[int], timeout: float) -> List[int]:
+        handles = []
+        gone = []
+        try:
+            for pid in pids[:MAX_WAIT_PIDS]:
+                handle = kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+                if handle:
+                    handles.append((handle, pid))
+                else:
+                    gone.append(pid)
+            if gone:
+                return gone
+
+            array = (wintypes.HANDLE * (len(handles) + 1))(self._stop_event, *(h for h, _ in handles))
+            result = kernel32.WaitForMultipleObjects(len(array), array, False, int(timeout * 1000))
+            index = result - WAIT_OBJECT_0
+            if result == WAIT_TIMEOUT or index == 0 or not 0 < index <= len(handles):
+                return []
+            return [handles[index - 1][1]]
+        finally:
+            for handle, _ in handles:
+                kernel32.CloseHandle(handle)
+
+    def _wait_psutil(self, pids: List[int], timeout: float) -> List[int]:
+        procs = []
+        gone = []
+        for pid in pids:
+            try:
+                procs.append(psutil.Process(pid))
+            except psutil.NoSuchProcess:
+                gone.append(pid)
+        if gone:
+            return gone
+
+        deadline = time.monotonic() + timeout
+        while not self._stopping.is_set() and time.monotonic() < deadline:
+            exited, _ = psutil.wait_procs(procs, timeout=PSUTIL_SLICE)
+            if exited:
+                return [proc.pid for proc in exited]
+        return []
+
+    def get_stats(self) -> dict:
+        stats = self.stats.copy()
+        stats['watched'] = len(self.pids)
+        return stats
+
+
+# ========================================
+# SELF-CHECK
+# ========================================
+
+def _self_check(children: int = 3) -> bool:
+    """Watch dummy child processes, kill them one by one, time each notification"""
+    procs = [subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+             for _ in range(children)]
+    notified = {}
+    done = threading.Event()
+
+    def on_exit(pid, remaining):
+        notified[pid] = time.perf_counter()
+        if not remaining:
+            done.set()
+
+    pids = [proc.pid for proc in procs]
+    first = [True]
+
+    def resolve():
+        # Dummy children are found once; after they are gone nothing comes back
+        if first[0]:
+            first[0] = False
+            return pids
+        return []
+
+    watcher = ProcessWatcher(resolve, on_exit, rescan_seconds=0.2)
+    watcher.start()
+    print(f"Watching {len(pids)} dummy processes via {watcher.mechanism}")
+
+    latencies = []
+    ok = True
+    for proc in procs:
+        time.sleep(0.2)
+        killed = time.perf_counter()
+        proc.kill()
+        deadline = time.monotonic() + 2.0
+        while proc.pid not in notified and time.monotonic() < deadline:
+            time.sleep(0.001)
+        if proc.pid not in notified:
+            print(f"  pid {proc.pid}: no notification within 2 s")
+            ok = False
+            continue
+        latencies.append((notified[proc.pid] - killed) * 1000)
+        print(f"  pid {proc.pid}: exit noticed after {latencies[-1]:.1f} ms")
+        proc.wait()
+
+    ok = ok and done.wait(1.0) and not watcher.running
+    watcher.stop()
+    if latencies:
+        print(f"Max notification latency: {max(latencies):.1f} ms")
+    print("OK" if ok else "FAILED")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if _self_check() else 1)
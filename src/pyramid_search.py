@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Pyramid Search - coarse-to-fine detection
+
+Runs a detector on a 1/4 (or 1/8) downscaled frame to find a candidate,
+then re-runs it at full resolution only on the candidate's
+neighbourhood. Detectors need no changes: FrameAnalysis.blobs/regions
+report coarse results in full-resolution units.
+
+With "compare" on, every search also runs the plain full-resolution
+detector and records the speedup and localization error, so the scale
+can be chosen per deployment.
+
+Config:
+    "detection_pyramid": {
+        "enabled": false,
+        "scale": 4,               # 2, 4 or 8 (power of two)
+        "refine_margin": 160,     # px around the coarse hit, full resolution
+        "min_pixels": 200000,     # smaller frames/ROIs skip the coarse pass
+        "full_res_on_miss": true, # coarse miss -> one full-resolution pass
+        "compare": false
+    }
+"""
+
+import math
+import time
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from frame_analysis import FrameAnalysis
+
+
+class PyramidSearch:
+    """Wraps a detector in a coarse pass plus a local full-resolution refine"""
+
+    def __init__(self, config: dict, analysis: Callable = FrameAnalysis.of, log_callback: Optional[Callable] = None):
+        self.analysis = analysis    # img -> FrameAnalysis (wired to the classifier)
+        self.log_callback = log_callback
+        self.configure(config)
+
+        self.stats = {
+            'searches': 0,
+            'coarse_hits': 0,
+            'refined': 0,
+            'coarse_only': 0,
+            'full_res_fallbacks': 0,
+            'search_ms': 0.0,
+            'compared': 0,
+            'compare_full_ms': 0.0,
+            'compare_search_ms': 0.0,
+            'error_px_total': 0.0,
+            'error_px_max': 0.0,
+            'disagreements': 0
+        }
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    def configure(self, config: dict):
+        """(Re)read pyramid settings from a keeper config"""
+        settings = config.get('detection_pyramid', {})
+        self.enabled = settings.get('enabled', False)
+        self.level = max(0, int(round(math.log2(max(1, settings.get('scale', 4))))))
+        self.refine_margin = settings.get('refine_margin', 160)
+        self.min_pixels = settings.get('min_pixels', 200000)
+        self.full_res_on_miss = settings.get('full_res_on_miss', True)
+        self.compare = settings.get('compare', False)
+
+    def wrap(self, detect: Callable) -> Callable:
+        """detect(img) -> point, run coarse-to-fine when enabled"""
+        return lambda img: self.search(img, detect)
+
+    def search(self, img, detect: Callable) -> Optional[Tuple[int, int]]:
+        """Coarse candidate, then full-resolution refine around it"""
+        full = self.analysis(img)
+        if not self.enabled or self.level == 0 or full.width * full.height < self.min_pixels:
+            return detect(full)
+
+        start = time.perf_counter()
+        point = self._coarse_to_fine(full, detect)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        self.stats['searches'] += 1
+        self.stats['search_ms'] += elapsed
+
+        if self.compare:
+            self._compare(full, detect, point, elapsed)
+        return point
+
+    def _coarse_to_fine(self, full: FrameAnalysis, detect: Callable):
+        candidate = detect(full.downscaled(self.level))
+
+        if not candidate:
+            if self.full_res_on_miss:
+                self.stats['full_res_fallbacks'] += 1
+                return detect(full)
+            return None
+
+        self.stats['coarse_hits'] += 1
+
+        # Refine on the candidate's neighbourhood at full resolution
+        cx, cy = int(candidate[0]), int(candidate[1])
+        x0, y0 = max(0, cx - self.refine_margin), max(0, cy - self.refine_margin)
+        x1, y1 = min(full.width, cx + self.refine_margin), min(full.height, cy + self.refine_margin)
+
+        refined = detect(self.analysis(full.frame[y0:y1, x0:x1]))
+        if refined:
+            self.stats['refined'] += 1
+            return (x0 + int(refined[0]), y0 + int(refined[1]))
+
+        # Refine crop lost the target (e.g. it straddles the crop edge)
+        self.stats['coarse_only'] += 1
+        return (cx, cy)
+
+    def _compare(self, full: FrameAnalysis, detect: Callable, point, search_ms: float):
+        """Run the plain full-resolution detector and record the difference"""
+        start = time.perf_counter()
+        exact = detect(full)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        self.stats['compared'] += 1
+        self.stats['compare_full_ms'] += full_ms
+        self.stats['compare_search_ms'] += search_ms
+
+        if bool(point) != bool(exact):
+            self.stats['disagreements'] += 1
+            self.log_message(f"🔬 Pyramid x{2 ** self.level}: {point} vs full resolution {exact}", "WARN")
+            return
+
+        if point:
+            error = math.hypot(point[0] - exact[0], point[1] - exact[1])
+            self.stats['error_px_total'] += error
+            self.stats['error_px_max'] = max(self.stats['error_px_max'], error)
+            self.log_message(f"🔬 Pyramid x{2 ** self.level}: {search_ms:.1f} ms vs {full_ms:.1f} ms, "
+                             f"error {error:.1f}px", "INFO")
+
+    def get_stats(self) -> dict:
+        """Search stats, plus speedup and mean error when comparing"""
+        stats = self.stats.copy()
+        stats['scale'] = 2 ** self.level
+        if stats['compared'] and stats['compare_search_ms']:
+            stats['speedup'] = round(stats['compare_full_ms'] / stats['compare_search_ms'], 2)
+            agreed = stats['compared'] - stats['disagreements']
+            if agreed:
+                stats['error_px_mean'] = round(stats['error_px_total'] / agreed, 2)
+        return stats
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+ROI Manager - search windows for the detectors
+
+The play button, game card and error-dialog OK button sit in known
+parts of the Roblox window, yet every detector scanned the full frame.
+RoiManager keeps, per detection target, a short list of regions to try
+before the full frame:
+- learned: bounding box of recent successful hits (+ margin), stored
+  as window fractions so a resized window keeps its ROIs, persisted
+  across runs
+- configured: detection_rois.targets.<target> in config, or a box
+  around the matching fixed_coordinates click point
+Detection runs on a crop (a view, no copy) of the frame - or a grab of
+just that region - and only widens to the full frame when every ROI
+misses.
+
+Config:
+    "detection_rois": {
+        "enabled": true,
+        "learn": true,
+        "margin": 160,
+        "max_learned_hits": 20,
+        "targets": {"play_button": {"x": 780, "y": 450, "width": 340, "height": 200}}
+    }
+"""
+
+import json
+import os
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from frame_analysis import FrameAnalysis
+
+
+# Target name -> fixed_coordinates entry its default ROI is centred on
+FIXED_COORDINATE_TARGETS = {
+    'game_card': 'game_card_click',
+    'play_button': 'play_button_click',
+    'error_ok': 'error_ok_click',
+}
+
+Roi = Tuple[int, int, int, int]  # x, y, width, height (window pixels)
+
+
+class RoiManager:
+    """Per-target search regions, configured and learned from hits"""
+
+    def __init__(self, config: dict, cache_path: Optional[str] = None, log_callback: Optional[Callable] = None):
+        self.cache_path = cache_path
+        self.log_callback = log_callback
+        self.configure(config)
+
+        self.hits: Dict[str, deque] = {}   # target -> deque of (fx, fy) window fractions
+        self._load_cache()
+
+        self.stats = {
+            'searches': 0,
+            'roi_hits': 0,
+            'full_frame_searches': 0,
+            'misses': 0,
+            'pixels_processed': 0,
+            'full_frame_pixels': 0
+        }
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    def configure(self, config: dict):
+        """(Re)read ROI settings from a keeper config"""
+        settings = config.get('detection_rois', {})
+        self.enabled = settings.get('enabled', True)
+        self.learn = settings.get('learn', True)
+        self.margin = settings.get('margin', 160)
+        self.max_learned_hits = settings.get('max_learned_hits', 20)
+        self.targets = settings.get('targets', {})
+        self.fixed_coordinates = config.get('fixed_coordinates', {})
+
+    # ========================================
+    # ROI CANDIDATES
+    # ========================================
+
+    def _box_around(self, points: List[Tuple[int, int]], margin: int) -> Roi:
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        x0, y0 = min(xs) - margin, min(ys) - margin
+        return (x0, y0, max(xs) + margin - x0, max(ys) + margin - y0)
+
+    @staticmethod
+    def _clamp(roi: Roi, width: int, height: int) -> Optional[Roi]:
+        x, y, w, h = roi
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = min(width, int(x + w)), min(height, int(y + h))
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def learned_roi(self, target: str, width: int, height: int) -> Optional[Roi]:
+        """Box around recent hits, in this window's pixels"""
+        hits = self.hits.get(target)
+        if not hits:
+            return None
+        points = [(int(fx * width), int(fy * height)) for fx, fy in hits]
+        return self._clamp(self._box_around(points, self.margin), width, height)
+
+    def configured_roi(self, target: str, width: int, height: int) -> Optional[Roi]:
+        """Explicit ROI from config, else a box around the fixed click point"""
+        roi = self.targets.get(target)
+        if roi:
+            return self._clamp((roi['x'], roi['y'], roi['width'], roi['height']), width, height)
+
+        fixed = self.fixed_coordinates.get(FIXED_COORDINATE_TARGETS.get(target, ''), {})
+        if 'x' in fixed and 'y' in fixed:
+            margin = fixed.get('roi_margin', self.margin)
+            return self._clamp(self._box_around([(fixed['x'], fixed['y'])], margin), width, height)
+        return None
+
+    def candidates(self, target: str, width: int, height: int) -> List[Roi]:
+        """ROIs to try in order (learned first), never the full frame"""
+        if not self.enabled:
+            return []
+
+        rois = []
+        for roi in (self.learned_roi(target, width, height), self.configured_roi(target, width, height)):
+            if roi and roi not in rois and roi[2] * roi[3] < width * height:
+                rois.append(roi)
+        return rois
+
+    # ========================================
+    # SEARCH
+    # ========================================
+
+    def search(self, target: str, frame, detect: Callable) -> Optional[Tuple[int, int]]:
+        """
+        Run detect over ROI crops of an in-memory frame, then the full frame
+
+        frame is a capture array or a FrameAnalysis; detect receives a
+        crop (or the full frame) and returns a point relative to it or
+        None. Returns the point in full-frame coordinates.
+        """
+        full = frame if isinstance(frame, FrameAnalysis) else None
+        pixels = frame.frame if full is not None else frame
+        height, width = pixels.shape[:2]
+
+        def grab(roi):
+            x, y, w, h = roi
+            return pixels[y:y + h, x:x + w]
+
+        def grab_full():
+            return full if full is not None else pixels
+
+        return self._search(target, width, height, grab, grab_full, detect)
+
+    def locate(self, target: str, window_info: dict, capture, detect: Callable) -> Optional[Tuple[int, int]]:
+        """
+        Like search, but captures only the ROI from screen
+
+        Returns the point relative to the window, or None.
+        """
+        width, height = window_info['width'], window_info['height']
+
+        def grab(roi):
+            x, y, w, h = roi
+            return capture.grab(window_info['x'] + x, window_info['y'] + y, w, h)
+
+        def grab_full():
+            return capture.grab_window(window_info)
+
+        return self._search(target, width, height, grab, grab_full, detect)
+
+    def _search(self, target, width, height, grab, grab_full, detect):
+        self.stats['searches'] += 1
+        self.stats['full_frame_pixels'] += width * height
+
+        for roi in self.candidates(target, width, height):
+            x, y, w, h = roi
+            self.stats['pixels_processed'] += w * h
+
+            point = detect(grab(roi))
+            if point:
+                point = (x + int(point[0]), y + int(point[1]))
+                self.stats['roi_hits'] += 1
+                self.record_hit(target, point, width, height)
+                return point
+
+        self.stats['full_frame_searches'] += 1
+        self.stats['pixels_processed'] += width * height
+
+        point = detect(grab_full())
+        if point:
+            point = (int(point[0]), int(point[1]))
+            self.log_message(f"🔲 {target}: found outside ROIs at {point}, learning", "INFO")
+            self.record_hit(target, point, width, height)
+            return point
+
+        self.stats['misses'] += 1
+        return None
+
+    # ========================================
+    # LEARNING
+    # ========================================
+
+    def record_hit(self, target: str, point: Tuple[int, int], width: int, height: int):
+        """Remember a successful detection (window pixels)"""
+        if not self.learn or width <= 0 or height <= 0:
+            return
+
+        hits = self.hits.setdefault(target, deque(maxlen=self.max_learned_hits))
+        hits.append((round(point[0] / width, 4), round(point[1] / height, 4)))
+        self._save_cache()
+
+    def forget(self, target: Optional[str] = None):
+        """Drop learned ROIs (one target, or all)"""
+        if target is None:
+            self.hits.clear()
+        else:
+            self.hits.pop(target, None)
+        self._save_cache()
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            for target, points in data.items():
+                self.hits[target] = deque((tuple(p) for p in points), maxlen=self.max_learned_hits)
+        except Exception as e:
+            self.log_message(f"Ignoring ROI cache {self.cache_path}: {e}", "WARN")
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump({t: list(points) for t, points in self.hits.items()}, f, indent=2)
+        except Exception as e:
+            self.log_message(f"Failed to save ROI cache: {e}", "WARN")
+
+    def get_stats(self) -> dict:
+        """Search stats plus the fraction of full-frame pixels skipped"""
+        stats = self.stats.copy()
+        if stats['full_frame_pixels']:
+            stats['pixel_ratio'] = round(stats['pixels_processed'] / stats['full_frame_pixels'], 3)
+        return stats
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Screen State - what is the Roblox client showing right now?
+
+Nothing in the keeper knew: keeper.py guessed "loading" from the PNG
+file size and keeper_engine clicked whatever was on screen.
+ScreenStateClassifier labels a capture as home / loading / in_game /
+dialog / disconnected from a 64x36 thumbnail:
+- color: saturation-weighted hue histogram + brightness histogram
+- structure: brightness spread, edge density, border vs centre
+  brightness, and DialogDetector's panel / button count
+With reference screenshots (<directory>/<state>/*.png) it picks the
+nearest state centroid; their feature vectors are cached in
+logs/screen_state_refs.json and only recomputed when a file changes.
+Without references it falls back to rules: a dialog with two buttons
+(Leave / Reconnect) is a disconnect, a flat dark featureless frame is
+loading, a blue play button means home, anything else is in game. A
+flat bright, colourful or black frame is not the client at all (a
+blank page or the desktop in front of it) and comes back 'unknown'.
+
+It also keeps the time spent in each state.
+
+Config:
+    "screen_state": {
+        "enabled": true,
+        "directory": "screen_states",
+        "max_distance": 1.5,
+        "min_confidence": 0.6
+    }
+"""
+
+import glob
+import json
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from dialog_detector import DialogDetector
+from frame_analysis import FrameAnalysis
+
+STATES = ('home', 'loading', 'in_game', 'dialog', 'disconnected')
+
+# Thumbnail size features are computed on (width, height)
+THUMB_SIZE = (64, 36)
+
+# Bump when the feature vector changes, so cached references are rebuilt
+FEATURE_VERSION = 1
+
+HUE_BINS = 8
+VALUE_BINS = 8
+
+# Hue bins covering OpenCV hue 90-135 (blue)
+BLUE_BINS = slice(4, 6)
+
+# Structural features count more than any single histogram bin
+FEATURE_WEIGHTS = np.concatenate([
+    np.full(HUE_BINS, 1.0), np.full(VALUE_BINS, 1.0),
+    np.array([2.0, 2.0, 2.0, 3.0, 2.0, 3.0, 2.0])
+]).astype(np.float32)
+
+
+class ScreenStateClassifier:
+    """Thumbnail features -> screen state label + confidence"""
+
+    def __init__(self, config: dict, base_dir: str, cache_path: Optional[str] = None,
+                 log_callback: Optional[Callable] = None):
+        self.base_dir = base_dir
+        self.cache_path = cache_path
+        # Our own detector: classifications must not count as the keeper's dialog checks
+        self.dialogs = DialogDetector(config)
+        self.log_callback = log_callback
+
+        self.centroids: Dict[str, np.ndarray] = {}
+        self.state = None
+        self.confidence = 0.0
+        self._since = None
+        self.time_in_state = {state: 0.0 for state in STATES}
+
+        self.stats = {
+            'classifications': 0,
+            'transitions': 0,
+            'total_ms': 0.0,
+            'last_ms': 0.0
+        }
+
+        self.configure(config)
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    def configure(self, config: dict):
+        """(Re)read settings and reference screenshots"""
+        settings = config.get('screen_state', {})
+        self.enabled = settings.get('enabled', True)
+        self.directory = os.path.join(self.base_dir, settings.get('directory', 'screen_states'))
+        self.max_distance = settings.get('max_distance', 1.5)
+        self.min_confidence = settings.get('min_confidence', 0.6)
+        self.dialogs.configure(config)
+        self.load_references()
+
+    # ==================== FEATURES ====================
+
+    def features(self, frame) -> np.ndarray:
+        """Feature vector of a capture (BGR/BGRA array or FrameAnalysis)"""
+        analysis = FrameAnalysis.of(frame)
+        thumb = cv2.resize(analysis.bgr, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(thumb, cv2.COLOR_BGR2HSV)
+        pixels = float(THUMB_SIZE[0] * THUMB_SIZE[1])
+
+        saturation = hsv[:, :, 1].astype(np.float32) / 255.0
+        value = hsv[:, :, 2].astype(np.float32) / 255.0
+
+        hue_hist = np.bincount((hsv[:, :, 0].ravel().astype(np.int32) * HUE_BINS) // 180,
+                               weights=saturation.ravel(), minlength=HUE_BINS)[:HUE_BINS] / pixels
+        value_hist = np.bincount((hsv[:, :, 2].ravel().astype(np.int32) * VALUE_BINS) // 256,
+                                 minlength=VALUE_BINS) / pixels
+
+        gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+        gx = cv2.Sobel(gray, cv2.CV_16S, 1, 0)
+        gy = cv2.Sobel(gray, cv2.CV_16S, 0, 1)
+        edge_density = float(np.count_nonzero((np.abs(gx) + np.abs(gy)) > 80)) / pixels
+
+        h, w = value.shape
+        centre = value[h // 4:3 * h // 4, w // 4:3 * w // 4]
+        border_mean = (value.sum() - centre.sum()) / max(1, value.size - centre.size)
+
+        dialog = self.dialogs.detect(analysis)
+        structure = [
+            float(value.mean()),
+            float(value.std()),
+            float(saturation.mean()),
+            edge_density,
+            float(centre.mean() - border_mean),
+            1.0 if dialog else 0.0,
+            min(dialog['buttons'], 2) / 2.0 if dialog else 0.0
+        ]
+        return np.concatenate([hue_hist, value_hist, structure]).astype(np.float32)
+
+    # ==================== REFERENCES ====================
+
+    def _reference_files(self):
+        files = []
+        for state in STATES:
+            for path in sorted(glob.glob(os.path.join(self.directory, state, '*.png'))):
+                stat = os.stat(path)
+                files.append((state, path, f"{state}/{os.path.basename(path)}|{stat.st_mtime:.0f}|{stat.st_size}"))
+        return files
+
+    def load_references(self):
+        """Build per-state centroids, reusing cached vectors for unchanged files"""
+        self.centroids = {}
+        files = self._reference_files()
+        if not files:
+            return
+
+        cached = {}
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == FEATURE_VERSION:
+                    cached = data.get('vectors', {})
+            except Exception as e:
+                self.log_message(f"Ignoring screen state cache {self.cache_path}: {e}", "WARN")
+
+        vectors = {}
+        computed = 0
+        for state, path, key in files:
+            vector = cached.get(key)
+            if vector is None:
+                image = cv2.imread(path, cv2.IMREAD_COLOR)
+                if image is None:
+                    self.log_message(f"Could not read screen state reference {path}", "WARN")
+                    continue
+                vector = self.features(image).tolist()
+                computed += 1
+            vectors[key] = vector
+
+        by_state = {}
+        for state, _, key in files:
+            if key in vectors:
+                by_state.setdefault(state, []).append(vectors[key])
+        self.centroids = {state: np.mean(np.array(v, dtype=np.float32), axis=0) for state, v in by_state.items()}
+
+        if computed and self.cache_path:
+            try:
+                with open(self.cache_path, 'w') as f:
+                    json.dump({'version': FEATURE_VERSION, 'vectors': vectors}, f)
+            except Exception as e:
+                self.log_message(f"Failed to save screen state cache: {e}", "WARN")
+
+        self.log_message(f"🖼️  Screen states: {len(vectors)} reference(s) for "
+                         f"{', '.join(sorted(self.centroids))} ({computed} recomputed)", "INFO")
+
+    # ==================== CLASSIFICATION ====================
+
+    def classify(self, frame) -> Tuple[str, float]:
+        """(state, confidence in 0..1) for a capture; also updates time in state"""
+        start = time.perf_counter()
+        vector = self.features(frame)
+        if len(self.centroids) >= 2:
+            state, confidence = self._nearest(vector)
+        else:
+            state, confidence = self._rules(vector)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats['classifications'] += 1
+        self.stats['total_ms'] += elapsed
+        self.stats['last_ms'] = elapsed
+
+        self.observe(state, confidence)
+        return state, confidence
+
+    def _nearest(self, vector: np.ndarray) -> Tuple[str, float]:
+        distances = sorted(
+            (float(np.linalg.norm((vector - centroid) * FEATURE_WEIGHTS)), state)
+            for state, centroid in self.centroids.items()
+        )
+        best, state = distances[0]
+        if best > self.max_distance:
+            return 'unknown', 0.0
+        second = distances[1][0]
+        return state, round(1.0 - best / max(second, 1e-6), 3)
+
+    def _rules(self, vector: np.ndarray) -> Tuple[str, float]:
+        brightness, spread, saturation, edges, _, dialog, buttons = vector[-7:]
+        if dialog:
+            # Two buttons (Leave / Reconnect) is Roblox's disconnect dialog
+            return ('disconnected', 0.7) if buttons >= 1.0 else ('dialog', 0.7)
+        if edges < 0.02 and spread < 0.12:
+            # Roblox loads on a dark neutral screen; a flat bright, colourful or
+            # black frame is something else (a blank page, the desktop, no picture)
+            if brightness > 0.45 or saturation > 0.25 or brightness < 0.03:
+                return 'unknown', 0.0
+            return 'loading', round(float(min(1.0, 0.6 + (0.02 - edges) * 20)), 3)
+        # Saturated blue (the Play button) on a calm page
+        if vector[BLUE_BINS].sum() > 0.02 and edges < 0.25:
+            return 'home', 0.5
+        return 'in_game', 0.5
+
+    def observe(self, state: str, confidence: float = 1.0):
+        """Account the time since the last observation to the previous state"""
+        now = time.monotonic()
+        if self.state is not None and self._since is not None:
+            self.time_in_state[self.state] = self.time_in_state.get(self.state, 0.0) + now - self._since
+        if self.state is not None and state != self.state:
+            self.stats['transitions'] += 1
+        self.state = state
+        self.confidence = confidence
+        self._since = now
+
+    def is_confident(self) -> bool:
+        return self.confidence >= self.min_confidence
+
+    def get_stats(self) -> dict:
+        stats = self.stats.copy()
+        if stats['classifications']:
+            stats['avg_ms'] = round(stats['total_ms'] / stats['classifications'], 3)
+        stats['state'] = self.state
+        stats['confidence'] = self.confidence
+        stats['seconds_in_state'] = {state: round(seconds, 1) for state, seconds in self.time_in_state.items()
+                                     if seconds}
+        return stats
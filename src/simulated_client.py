@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+Simulated Client - in-memory Roblox windows behind the KeeperBackend interface
+
+Lets AnimeVanguardsKeeper / AnimeVanguardsKeeperV2 / KeeperFleet run end
+to end on any host (CI, Linux build agents, benchmarks):
+- SimulatedRobloxClient renders synthetic frames for each screen state
+    home          dark page, blue Play button, green game card, purple title
+    loading       flat dark gray with a small spinner
+    in_game       textured scene with a moving sprite (liveness sees motion)
+    dialog        dimmed scene + gray panel with one white button
+    disconnected  the same panel with two buttons (Leave / Reconnect)
+  plus an idle-timer bar (top left, reset by input) and a short ripple
+  where the last click landed (click verification sees a reaction)
+- every input the client receives is recorded as an InputEvent with a
+  monotonic timestamp; clicks drive the state machine (Play -> loading
+  -> in_game, dialog button -> in_game, Reconnect -> loading)
+- faults can be injected: crash(), hang(seconds), freeze(), show_dialog()
+SimulatedBackend composites its clients onto a virtual desktop for
+capture, routes window messages and screen clicks to them, and reports
+their fake PIDs as processes (not watchable: keepers poll instead).
+Window rects equal client rects (no frame).
+
+Usage:
+    backend = SimulatedBackend()
+    client = backend.add_client(state='in_game')
+    keeper = AnimeVanguardsKeeperV2(base_dir, config_path, backend=backend)
+    keeper.safe_click_roblox()
+    client.events  # -> [InputEvent(t, 'down', x, y, 'postmessage'), ...]
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from capture_service import CaptureService
+from keeper_backends import KeeperBackend
+
+PROCESS_NAME = "RobloxPlayerBeta.exe"
+
+WM_NULL = 0x0000
+WM_LBUTTONDOWN = 0x0201
+WM_LBUTTONUP = 0x0202
+WM_LBUTTONDBLCLK = 0x0203
+
+# Animation ticks per second (frames are cached per tick)
+FPS = 10
+
+# Seconds a click ripple stays visible
+RIPPLE_SECONDS = 0.5
+
+# The idle bar is full after this many seconds without input
+IDLE_FULL_SECONDS = 1200
+
+# Layout of the 1280x720 reference frame, scaled to the client size
+PLAY_BUTTON = (890, 505, 1090, 565)
+GAME_CARD = (310, 330)
+TITLE = (210, 200, 430, 230)
+IDLE_BAR = (8, 8, 108, 14)
+PANEL_SIZE = (460, 260)
+
+
+class InputEvent:
+    """One input a simulated client received"""
+
+    __slots__ = ('t', 'kind', 'x', 'y', 'source')
+
+    def __init__(self, t: float, kind: str, x: int, y: int, source: str):
+        self.t = t              # time.monotonic()
+        self.kind = kind        # 'down' / 'up' / 'dblclk' / 'click' / 'move'
+        self.x = x              # client coordinates
+        self.y = y
+        self.source = source    # click method that delivered it
+
+    def __repr__(self):
+        return f"InputEvent({self.t:.3f}, {self.kind!r}, {self.x}, {self.y}, {self.source!r})"
+
+
+class SimulatedRobloxClient:
+    """One fake Roblox window: state machine, renderer and input log"""
+
+    def __init__(self, hwnd: int, pid: int, x: int = 100, y: int = 100, width: int = 1280,
+                 height: int = 720, state: str = 'in_game', title: str = "Roblox", seed: int = 0):
+        self.hwnd = hwnd
+        self.pid = pid
+        self.title = title
+        self.x, self.y = x, y
+        self.width, self.height = width, height
+        self.seed = seed
+
+        self.state = state
+        self.buttons = 0
+        self.alive = True
+        self.minimized = False
+        self.frozen_at = None
+        self.hung_from = 0.0
+        self.hung_until = 0.0
+        self.ready_at = None            # loading -> in_game at this time
+
+        self.events: List[InputEvent] = []
+        self.dropped = 0                # input lost while hung
+        self.last_input = time.monotonic()
+        self.last_click = None          # (x, y, t)
+        self.started = time.monotonic()
+
+        self._lock = threading.RLock()
+        self._cache_key = None
+        self._cache = None
+        self._build_scene()
+
+    # ========================================
+    # FAULT INJECTION
+    # ========================================
+
+    def crash(self):
+        """Process gone: window and PID disappear"""
+        with self._lock:
+            self.alive = False
+
+    def hang(self, seconds: float):
+        """UI thread stops pumping messages (and drawing) for a while"""
+        with self._lock:
+            self.hung_from = time.monotonic()
+            self.hung_until = self.hung_from + seconds
+
+    def freeze(self, frozen: bool = True):
+        """Picture stops changing while the process keeps answering"""
+        with self._lock:
+            self.frozen_at = time.monotonic() if frozen else None
+
+    def show_dialog(self, buttons: int = 1):
+        """Error dialog (1 button) or disconnect dialog (2 buttons)"""
+        self.set_state('disconnected' if buttons >= 2 else 'dialog')
+
+    def load(self, seconds: float = 2.0):
+        """Loading screen, then in_game"""
+        with self._lock:
+            self.set_state('loading')
+            self.ready_at = time.monotonic() + seconds
+
+    def set_state(self, state: str):
+        with self._lock:
+            self.state = state
+            self.buttons = {'dialog': 1, 'disconnected': 2}.get(state, 0)
+            self.ready_at = None
+
+    @property
+    def hung(self) -> bool:
+        return time.monotonic() < self.hung_until
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_input
+
+    # ========================================
+    # INPUT
+    # ========================================
+
+    def receive(self, kind: str, x: int, y: int, source: str) -> bool:
+        """Deliver one input; False when it was lost (dead or hung client)"""
+        with self._lock:
+            if not self.alive:
+                return False
+            if self.hung:
+                self.dropped += 1
+                return False
+
+            now = time.monotonic()
+            self.events.append(InputEvent(now, kind, x, y, source))
+            if kind != 'move':
+                self.last_input = now
+            if kind in ('up', 'click', 'dblclk'):
+                self.last_click = (x, y, now)
+                self._on_click(x, y)
+            return True
+
+    def _scaled(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x * self.width / 1280), int(y * self.height / 720)
+
+    def _button_rects(self) -> List[Tuple[int, int, int, int]]:
+        """Dialog button rects (x0, y0, x1, y1) in client coordinates"""
+        pw, ph = PANEL_SIZE
+        x0, y0 = (self.width - pw) // 2, (self.height - ph) // 2
+        if self.buttons >= 2:
+            return [(x0 + 30, y0 + 190, x0 + 210, y0 + 235), (x0 + 250, y0 + 190, x0 + 430, y0 + 235)]
+        return [(x0 + 140, y0 + 190, x0 + 320, y0 + 235)]
+
+    def _on_click(self, x: int, y: int):
+        self._advance()
+        if self.state in ('dialog', 'disconnected'):
+            for index, (x0, y0, x1, y1) in enumerate(self._button_rects()):
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    if self.state == 'dialog':
+                        self.set_state('in_game')
+                    elif index == 1:
+                        self.load(2.0)          # Reconnect
+                    else:
+                        self.set_state('home')  # Leave
+                    return
+            return
+
+        if self.state == 'home':
+            bx0, by0 = self._scaled(*PLAY_BUTTON[:2])
+            bx1, by1 = self._scaled(*PLAY_BUTTON[2:])
+            if bx0 <= x <= bx1 and by0 <= y <= by1:
+                self.load(2.0)
+
+    def _advance(self):
+        """Time-driven transitions"""
+        if self.state == 'loading' and self.ready_at is not None and time.monotonic() >= self.ready_at:
+            self.set_state('in_game')
+
+    # ========================================
+    # RENDERING
+    # ========================================
+
+    def _build_scene(self):
+        """Static layers, rebuilt when the window is resized"""
+        rng = np.random.default_rng(self.seed)
+        w, h = self.width, self.height
+
+        # in_game: terrain blocks over a gradient
+        scene = np.zeros((h, w, 4), dtype=np.uint8)
+        scene[..., 0] = np.linspace(60, 110, h, dtype=np.uint8)[:, None]
+        scene[..., 1] = np.linspace(120, 90, h, dtype=np.uint8)[:, None]
+        scene[..., 2] = 70
+        scene[..., 3] = 255
+        for _ in range(40):
+            x0, y0 = int(rng.integers(0, w)), int(rng.integers(h // 3, h))
+            color = tuple(int(c) for c in rng.integers(30, 220, 3)) + (255,)
+            cv2.rectangle(scene, (x0, y0), (x0 + int(rng.integers(20, 120)), y0 + int(rng.integers(20, 80))),
+                          color, -1)
+        self._scene = scene
+
+        # home: the layout keeper_engine's detectors look for
+        home = np.full((h, w, 4), 40, dtype=np.uint8)
+        home[..., 3] = 255
+        cv2.rectangle(home, self._scaled(*PLAY_BUTTON[:2]), self._scaled(*PLAY_BUTTON[2:]), (230, 140, 40, 255), -1)
+        cv2.ellipse(home, self._scaled(*GAME_CARD), self._scaled(90, 60), 20, 0, 360, (40, 190, 30, 255), -1)
+        cv2.rectangle(home, self._scaled(*TITLE[:2]), self._scaled(*TITLE[2:]), (200, 50, 150, 255), -1)
+        self._home = home
+
+        self._cache_key = None
+
+    def _tick(self) -> int:
+        now = self.frozen_at or (self.hung_from if self.hung else time.monotonic())
+        return int((now - self.started) * FPS)
+
+    def render(self) -> np.ndarray:
+        """Current client-area frame (BGRA); cached per animation tick"""
+        with self._lock:
+            self._advance()
+            tick = self._tick()
+            ripple = self.last_click if self.last_click and \
+                time.monotonic() - self.last_click[2] < RIPPLE_SECONDS else None
+            idle = min(1.0, self.idle_seconds / IDLE_FULL_SECONDS)
+            key = (self.state, tick, ripple, round(idle, 2), self.width, self.height)
+            # A frozen or hung client keeps showing its last picture
+            if self._cache is not None and (key == self._cache_key or self.frozen_at or self.hung):
+                return self._cache
+
+            frame = self._render_state(tick)
+            if ripple and self.state != 'loading':
+                cv2.circle(frame, (ripple[0], ripple[1]), 14, (255, 255, 255, 255), 3)
+            self._draw_idle_bar(frame, idle)
+
+            self._cache_key, self._cache = key, frame
+            return frame
+
+    def _render_state(self, tick: int) -> np.ndarray:
+        w, h = self.width, self.height
+
+        if self.state == 'home':
+            return self._home.copy()
+
+        if self.state == 'loading':
+            frame = np.full((h, w, 4), 28, dtype=np.uint8)
+            frame[..., 3] = 255
+            angle = (tick * 36) % 360
+            cv2.ellipse(frame, (w // 2, h * 3 // 4), (10, 10), angle, 0, 90, (90, 90, 90, 255), 2)
+            return frame
+
+        frame = self._scene.copy()
+        # A sprite walking across the scene
+        sx = int((tick * 7) % max(1, w - 40))
+        cv2.rectangle(frame, (sx, h // 2), (sx + 30, h // 2 + 50), (40, 40, 220, 255), -1)
+
+        if self.state in ('dialog', 'disconnected'):
+            frame[..., :3] = (frame[..., :3] * 0.35).astype(np.uint8)
+            pw, ph = PANEL_SIZE
+            x0, y0 = (w - pw) // 2, (h - ph) // 2
+            frame[y0:y0 + ph, x0:x0 + pw, :3] = 57
+            message = "Disconnected: lost connection" if self.buttons >= 2 else "Error: something went wrong"
+            for line in range(3):
+                cv2.putText(frame, message, (x0 + 20, y0 + 50 + line * 30), cv2.FONT_HERSHEY_SIMPLEX,
+                            0.6, (230, 230, 230, 255), 1)
+            for bx0, by0, bx1, by1 in self._button_rects():
+                frame[by0:by1, bx0:bx1, :3] = 255
+        return frame
+
+    def _draw_idle_bar(self, frame: np.ndarray, idle: float):
+        x0, y0, x1, y1 = IDLE_BAR
+        frame[y0:y1, x0:x1, :3] = 20
+        fill = x0 + int((x1 - x0) * idle)
+        if fill > x0:
+            frame[y0:y1, x0:fill, :3] = (0, 200, 255)
+
+
+class SimulatedCapture(CaptureService):
+    """CaptureService over the simulated desktop (same grab / grab_window / save_png API)"""
+
+    def __init__(self, backend: 'SimulatedBackend'):
+        super().__init__()
+        self.backend = backend
+
+    def grab(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        start = time.perf_counter()
+        frame = self.backend.composite(left, top, width, height)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats['frames'] += 1
+        self.stats['total_ms'] += elapsed
+        self.stats['last_ms'] = elapsed
+        return frame
+
+
+class SimulatedBackend(KeeperBackend):
+    """KeeperBackend over SimulatedRobloxClients on a virtual desktop"""
+
+    name = "simulated"
+    watchable = False
+    input_pause = 0.0
+
+    def __init__(self, screen_size: Tuple[int, int] = (1920, 1080), desktop_color: int = 90):
+        self.screen_size = screen_size
+        self.desktop_color = desktop_color
+        self.clients: Dict[int, SimulatedRobloxClient] = {}
+        self.z_order: List[int] = []        # front to back
+        self.foreground: Optional[int] = None
+        self.cursor = (0, 0)
+        self.launches = 0
+        self.capture = SimulatedCapture(self)
+
+        self._lock = threading.RLock()
+        self._next_hwnd = 0x10010
+        self._next_pid = 40000
+
+    # ========================================
+    # CLIENTS
+    # ========================================
+
+    def add_client(self, **kwargs) -> SimulatedRobloxClient:
+        """Start a client (in front, focused); kwargs go to SimulatedRobloxClient"""
+        with self._lock:
+            offset = 40 * len(self.clients)
+            kwargs.setdefault('x', 100 + offset)
+            kwargs.setdefault('y', 100 + offset)
+            kwargs.setdefault('seed', len(self.clients))
+            client = SimulatedRobloxClient(self._next_hwnd, self._next_pid, **kwargs)
+            self._next_hwnd += 0x10
+            self._next_pid += 4
+            self.clients[client.hwnd] = client
+            self.z_order.insert(0, client.hwnd)
+            self.foreground = client.hwnd
+            return client
+
+    def _live(self, hwnd: int) -> Optional[SimulatedRobloxClient]:
+        client = self.clients.get(hwnd)
+        return client if client and client.alive else None
+
+    def client_at(self, x: int, y: int) -> Optional[SimulatedRobloxClient]:
+        """Front-most visible client under a screen point"""
+        with self._lock:
+            for hwnd in self.z_order:
+                client = self._live(hwnd)
+                if client and not client.minimized and \
+                        client.x <= x < client.x + client.width and client.y <= y < client.y + client.height:
+                    return client
+        return None
+
+    # ========================================
+    # WINDOWS
+    # ========================================
+
+    def enum_windows(self) -> List[Tuple[int, str]]:
+        with self._lock:
+            return [(hwnd, self.clients[hwnd].title) for hwnd in self.z_order if self._live(hwnd)]
+
+    def is_window(self, hwnd: int) -> bool:
+        return self._live(hwnd) is not None
+
+    def window_title(self, hwnd: int) -> str:
+        client = self._live(hwnd)
+        return client.title if client else ""
+
+    def is_visible(self, hwnd: int) -> bool:
+        return self._live(hwnd) is not None
+
+    def is_minimized(self, hwnd: int) -> bool:
+        client = self._live(hwnd)
+        return bool(client and client.minimized)
+
+    def client_rect(self, hwnd: int) -> Optional[dict]:
+        client = self._live(hwnd)
+        if not client:
+            return None
+        return {'x': client.x, 'y': client.y, 'width': client.width, 'height': client.height}
+
+    def window_rect(self, hwnd: int) -> Optional[dict]:
+        return self.client_rect(hwnd)
+
+    def foreground_window(self) -> Optional[int]:
+        return self.foreground if self._live(self.foreground) else None
+
+    def activate(self, hwnd: int) -> bool:
+        with self._lock:
+            client = self._live(hwnd)
+            if not client:
+                return False
+            client.minimized = False
+            self.z_order.remove(hwnd)
+            self.z_order.insert(0, hwnd)
+            self.foreground = hwnd
+            return True
+
+    def move_window(self, hwnd: int, x: int, y: int, width: int, height: int) -> bool:
+        client = self._live(hwnd)
+        if not client:
+            return False
+        with client._lock:
+            client.x, client.y = x, y
+            if (width, height) != (client.width, client.height):
+                client.width, client.height = width, height
+                client._build_scene()
+        return True
+
+    # ========================================
+    # CAPTURE
+    # ========================================
+
+    def composite(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        """Screen region: desktop, then every visible client back to front"""
+        out = np.full((height, width, 4), self.desktop_color, dtype=np.uint8)
+        out[..., 3] = 255
+        with self._lock:
+            order = list(reversed(self.z_order))
+        for hwnd in order:
+            client = self._live(hwnd)
+            if not client or client.minimized:
+                continue
+            x0, y0 = max(left, client.x), max(top, client.y)
+            x1 = min(left + width, client.x + client.width)
+            y1 = min(top + height, client.y + client.height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            frame = client.render()
+            out[y0 - top:y1 - top, x0 - left:x1 - left] = frame[y0 - client.y:y1 - client.y,
+                                                                x0 - client.x:x1 - client.x]
+        return out
+
+    # ========================================
+    # INPUT
+    # ========================================
+
+    def has_input(self, method: str) -> bool:
+        return True
+
+    def _message_event(self, msg: int) -> Optional[str]:
+        return {WM_LBUTTONDOWN: 'down', WM_LBUTTONUP: 'up', WM_LBUTTONDBLCLK: 'dblclk'}.get(msg)
+
+    def post_message(self, hwnd: int, msg: int, wparam: int, lparam: int) -> bool:
+        client = self._live(hwnd)
+        if not client:
+            return False
+        # Queued even when hung: the input is silently lost (like a real hung window)
+        kind = self._message_event(msg)
+        if kind:
+            client.receive(kind, lparam & 0xFFFF, (lparam >> 16) & 0xFFFF, 'postmessage')
+        return True
+
+    def send_message(self, hwnd: int, msg: int, wparam: int, lparam: int,
+                     timeout_ms: int) -> Tuple[bool, bool]:
+        client = self._live(hwnd)
+        if not client:
+            return False, False
+        if client.hung:
+            # Blocks until the budget runs out (or the hang ends first), then reports a timeout
+            time.sleep(min(timeout_ms / 1000.0, max(0.0, client.hung_until - time.monotonic())))
+            return False, True
+        kind = self._message_event(msg)
+        if kind:
+            client.receive(kind, lparam & 0xFFFF, (lparam >> 16) & 0xFFFF, 'sendmessage')
+        return True, False
+
+    def move_cursor(self, x: int, y: int, method: str = 'pyautogui'):
+        self.cursor = (x, y)
+        client = self.client_at(x, y)
+        if client:
+            client.receive('move', x - client.x, y - client.y, method)
+
+    def click(self, x: int, y: int, clicks: int = 1, method: str = 'pyautogui'):
+        self.cursor = (x, y)
+        client = self.client_at(x, y)
+        if client:
+            for _ in range(clicks):
+                client.receive('click', x - client.x, y - client.y, method)
+
+    def cursor_position(self, method: str = 'pyautogui') -> Tuple[int, int]:
+        return self.cursor
+
+    # ========================================
+    # PROCESSES
+    # ========================================
+
+    def process_ids(self, process_name: str) -> List[int]:
+        if process_name != PROCESS_NAME:
+            return []
+        with self._lock:
+            return [client.pid for client in self.clients.values() if client.alive]
+
+    def terminate_processes(self, process_name: str, timeout: float = 10.0) -> int:
+        closed = 0
+        for pid in self.process_ids(process_name):
+            for client in list(self.clients.values()):
+                if client.pid == pid:
+                    client.crash()
+                    closed += 1
+        return closed
+
+    def launch_roblox(self) -> bool:
+        """A fresh client on the home page (replaces dead ones)"""
+        with self._lock:
+            self.launches += 1
+            self.z_order = [hwnd for hwnd in self.z_order if self._live(hwnd)]
+            if not self.z_order:
+                self.add_client(state='home')
+        return True
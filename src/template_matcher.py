@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Template Matcher - preloaded reference crops + normalized cross-correlation
+
+The game card heuristics ("largest green blob is the dragon", purple
+title text) are slow and easily fooled by a crowded home screen. A
+reference crop of the card matched with TM_CCOEFF_NORMED is both more
+specific and cheaper when restricted to an ROI, and it gives a
+confidence score the voting can act on.
+
+Templates live in <directory>/<target>/*.png (calibrate_coordinates.py
+saves them), captured at reference_width window width. They are loaded
+once, converted to grayscale up front, and resized copies for other
+window sizes / pyramid levels are cached on first use.
+
+Config:
+    "template_matching": {
+        "enabled": true,
+        "directory": "templates",
+        "reference_width": 1280,
+        "min_confidence": 0.7,
+        "short_circuit_confidence": 0.9
+    }
+"""
+
+import glob
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from frame_analysis import FrameAnalysis
+
+
+class TemplateCache:
+    """Grayscale reference templates per target, with per-scale copies"""
+
+    def __init__(self, directory: str, reference_width: int = 1280, log_callback: Optional[Callable] = None):
+        self.directory = directory
+        self.reference_width = reference_width
+        self.log_callback = log_callback
+
+        self.templates: Dict[str, List[Tuple[str, np.ndarray]]] = {}   # target -> [(name, gray)]
+        self._scaled = {}   # (target, scale) -> [(name, gray)]
+
+        self.stats = {
+            'matches': 0,
+            'total_ms': 0.0
+        }
+
+    def log_message(self, message: str, level: str = "INFO"):
+        """Log message to callback"""
+        if self.log_callback:
+            self.log_callback(message, level)
+        else:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] [{level}] {message}")
+
+    def load(self) -> int:
+        """(Re)load every template from disk; returns how many were loaded"""
+        self.templates = {}
+        self._scaled = {}
+
+        if not os.path.isdir(self.directory):
+            return 0
+
+        count = 0
+        for path in sorted(glob.glob(os.path.join(self.directory, '*', '*.png'))):
+            target = os.path.basename(os.path.dirname(path))
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                self.log_message(f"Unreadable template: {path}", "WARN")
+                continue
+            self.templates.setdefault(target, []).append((os.path.basename(path), image))
+            count += 1
+
+        if count:
+            self.log_message(f"🧩 Loaded {count} template(s) for: {', '.join(sorted(self.templates))}", "INFO")
+        return count
+
+    def has_target(self, target: str) -> bool:
+        return target in self.templates
+
+    def templates_for(self, target: str, scale: float) -> List[Tuple[str, np.ndarray]]:
+        """Templates of a target resized by scale (cached)"""
+        scale = round(scale, 3)
+        key = (target, scale)
+        scaled = self._scaled.get(key)
+        if scaled is None:
+            scaled = []
+            for name, image in self.templates.get(target, []):
+                if scale != 1.0:
+                    size = (max(1, int(image.shape[1] * scale)), max(1, int(image.shape[0] * scale)))
+                    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+                    image = cv2.resize(image, size, interpolation=interpolation)
+                scaled.append((name, image))
+            self._scaled[key] = scaled
+        return scaled
+
+    def match(self, img, target: str, window_width: Optional[int] = None) -> Optional[Tuple[int, int, float]]:
+        """
+        Best match of a target's templates in img
+
+        img is a frame, crop or FrameAnalysis (any pyramid level);
+        window_width is the full window width, used to scale templates
+        from reference_width. Returns (x, y, confidence) with the match
+        centre in img's full-resolution units, or None.
+        """
+        if target not in self.templates:
+            return None
+
+        start = time.perf_counter()
+        img = FrameAnalysis.of(img)
+        gray = img.gray
+
+        scale = img.scale
+        if window_width:
+            scale *= window_width / self.reference_width
+
+        best = None
+        for _, template in self.templates_for(target, scale):
+            th, tw = template.shape[:2]
+            if th > gray.shape[0] or tw > gray.shape[1]:
+                continue
+
+            result = cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED)
+            _, confidence, _, (x, y) = cv2.minMaxLoc(result)
+
+            if best is None or confidence > best[2]:
+                best = ((x + tw / 2) / img.scale, (y + th / 2) / img.scale, confidence)
+
+        self.stats['matches'] += 1
+        self.stats['total_ms'] += (time.perf_counter() - start) * 1000
+
+        if best is None:
+            return None
+        return (int(best[0]), int(best[1]), float(best[2]))
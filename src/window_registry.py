@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Window Registry - cached Roblox window handles and geometry
+
+One V2 safe_click_roblox used to enumerate every top-level window three
+or more times: get_window_rect -> get_window_handle (a full EnumWindows
+with a Python callback), again inside the click method, and once more
+when directinput/pyautogui asked for the rect. WindowRegistry keeps
+hwnd -> title / client rect / visibility and:
+- enumerates only on a miss, when validation fails, or every
+  refresh_seconds (new windows)
+- validates a handle with one IsWindow call, remembered for
+  validate_seconds - so a whole click sequence costs one validation
+- re-reads geometry only when it is older than rect_seconds
+One registry is shared per process and backend (shared_registry()):
+every V2 keeper, the fleet and the async engine read the same cache.
+Window calls go through the keeper backend (keeper_backends).
+
+Config:
+    "window_registry": {
+        "refresh_seconds": 30,
+        "validate_seconds": 1.0,
+        "rect_seconds": 2.0
+    }
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from keeper_backends import KeeperBackend, default_backend
+
+
+class WindowInfo:
+    """Cached facts about one top-level window"""
+
+    __slots__ = ('hwnd', 'title', 'visible', 'minimized', 'rect', 'validated_at', 'rect_at')
+
+    def __init__(self, hwnd: int, title: str):
+        self.hwnd = hwnd
+        self.title = title
+        self.visible = True
+        self.minimized = False
+        self.rect = None            # client area on screen: {'x', 'y', 'width', 'height'}
+        self.validated_at = 0.0
+        self.rect_at = 0.0
+
+
+class WindowRegistry:
+    """hwnd -> WindowInfo cache with cheap validation and lazy refresh"""
+
+    def __init__(self, config: dict = None, backend: Optional[KeeperBackend] = None):
+        self.backend = backend or default_backend()
+        self._windows: Dict[int, WindowInfo] = {}
+        self._order: List[int] = []           # handles in enumeration order
+        self._enumerated_at = 0.0
+        self._title_match = None
+        self._lock = threading.RLock()
+
+        self.stats = {
+            'enumerations': 0,
+            'validations': 0,
+            'rect_reads': 0,
+            'cache_hits': 0,
+            'invalidated': 0
+        }
+
+        self.configure(config or {})
+
+    def configure(self, config: dict):
+        settings = config.get('window_registry', {})
+        self.refresh_seconds = settings.get('refresh_seconds', 30)
+        self.validate_seconds = settings.get('validate_seconds', 1.0)
+        self.rect_seconds = settings.get('rect_seconds', 2.0)
+
+    # ========================================
+    # ENUMERATION
+    # ========================================
+
+    def enumerate(self, title_match: str = "Roblox") -> List[int]:
+        """One EnumWindows pass: handles of visible windows whose title contains title_match"""
+        found = [(hwnd, title) for hwnd, title in self.backend.enum_windows() if title_match in title]
+
+        now = time.monotonic()
+        with self._lock:
+            self.stats['enumerations'] += 1
+            windows = {}
+            for hwnd, title in found:
+                info = self._windows.get(hwnd) or WindowInfo(hwnd, title)
+                info.title = title
+                info.visible = True
+                info.validated_at = now
+                windows[hwnd] = info
+            self._windows = windows
+            self._order = [hwnd for hwnd, _ in found]
+            self._enumerated_at = now
+            self._title_match = title_match
+            return list(self._order)
+
+    def handles(self, title_match: str = "Roblox") -> List[int]:
+        """Cached handles, re-enumerated when stale or empty"""
+        with self._lock:
+            fresh = time.monotonic() - self._enumerated_at < self.refresh_seconds
+            if fresh and self._order and title_match == self._title_match:
+                self.stats['cache_hits'] += 1
+                return list(self._order)
+        return self.enumerate(title_match)
+
+    def first(self, title_match: str = "Roblox") -> Optional[int]:
+        """First matching window that is still valid"""
+        for hwnd in self.handles(title_match):
+            if self.validate(hwnd):
+                return hwnd
+        # Every cached handle was stale: look again once
+        for hwnd in self.enumerate(title_match):
+            if self.validate(hwnd):
+                return hwnd
+        return None
+
+    # ========================================
+    # VALIDATION / GEOMETRY
+    # ========================================
+
+    def validate(self, hwnd: int) -> bool:
+        """Is hwnd still a window? One IsWindow call per validate_seconds"""
+        if not hwnd:
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            info = self._windows.get(hwnd)
+            if info and now - info.validated_at < self.validate_seconds:
+                self.stats['cache_hits'] += 1
+                return True
+
+        self.stats['validations'] += 1
+        if not self.backend.is_window(hwnd):
+            self.invalidate(hwnd)
+            return False
+
+        with self._lock:
+            info = self._windows.get(hwnd)
+            if info is None:
+                info = WindowInfo(hwnd, self.backend.window_title(hwnd))
+                self._windows[hwnd] = info
+            info.validated_at = now
+        return True
+
+    def info(self, hwnd: int) -> Optional[WindowInfo]:
+        """Validated WindowInfo with geometry no older than rect_seconds"""
+        if not self.validate(hwnd):
+            return None
+
+        with self._lock:
+            info = self._windows.get(hwnd)
+            if info is None:
+                return None
+            if info.rect is not None and time.monotonic() - info.rect_at < self.rect_seconds:
+                return info
+
+        self._read_geometry(info)
+        return info
+
+    def rect(self, hwnd: int) -> Optional[dict]:
+        """Client area of hwnd in screen coordinates (cached copy)"""
+        info = self.info(hwnd)
+        if info is None or info.rect is None:
+            return None
+        return dict(info.rect)
+
+    def _read_geometry(self, info: WindowInfo):
+        self.stats['rect_reads'] += 1
+        try:
+            rect = self.backend.client_rect(info.hwnd)
+            visible = self.backend.is_visible(info.hwnd)
+            minimized = self.backend.is_minimized(info.hwnd)
+        except Exception:
+            rect = None
+        if rect is None:
+            # Window vanished between validation and the read
+            self.invalidate(info.hwnd)
+            return
+
+        with self._lock:
+            info.rect = rect
+            info.visible = visible
+            info.minimized = minimized
+            info.rect_at = time.monotonic()
+
+    def invalidate(self, hwnd: Optional[int] = None):
+        """Drop one window (or everything) so the next lookup re-reads it"""
+        with self._lock:
+            if hwnd is None:
+                self._windows.clear()
+                self._order = []
+                self._enumerated_at = 0.0
+                return
+            if self._windows.pop(hwnd, None) is not None:
+                self.stats['invalidated'] += 1
+            if hwnd in self._order:
+                self._order.remove(hwnd)
+
+    def get_stats(self) -> dict:
+        stats = self.stats.copy()
+        stats['windows'] = len(self._windows)
+        return stats
+
+
+_shared: Dict[int, WindowRegistry] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_registry(config: dict = None, backend: Optional[KeeperBackend] = None) -> WindowRegistry:
+    """The process-wide registry of a backend (configured by its first caller)"""
+    backend = backend or default_backend()
+    with _shared_lock:
+        registry = _shared.get(id(backend))
+        if registry is None:
+            registry = WindowRegistry(config, backend)
+            _shared[id(backend)] = registry
+        return registry
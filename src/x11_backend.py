@@ -0,0 +1,650 @@
+#!/usr/bin/env python3
+"""
+X11 Backend - the keeper pipeline on Linux X servers (Xvfb included)
+
+NativeBackend only works on Windows, so on Linux the keepers could run
+against the simulator but never against a real window. X11Backend
+implements the KeeperBackend interface with plain Xlib through ctypes
+(no python-xlib dependency):
+- windows: EWMH - _NET_CLIENT_LIST_STACKING for discovery,
+  _NET_WM_NAME titles, _NET_ACTIVE_WINDOW focus, _NET_WM_STATE_HIDDEN
+  for minimized; without a window manager (bare Xvfb) it falls back to
+  the root window's viewable children and XSetInputFocus
+- capture: MIT-SHM - XShmGetImage into shared-memory XImages that are
+  created once per region size; frames are BGRA NumPy views over the
+  segment, so nothing is copied after the server writes the pixels.
+  shm_buffers segments per size rotate, so a frame stays valid until
+  that many more grabs of the same size. Without MIT-SHM (remote
+  display) capture falls back to mss
+- input: 'postmessage' sends synthetic ButtonPress/ButtonRelease
+  events to the window under the point (no cursor or focus change,
+  like PostMessage); 'pyautogui' moves the real pointer and clicks
+  through XTest. Window messages have no blocking X11 equivalent, so
+  'sendmessage' and 'directinput' are unavailable
+- processes: psutil, as on Windows; launch_command starts the client
+Capture is timed into the same CaptureService stats and input goes
+through the keeper's InputDispatcher, so fps and per-method latency
+are reported exactly as for the Windows methods.
+
+Config:
+    "x11_backend": {
+        "display": null,
+        "shm_buffers": 2,
+        "launch_command": null
+    }
+"""
+
+import ctypes
+import ctypes.util
+import os
+import shlex
+import subprocess
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from capture_service import CaptureService
+from keeper_backends import NativeBackend, POST_MESSAGE, PYAUTOGUI
+
+
+def _load(name: str):
+    path = ctypes.util.find_library(name)
+    try:
+        return ctypes.CDLL(path or f"lib{name}.so.6")
+    except OSError:
+        return None
+
+
+xlib = _load('X11')
+xext = _load('Xext')
+xtst = _load('Xtst')
+libc = ctypes.CDLL(None, use_errno=True) if os.name != 'nt' else None
+
+X11_AVAILABLE = xlib is not None and libc is not None
+
+# Xlib constants
+ZPIXMAP = 2
+IS_VIEWABLE = 2
+BUTTON_PRESS = 4
+BUTTON_RELEASE = 5
+CLIENT_MESSAGE = 33
+BUTTON_PRESS_MASK = 1 << 2
+BUTTON_RELEASE_MASK = 1 << 3
+SUBSTRUCTURE_NOTIFY_MASK = 1 << 19
+SUBSTRUCTURE_REDIRECT_MASK = 1 << 20
+BUTTON1_MASK = 1 << 8
+REVERT_TO_PARENT = 2
+CURRENT_TIME = 0
+ANY_PROPERTY_TYPE = 0
+ALL_PLANES = 0xFFFFFFFFFFFFFFFF
+
+# SysV shared memory
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+
+# Window messages the keepers post (keeper_engine_v2 WM_* values)
+WM_NULL = 0x0000
+WM_LBUTTONDOWN = 0x0201
+WM_LBUTTONUP = 0x0202
+WM_LBUTTONDBLCLK = 0x0203
+
+Window = ctypes.c_ulong
+Atom = ctypes.c_ulong
+
+
+class XImage(ctypes.Structure):
+    # Leading fields only; the struct is always owned by Xlib
+    _fields_ = [('width', ctypes.c_int), ('height', ctypes.c_int), ('xoffset', ctypes.c_int),
+                ('format', ctypes.c_int), ('data', ctypes.c_void_p), ('byte_order', ctypes.c_int),
+                ('bitmap_unit', ctypes.c_int), ('bitmap_bit_order', ctypes.c_int),
+                ('bitmap_pad', ctypes.c_int), ('depth', ctypes.c_int), ('bytes_per_line', ctypes.c_int),
+                ('bits_per_pixel', ctypes.c_int)]
+
+
+class XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [('shmseg', ctypes.c_ulong), ('shmid', ctypes.c_int),
+                ('shmaddr', ctypes.c_void_p), ('readOnly', ctypes.c_int)]
+
+
+class XWindowAttributes(ctypes.Structure):
+    _fields_ = [('x', ctypes.c_int), ('y', ctypes.c_int), ('width', ctypes.c_int), ('height', ctypes.c_int),
+                ('border_width', ctypes.c_int), ('depth', ctypes.c_int), ('visual', ctypes.c_void_p),
+                ('root', Window), ('class_', ctypes.c_int), ('bit_gravity', ctypes.c_int),
+                ('win_gravity', ctypes.c_int), ('backing_store', ctypes.c_int),
+                ('backing_planes', ctypes.c_ulong), ('backing_pixel', ctypes.c_ulong),
+                ('save_under', ctypes.c_int), ('colormap', ctypes.c_ulong), ('map_installed', ctypes.c_int),
+                ('map_state', ctypes.c_int), ('all_event_masks', ctypes.c_long),
+                ('your_event_mask', ctypes.c_long), ('do_not_propagate_mask', ctypes.c_long),
+                ('override_redirect', ctypes.c_int), ('screen', ctypes.c_void_p)]
+
+
+class XButtonEvent(ctypes.Structure):
+    _fields_ = [('type', ctypes.c_int), ('serial', ctypes.c_ulong), ('send_event', ctypes.c_int),
+                ('display', ctypes.c_void_p), ('window', Window), ('root', Window), ('subwindow', Window),
+                ('time', ctypes.c_ulong), ('x', ctypes.c_int), ('y', ctypes.c_int),
+                ('x_root', ctypes.c_int), ('y_root', ctypes.c_int), ('state', ctypes.c_uint),
+                ('button', ctypes.c_uint), ('same_screen', ctypes.c_int)]
+
+
+class XClientMessageEvent(ctypes.Structure):
+    _fields_ = [('type', ctypes.c_int), ('serial', ctypes.c_ulong), ('send_event', ctypes.c_int),
+                ('display', ctypes.c_void_p), ('window', Window), ('message_type', Atom),
+                ('format', ctypes.c_int), ('data', ctypes.c_long * 5)]
+
+
+class XEvent(ctypes.Union):
+    _fields_ = [('type', ctypes.c_int), ('xbutton', XButtonEvent),
+                ('xclient', XClientMessageEvent), ('pad', ctypes.c_long * 24)]
+
+
+XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+
+def _declare(lib, name: str, restype, *argtypes):
+    func = getattr(lib, name)
+    func.restype = restype
+    func.argtypes = argtypes
+
+
+if X11_AVAILABLE:
+    _dpy = ctypes.c_void_p
+    _declare(xlib, 'XInitThreads', ctypes.c_int)
+    _declare(xlib, 'XOpenDisplay', _dpy, ctypes.c_char_p)
+    _declare(xlib, 'XCloseDisplay', ctypes.c_int, _dpy)
+    _declare(xlib, 'XSetErrorHandler', ctypes.c_void_p, XErrorHandler)
+    _declare(xlib, 'XDefaultRootWindow', Window, _dpy)
+    _declare(xlib, 'XDefaultScreen', ctypes.c_int, _dpy)
+    _declare(xlib, 'XDefaultVisual', ctypes.c_void_p, _dpy, ctypes.c_int)
+    _declare(xlib, 'XDefaultDepth', ctypes.c_int, _dpy, ctypes.c_int)
+    _declare(xlib, 'XDisplayWidth', ctypes.c_int, _dpy, ctypes.c_int)
+    _declare(xlib, 'XDisplayHeight', ctypes.c_int, _dpy, ctypes.c_int)
+    _declare(xlib, 'XInternAtom', Atom, _dpy, ctypes.c_char_p, ctypes.c_int)
+    _declare(xlib, 'XGetWindowProperty', ctypes.c_int, _dpy, Window, Atom, ctypes.c_long, ctypes.c_long,
+             ctypes.c_int, Atom, ctypes.POINTER(Atom), ctypes.POINTER(ctypes.c_int),
+             ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+             ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte)))
+    _declare(xlib, 'XFree', ctypes.c_int, ctypes.c_void_p)
+    _declare(xlib, 'XQueryTree', ctypes.c_int, _dpy, Window, ctypes.POINTER(Window), ctypes.POINTER(Window),
+             ctypes.POINTER(ctypes.POINTER(Window)), ctypes.POINTER(ctypes.c_uint))
+    _declare(xlib, 'XGetWindowAttributes', ctypes.c_int, _dpy, Window, ctypes.POINTER(XWindowAttributes))
+    _declare(xlib, 'XTranslateCoordinates', ctypes.c_int, _dpy, Window, Window, ctypes.c_int, ctypes.c_int,
+             ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(Window))
+    _declare(xlib, 'XFetchName', ctypes.c_int, _dpy, Window, ctypes.POINTER(ctypes.c_char_p))
+    _declare(xlib, 'XGetInputFocus', ctypes.c_int, _dpy, ctypes.POINTER(Window), ctypes.POINTER(ctypes.c_int))
+    _declare(xlib, 'XSetInputFocus', ctypes.c_int, _dpy, Window, ctypes.c_int, ctypes.c_ulong)
+    _declare(xlib, 'XMapRaised', ctypes.c_int, _dpy, Window)
+    _declare(xlib, 'XMoveResizeWindow', ctypes.c_int, _dpy, Window, ctypes.c_int, ctypes.c_int,
+             ctypes.c_uint, ctypes.c_uint)
+    _declare(xlib, 'XSendEvent', ctypes.c_int, _dpy, Window, ctypes.c_int, ctypes.c_long, ctypes.POINTER(XEvent))
+    _declare(xlib, 'XQueryPointer', ctypes.c_int, _dpy, Window, ctypes.POINTER(Window), ctypes.POINTER(Window),
+             ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+             ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_uint))
+    _declare(xlib, 'XFlush', ctypes.c_int, _dpy)
+    _declare(xlib, 'XSync', ctypes.c_int, _dpy, ctypes.c_int)
+
+    # Display connections are shared between the keeper thread and the dispatcher pool
+    xlib.XInitThreads()
+
+if xext and X11_AVAILABLE:
+    _declare(xext, 'XShmQueryExtension', ctypes.c_int, ctypes.c_void_p)
+    _declare(xext, 'XShmCreateImage', ctypes.POINTER(XImage), ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint,
+             ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint)
+    _declare(xext, 'XShmAttach', ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo))
+    _declare(xext, 'XShmDetach', ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo))
+    _declare(xext, 'XShmGetImage', ctypes.c_int, ctypes.c_void_p, Window, ctypes.POINTER(XImage),
+             ctypes.c_int, ctypes.c_int, ctypes.c_ulong)
+
+if xtst:
+    _declare(xtst, 'XTestQueryExtension', ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(ctypes.c_int),
+             ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int))
+    _declare(xtst, 'XTestFakeMotionEvent', ctypes.c_int, ctypes.c_void_p, ctypes.c_int, ctypes.c_int,
+             ctypes.c_int, ctypes.c_ulong)
+    _declare(xtst, 'XTestFakeButtonEvent', ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int,
+             ctypes.c_ulong)
+
+if libc:
+    _declare(libc, 'shmget', ctypes.c_int, ctypes.c_int, ctypes.c_size_t, ctypes.c_int)
+    _declare(libc, 'shmat', ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p, ctypes.c_int)
+    _declare(libc, 'shmdt', ctypes.c_int, ctypes.c_void_p)
+    _declare(libc, 'shmctl', ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_void_p)
+
+# Xlib's default error handler exits the process; count errors instead
+# (BadWindow from a window that just closed is routine here)
+_x_errors = {'count': 0}
+
+
+@XErrorHandler
+def _on_x_error(display, event):
+    _x_errors['count'] += 1
+    return 0
+
+
+if X11_AVAILABLE:
+    xlib.XSetErrorHandler(_on_x_error)
+
+
+class X11Display:
+    """One Xlib connection, serialized by a lock, plus the helpers the backend needs"""
+
+    def __init__(self, name: Optional[str] = None):
+        self.lock = threading.RLock()
+        self.dpy = xlib.XOpenDisplay(name.encode() if name else None)
+        if not self.dpy:
+            raise RuntimeError(f"cannot open X display {name or os.environ.get('DISPLAY')!r}")
+        self.screen = xlib.XDefaultScreen(self.dpy)
+        self.root = xlib.XDefaultRootWindow(self.dpy)
+        self._atoms = {}
+
+    def atom(self, name: str) -> int:
+        value = self._atoms.get(name)
+        if value is None:
+            value = self._atoms[name] = xlib.XInternAtom(self.dpy, name.encode(), False)
+        return value
+
+    def screen_size(self) -> Tuple[int, int]:
+        return xlib.XDisplayWidth(self.dpy, self.screen), xlib.XDisplayHeight(self.dpy, self.screen)
+
+    def get_property(self, window: int, name: str, max_items: int = 1024) -> Optional[Tuple[int, bytes, int]]:
+        """(format, raw bytes, item count) of a window property, None when unset"""
+        actual_type, actual_format = Atom(), ctypes.c_int()
+        nitems, bytes_after = ctypes.c_ulong(), ctypes.c_ulong()
+        data = ctypes.POINTER(ctypes.c_ubyte)()
+        status = xlib.XGetWindowProperty(self.dpy, window, self.atom(name), 0, max_items, False,
+                                         ANY_PROPERTY_TYPE, ctypes.byref(actual_type), ctypes.byref(actual_format),
+                                         ctypes.byref(nitems), ctypes.byref(bytes_after), ctypes.byref(data))
+        if status != 0 or not data:
+            return None
+        try:
+            if not actual_type.value:
+                return None
+            # Format-32 items are C longs on the client side
+            item_size = {8: 1, 16: ctypes.sizeof(ctypes.c_short), 32: ctypes.sizeof(ctypes.c_long)}[actual_format.value]
+            return actual_format.value, ctypes.string_at(data, nitems.value * item_size), nitems.value
+        finally:
+            xlib.XFree(data)
+
+    def get_longs(self, window: int, name: str) -> List[int]:
+        prop = self.get_property(window, name)
+        if not prop or prop[0] != 32:
+            return []
+        return list((ctypes.c_ulong * prop[2]).from_buffer_copy(prop[1]))
+
+    def attributes(self, window: int) -> Optional[XWindowAttributes]:
+        attributes = XWindowAttributes()
+        if not window or not xlib.XGetWindowAttributes(self.dpy, window, ctypes.byref(attributes)):
+            return None
+        return attributes
+
+    def translate(self, src: int, dst: int, x: int, y: int) -> Tuple[int, int, int]:
+        """Coordinates of (x, y) in src relative to dst, and dst's child under it"""
+        dx, dy, child = ctypes.c_int(), ctypes.c_int(), Window()
+        xlib.XTranslateCoordinates(self.dpy, src, dst, x, y, ctypes.byref(dx), ctypes.byref(dy), ctypes.byref(child))
+        return dx.value, dy.value, child.value
+
+    def children(self, window: int) -> List[int]:
+        """Children bottom to top"""
+        root, parent = Window(), Window()
+        children, count = ctypes.POINTER(Window)(), ctypes.c_uint()
+        if not xlib.XQueryTree(self.dpy, window, ctypes.byref(root), ctypes.byref(parent),
+                               ctypes.byref(children), ctypes.byref(count)):
+            return []
+        try:
+            return [children[i] for i in range(count.value)]
+        finally:
+            if children:
+                xlib.XFree(children)
+
+    def close(self):
+        with self.lock:
+            if self.dpy:
+                xlib.XCloseDisplay(self.dpy)
+                self.dpy = None
+
+
+# ========================================
+# CAPTURE
+# ========================================
+
+class ShmImage:
+    """A shared-memory XImage and the BGRA NumPy view over its pixels"""
+
+    def __init__(self, display: X11Display, width: int, height: int):
+        self.display = display
+        self.info = XShmSegmentInfo()
+        self.image = xext.XShmCreateImage(display.dpy, xlib.XDefaultVisual(display.dpy, display.screen),
+                                          xlib.XDefaultDepth(display.dpy, display.screen), ZPIXMAP, None,
+                                          ctypes.byref(self.info), width, height)
+        if not self.image:
+            raise RuntimeError("XShmCreateImage failed")
+
+        image = self.image.contents
+        if image.bits_per_pixel != 32:
+            xlib.XFree(self.image)
+            raise RuntimeError(f"unsupported {image.bits_per_pixel} bpp visual")
+
+        size = image.bytes_per_line * height
+        self.info.shmid = libc.shmget(IPC_PRIVATE, size, IPC_CREAT | 0o600)
+        if self.info.shmid < 0:
+            xlib.XFree(self.image)
+            raise RuntimeError(f"shmget failed (errno {ctypes.get_errno()})")
+        address = libc.shmat(self.info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(self.info.shmid, IPC_RMID, None)
+            xlib.XFree(self.image)
+            raise RuntimeError(f"shmat failed (errno {ctypes.get_errno()})")
+
+        self.info.shmaddr = address
+        self.info.readOnly = False
+        image.data = address
+
+        errors = _x_errors['count']
+        xext.XShmAttach(display.dpy, ctypes.byref(self.info))
+        xlib.XSync(display.dpy, False)
+        # Marked for removal now: the segment goes away with the last detach, even on a crash
+        libc.shmctl(self.info.shmid, IPC_RMID, None)
+        if _x_errors['count'] != errors:
+            libc.shmdt(address)
+            xlib.XFree(self.image)
+            raise RuntimeError("XShmAttach failed (server cannot share memory with this client)")
+
+        # ZPixmap, 32 bpp, little-endian: B, G, R, pad per pixel
+        buffer = (ctypes.c_ubyte * size).from_address(address)
+        self.frame = np.ndarray((height, width, 4), dtype=np.uint8, buffer=buffer,
+                                strides=(image.bytes_per_line, 4, 1))
+
+    def grab(self, left: int, top: int) -> bool:
+        return bool(xext.XShmGetImage(self.display.dpy, self.display.root, self.image, left, top, ALL_PLANES))
+
+    def close(self):
+        xext.XShmDetach(self.display.dpy, ctypes.byref(self.info))
+        xlib.XSync(self.display.dpy, False)
+        libc.shmdt(self.info.shmaddr)
+        # The data pointer is the detached segment, so only the struct is freed
+        self.image.contents.data = None
+        xlib.XFree(self.image)
+
+
+class X11Capture(CaptureService):
+    """MIT-SHM grabs of the root window; mss for what SHM cannot serve"""
+
+    def __init__(self, display: X11Display, buffers: int = 2):
+        super().__init__()
+        self.display = display
+        self.buffers = max(1, buffers)
+        self.shm = bool(xext and xext.XShmQueryExtension(display.dpy))
+        self._images = {}   # (width, height) -> [ShmImage, ...]
+        self._turn = {}     # (width, height) -> index of the next image to fill
+
+    def _image(self, width: int, height: int) -> Optional[ShmImage]:
+        key = (width, height)
+        ring = self._images.setdefault(key, [])
+        index = self._turn.get(key, 0)
+        if index == len(ring):
+            try:
+                ring.append(ShmImage(self.display, width, height))
+            except RuntimeError:
+                self.shm = False
+                return None
+        self._turn[key] = (index + 1) % self.buffers
+        return ring[index]
+
+    def grab(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        """BGRA (height, width, 4) view over a shared-memory segment"""
+        screen_width, screen_height = self.display.screen_size()
+        on_screen = left >= 0 and top >= 0 and left + width <= screen_width and top + height <= screen_height
+        if not self.shm or not on_screen or width <= 0 or height <= 0:
+            return super().grab(left, top, width, height)
+
+        start = time.perf_counter()
+        with self.display.lock:
+            image = self._image(width, height)
+            if image is None or not image.grab(left, top):
+                return super().grab(left, top, width, height)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats['frames'] += 1
+        self.stats['total_ms'] += elapsed
+        self.stats['last_ms'] = elapsed
+        return image.frame
+
+    def close(self):
+        with self.display.lock:
+            for ring in self._images.values():
+                for image in ring:
+                    image.close()
+            self._images = {}
+            self._turn = {}
+        super().close()
+
+
+# ========================================
+# BACKEND
+# ========================================
+
+class X11Backend(NativeBackend):
+    """EWMH windows, MIT-SHM capture and XTest / synthetic-event input on an X server"""
+
+    name = "x11"
+
+    def __init__(self, config: Optional[dict] = None):
+        if not X11_AVAILABLE:
+            raise RuntimeError("libX11 not found")
+
+        settings = (config or {}).get('x11_backend', {})
+        self.display = X11Display(settings.get('display'))
+        self.capture = X11Capture(self.display, settings.get('shm_buffers', 2))
+        self.launch_command = settings.get('launch_command')
+
+        event, error, major, minor = (ctypes.c_int() for _ in range(4))
+        self.xtest = bool(xtst and xtst.XTestQueryExtension(self.display.dpy, ctypes.byref(event),
+                                                             ctypes.byref(error), ctypes.byref(major),
+                                                             ctypes.byref(minor)))
+
+    @property
+    def input_pause(self) -> float:
+        return 0.05
+
+    def configure_capture(self, config: dict):
+        """PrintWindow is Windows-only: the MIT-SHM capture stays (background_capture is ignored)"""
+
+    def _ewmh(self) -> bool:
+        """Is an EWMH window manager running?"""
+        return bool(self.display.get_longs(self.display.root, '_NET_SUPPORTING_WM_CHECK'))
+
+    # ---- windows ----
+
+    def enum_windows(self) -> List[Tuple[int, str]]:
+        with self.display.lock:
+            stacking = self.display.get_longs(self.display.root, '_NET_CLIENT_LIST_STACKING')
+            if not stacking:
+                # No window manager: top-level windows are the root's children
+                stacking = [hwnd for hwnd in self.display.children(self.display.root) if self.is_visible(hwnd)]
+
+            found = []
+            for hwnd in reversed(stacking):
+                title = self.window_title(hwnd)
+                if title:
+                    found.append((hwnd, title))
+            return found
+
+    def is_window(self, hwnd: int) -> bool:
+        with self.display.lock:
+            return self.display.attributes(hwnd) is not None
+
+    def window_title(self, hwnd: int) -> str:
+        with self.display.lock:
+            prop = self.display.get_property(hwnd, '_NET_WM_NAME')
+            if prop and prop[0] == 8:
+                return prop[1].decode('utf-8', 'replace')
+
+            name = ctypes.c_char_p()
+            if xlib.XFetchName(self.display.dpy, hwnd, ctypes.byref(name)) and name.value is not None:
+                title = name.value.decode('latin-1')
+                xlib.XFree(name)
+                return title
+            return ""
+
+    def is_visible(self, hwnd: int) -> bool:
+        with self.display.lock:
+            attributes = self.display.attributes(hwnd)
+            return bool(attributes and attributes.map_state == IS_VIEWABLE)
+
+    def is_minimized(self, hwnd: int) -> bool:
+        with self.display.lock:
+            if self.display.atom('_NET_WM_STATE_HIDDEN') in self.display.get_longs(hwnd, '_NET_WM_STATE'):
+                return True
+            attributes = self.display.attributes(hwnd)
+            return bool(attributes and attributes.map_state != IS_VIEWABLE)
+
+    def client_rect(self, hwnd: int) -> Optional[dict]:
+        with self.display.lock:
+            attributes = self.display.attributes(hwnd)
+            if attributes is None:
+                return None
+            x, y, _ = self.display.translate(hwnd, self.display.root, 0, 0)
+            return {'x': x, 'y': y, 'width': attributes.width, 'height': attributes.height}
+
+    def window_rect(self, hwnd: int) -> Optional[dict]:
+        rect = self.client_rect(hwnd)
+        if rect is None:
+            return None
+        with self.display.lock:
+            extents = self.display.get_longs(hwnd, '_NET_FRAME_EXTENTS')
+        if len(extents) == 4:
+            left, right, top, bottom = extents
+            rect = {'x': rect['x'] - left, 'y': rect['y'] - top,
+                    'width': rect['width'] + left + right, 'height': rect['height'] + top + bottom}
+        return rect
+
+    def foreground_window(self) -> Optional[int]:
+        with self.display.lock:
+            active = self.display.get_longs(self.display.root, '_NET_ACTIVE_WINDOW')
+            if active:
+                return active[0] or None
+            focus, revert = Window(), ctypes.c_int()
+            xlib.XGetInputFocus(self.display.dpy, ctypes.byref(focus), ctypes.byref(revert))
+            return focus.value or None
+
+    def activate(self, hwnd: int) -> bool:
+        if not hwnd:
+            return False
+        with self.display.lock:
+            dpy = self.display.dpy
+            if self._ewmh():
+                # Ask the window manager (source 2 = pager: honoured without focus-stealing checks)
+                event = XEvent()
+                event.xclient.type = CLIENT_MESSAGE
+                event.xclient.window = hwnd
+                event.xclient.message_type = self.display.atom('_NET_ACTIVE_WINDOW')
+                event.xclient.format = 32
+                event.xclient.data[0] = 2
+                event.xclient.data[1] = CURRENT_TIME
+                xlib.XSendEvent(dpy, self.display.root, False,
+                                SUBSTRUCTURE_REDIRECT_MASK | SUBSTRUCTURE_NOTIFY_MASK, ctypes.byref(event))
+            else:
+                xlib.XMapRaised(dpy, hwnd)
+                xlib.XSync(dpy, False)
+                xlib.XSetInputFocus(dpy, hwnd, REVERT_TO_PARENT, CURRENT_TIME)
+            xlib.XFlush(dpy)
+            return True
+
+    def move_window(self, hwnd: int, x: int, y: int, width: int, height: int) -> bool:
+        with self.display.lock:
+            xlib.XMoveResizeWindow(self.display.dpy, hwnd, x, y, width, height)
+            xlib.XFlush(self.display.dpy)
+            return True
+
+    # ---- input ----
+
+    def has_input(self, method: str) -> bool:
+        if method == POST_MESSAGE:
+            return True
+        if method == PYAUTOGUI:
+            return self.xtest
+        return False
+
+    def _target(self, hwnd: int, x: int, y: int) -> Tuple[int, int, int]:
+        """Deepest child of hwnd under client point (x, y), and the point in its coordinates"""
+        target = hwnd
+        while True:
+            tx, ty, child = self.display.translate(hwnd, target, x, y)
+            if not child:
+                return target, tx, ty
+            target = child
+
+    def post_message(self, hwnd: int, msg: int, wparam: int, lparam: int) -> bool:
+        if msg == WM_NULL:
+            return self.is_window(hwnd)
+        if msg not in (WM_LBUTTONDOWN, WM_LBUTTONDBLCLK, WM_LBUTTONUP):
+            return False
+
+        x, y = lparam & 0xFFFF, (lparam >> 16) & 0xFFFF
+        with self.display.lock:
+            if self.display.attributes(hwnd) is None:
+                return False
+            target, tx, ty = self._target(hwnd, x, y)
+            root_x, root_y, _ = self.display.translate(hwnd, self.display.root, x, y)
+
+            # X has no double-click message; toolkits derive it from press timing
+            press = msg != WM_LBUTTONUP
+            event = XEvent()
+            button = event.xbutton
+            button.type = BUTTON_PRESS if press else BUTTON_RELEASE
+            button.window = target
+            button.root = self.display.root
+            button.time = CURRENT_TIME
+            button.x, button.y = tx, ty
+            button.x_root, button.y_root = root_x, root_y
+            button.state = 0 if press else BUTTON1_MASK
+            button.button = 1
+            button.same_screen = True
+
+            mask = BUTTON_PRESS_MASK if press else BUTTON_RELEASE_MASK
+            ok = xlib.XSendEvent(self.display.dpy, target, True, mask, ctypes.byref(event))
+            xlib.XFlush(self.display.dpy)
+            return bool(ok)
+
+    def send_message(self, hwnd: int, msg: int, wparam: int, lparam: int,
+                     timeout_ms: int) -> Tuple[bool, bool]:
+        # X events are asynchronous; nothing waits for the client to process one
+        return False, False
+
+    def move_cursor(self, x: int, y: int, method: str = PYAUTOGUI):
+        with self.display.lock:
+            xtst.XTestFakeMotionEvent(self.display.dpy, -1, x, y, CURRENT_TIME)
+            xlib.XFlush(self.display.dpy)
+
+    def click(self, x: int, y: int, clicks: int = 1, method: str = PYAUTOGUI):
+        with self.display.lock:
+            dpy = self.display.dpy
+            xtst.XTestFakeMotionEvent(dpy, -1, x, y, CURRENT_TIME)
+            for _ in range(clicks):
+                xtst.XTestFakeButtonEvent(dpy, 1, True, CURRENT_TIME)
+                xtst.XTestFakeButtonEvent(dpy, 1, False, CURRENT_TIME)
+            xlib.XFlush(dpy)
+
+    def cursor_position(self, method: str = PYAUTOGUI) -> Tuple[int, int]:
+        with self.display.lock:
+            root, child = Window(), Window()
+            root_x, root_y, win_x, win_y = (ctypes.c_int() for _ in range(4))
+            mask = ctypes.c_uint()
+            if not xlib.XQueryPointer(self.display.dpy, self.display.root, ctypes.byref(root), ctypes.byref(child),
+                                      ctypes.byref(root_x), ctypes.byref(root_y), ctypes.byref(win_x),
+                                      ctypes.byref(win_y), ctypes.byref(mask)):
+                raise RuntimeError("pointer is on another screen")
+            return root_x.value, root_y.value
+
+    # ---- processes ----
+
+    def launch_roblox(self) -> bool:
+        if not self.launch_command:
+            return False
+        subprocess.Popen(shlex.split(self.launch_command))
+        return True
+
+    def close(self):
+        self.capture.close()
+        self.display.close()